@@ -3,6 +3,7 @@ from datetime import datetime
 from .models import Game, LLM
 from . import db
 from config import Config
+from chess_search import best_move_uci
 
 class ChessGame:
     def __init__(self, white_llm_id, black_llm_id):
@@ -17,12 +18,12 @@ class ChessGame:
         db.session.add(self.game)
         db.session.commit()
         
-    def get_next_move(self, llm, board_state):
+    def get_next_move(self, llm, board_state, time_limit=0.5):
         # TODO: Implement LLM-specific move generation based on api_type
-        # For now, just make a random legal move
-        legal_moves = list(self.board.legal_moves)
-        if legal_moves:
-            return legal_moves[0]
+        # For now, play the built-in alpha-beta searcher's move
+        move = best_move_uci(board_state, time_limit)
+        if move is not None:
+            return chess.Move.from_uci(move)
         return None
         
     def play_game(self, max_moves=100):
@@ -1,5 +1,8 @@
 from dataclasses import dataclass
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, Iterator, NamedTuple, Optional, Tuple
+from chess.polyglot import POLYGLOT_RANDOM_ARRAY
+
+from chess_eval import PIECE_SQUARE_SCORES, king_adjustment
 
 @dataclass
 class Position:
@@ -9,22 +12,190 @@ class Position:
     def __str__(self) -> str:
         return f"{chr(self.col + 97)}{8 - self.row}"
 
+class Move(NamedTuple):
+    from_square: int
+    to_square: int
+    promotion: Optional[str] = None  # 'Q', 'R', 'B' or 'N' for pawn promotions
+
+    @property
+    def from_pos(self) -> Dict[str, int]:
+        return {'row': self.from_square >> 3, 'col': self.from_square & 7}
+
+    @property
+    def to_pos(self) -> Dict[str, int]:
+        return {'row': self.to_square >> 3, 'col': self.to_square & 7}
+
+    def uci(self) -> str:
+        """Return the move in UCI notation, e.g. 'e2e4' or 'e7e8q'."""
+        move = f"{Position(self.from_square >> 3, self.from_square & 7)}{Position(self.to_square >> 3, self.to_square & 7)}"
+        return move + self.promotion.lower() if self.promotion else move
+
+    def __str__(self) -> str:
+        return self.uci()
+
+# Squares are indexed 0..63 as row * 8 + col, with row 0 being rank 8 so that
+# indices line up with the 8x8 lists returned by get_board().
+EMPTY = '.'
+WHITE_PIECES = 'PNBRQK'
+BLACK_PIECES = 'pnbrqk'
+
+# Castling rights are kept as a 4-bit mask
+WHITE_KINGSIDE = 1
+WHITE_QUEENSIDE = 2
+BLACK_KINGSIDE = 4
+BLACK_QUEENSIDE = 8
+ALL_CASTLING = WHITE_KINGSIDE | WHITE_QUEENSIDE | BLACK_KINGSIDE | BLACK_QUEENSIDE
+
+KNIGHT_OFFSETS = [(-2, -1), (-2, 1), (-1, -2), (-1, 2), (1, -2), (1, 2), (2, -1), (2, 1)]
+KING_OFFSETS = [(-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)]
+ROOK_DIRECTIONS = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+BISHOP_DIRECTIONS = [(-1, -1), (-1, 1), (1, -1), (1, 1)]
+PROMOTION_PIECES = ('Q', 'R', 'B', 'N')
+
+def square_index(row: int, col: int) -> int:
+    """Convert a (row, col) pair to a 0..63 square index."""
+    return row * 8 + col
+
+def lsb_square(bitboard: int) -> int:
+    """Return the index of the least significant set bit of a bitboard."""
+    return (bitboard & -bitboard).bit_length() - 1
+
+def _build_leaper_table(offsets: List[Tuple[int, int]]) -> List[int]:
+    """Attack masks, indexed by square, for a piece that jumps by fixed offsets."""
+    table = []
+    for square in range(64):
+        mask = 0
+        for dr, dc in offsets:
+            r, c = (square >> 3) + dr, (square & 7) + dc
+            if 0 <= r <= 7 and 0 <= c <= 7:
+                mask |= 1 << (r * 8 + c)
+        table.append(mask)
+    return table
+
+def _build_ray_tables() -> Tuple[List[List[int]], List[List[int]], List[List[int]]]:
+    """Build RAYS[direction][square], BETWEEN[a][b] and DIRECTION[a][b].
+
+    RAYS holds every square from a square to the board edge in one direction,
+    BETWEEN the squares strictly between two aligned squares, and DIRECTION
+    the index of the direction leading from a to b (-1 if not aligned).
+    """
+    rays = [[0] * 64 for _ in DIRECTIONS]
+    between = [[0] * 64 for _ in range(64)]
+    direction = [[-1] * 64 for _ in range(64)]
+    for start in range(64):
+        for index, (dr, dc) in enumerate(DIRECTIONS):
+            r, c = (start >> 3) + dr, (start & 7) + dc
+            ray = 0
+            while 0 <= r <= 7 and 0 <= c <= 7:
+                square = r * 8 + c
+                between[start][square] = ray
+                direction[start][square] = index
+                ray |= 1 << square
+                r += dr
+                c += dc
+            rays[index][start] = ray
+    return rays, between, direction
+
+# Attack tables, built once at import
+DIRECTIONS = ROOK_DIRECTIONS + BISHOP_DIRECTIONS
+STRAIGHT_RAYS = range(0, 4)
+DIAGONAL_RAYS = range(4, 8)
+KNIGHT_ATTACKS = _build_leaper_table(KNIGHT_OFFSETS)
+KING_ATTACKS = _build_leaper_table(KING_OFFSETS)
+PAWN_ATTACKS = {
+    'white': _build_leaper_table([(-1, -1), (-1, 1)]),
+    'black': _build_leaper_table([(1, -1), (1, 1)])
+}
+RAYS, BETWEEN, DIRECTION = _build_ray_tables()
+# The nearest blocker on a ray is its lowest set bit when the ray runs
+# towards higher square indices, and its highest set bit otherwise
+RAY_ASCENDS = [dr > 0 or (dr == 0 and dc > 0) for dr, dc in DIRECTIONS]
+STRAIGHT_LINES = [RAYS[0][sq] | RAYS[1][sq] | RAYS[2][sq] | RAYS[3][sq] for sq in range(64)]
+DIAGONAL_LINES = [RAYS[4][sq] | RAYS[5][sq] | RAYS[6][sq] | RAYS[7][sq] for sq in range(64)]
+
+def _build_piece_keys() -> Dict[str, List[int]]:
+    """Zobrist keys per piece letter and square, in the Polyglot layout.
+
+    Polyglot numbers squares from a1 with rank 1 as row 0, the mirror of our
+    row 0 = rank 8 indexing, and orders pieces black pawn, white pawn, black
+    knight, ... so keys match Polyglot opening books.
+    """
+    keys = {}
+    for kind, piece_type in enumerate(WHITE_PIECES):
+        for piece, offset in ((piece_type.lower(), 0), (piece_type, 1)):
+            base = 64 * (2 * kind + offset)
+            keys[piece] = [POLYGLOT_RANDOM_ARRAY[base + (square ^ 56)] for square in range(64)]
+    return keys
+
+def _build_castling_keys() -> List[int]:
+    """Combined Zobrist key for each of the 16 castling-rights masks."""
+    keys = []
+    for rights in range(16):
+        key = 0
+        for bit, index in ((WHITE_KINGSIDE, 768), (WHITE_QUEENSIDE, 769), (BLACK_KINGSIDE, 770), (BLACK_QUEENSIDE, 771)):
+            if rights & bit:
+                key ^= POLYGLOT_RANDOM_ARRAY[index]
+        keys.append(key)
+    return keys
+
+# Zobrist keys, shared with Polyglot so one 64-bit key can index positions,
+# opening books and caches alike
+PIECE_KEYS = _build_piece_keys()
+CASTLING_KEYS = _build_castling_keys()
+EN_PASSANT_KEYS = POLYGLOT_RANDOM_ARRAY[772:780]
+WHITE_TO_MOVE_KEY = POLYGLOT_RANDOM_ARRAY[780]
+
+def ray_attacks(square: int, occupancy: int, direction: int) -> int:
+    """Squares a slider on `square` reaches in one direction, up to and including the first blocker."""
+    ray = RAYS[direction][square]
+    blockers = ray & occupancy
+    if blockers:
+        if RAY_ASCENDS[direction]:
+            first = (blockers & -blockers).bit_length() - 1
+        else:
+            first = blockers.bit_length() - 1
+        ray ^= RAYS[direction][first]
+    return ray
+
+def slider_attacks(square: int, occupancy: int, directions: range) -> int:
+    """Union of ray_attacks() over several directions."""
+    attacks = 0
+    for direction in directions:
+        attacks |= ray_attacks(square, occupancy, direction)
+    return attacks
+
 class ChessGame:
     def __init__(self, player1: str, player2: str):
         self.player1 = player1  # White
         self.player2 = player2  # Black
         self.current_player = 'white'
-        self.board = self.initialize_board()
-        self.move_history: List[Tuple[Position, Position]] = []
-        self.castling_rights = {
-            'white': {'kingside': True, 'queenside': True},
-            'black': {'kingside': True, 'queenside': True}
-        }
-        self.en_passant_target: Optional[Position] = None
+        # Bitboard core: one 64-bit mask per piece letter plus per-color
+        # occupancy, with a flat 64-square mailbox for O(1) piece lookup.
+        self._bitboards: Dict[str, int] = {piece: 0 for piece in WHITE_PIECES + BLACK_PIECES}
+        self._occupancy: Dict[str, int] = {'white': 0, 'black': 0}
+        self._all_occupancy = 0
+        self._squares: List[str] = [EMPTY] * 64
+        self._check_info_cache: Optional[Tuple[int, Dict[int, int]]] = None
+        self.checkers = 0  # Pieces giving check to the side to move
+        self.castling = ALL_CASTLING
+        self.ep_square: Optional[int] = None
+        self.halfmove_clock = 0
+        self.fullmove_number = 1
+        # One entry per played move: (move, moved piece, captured piece,
+        # captured square, castling, en passant square, halfmove clock,
+        # checkers, zobrist key), all as they were before the move
+        self._undo_stack: List[Tuple[Move, str, str, int, int, Optional[int], int, int, int]] = []
+        # Zobrist key of the position, and how often each key has occurred
+        self.zobrist_key = 0
+        self._key_counts: Dict[int, int] = {}
+        # Piece-square sum of the position in centipawns for white, see chess_eval
+        self.psq_score = 0
         self.is_check = False
         self.is_checkmate = False
         self.is_stalemate = False
-        
+        self.is_draw = False
+        self._load_board(self.initialize_board())
+
     def initialize_board(self) -> List[List[str]]:
         """Initialize the chess board with pieces in starting positions."""
         board = [
@@ -38,366 +209,754 @@ class ChessGame:
             ['R', 'N', 'B', 'Q', 'K', 'B', 'N', 'R']
         ]
         return board
-        
+
+    def _load_board(self, board: List[List[str]]) -> None:
+        """Replace the position with the pieces of an 8x8 board."""
+        for piece in self._bitboards:
+            self._bitboards[piece] = 0
+        self._occupancy = {'white': 0, 'black': 0}
+        self._all_occupancy = 0
+        self._squares = [EMPTY] * 64
+        self._check_info_cache = None
+        self.psq_score = 0
+        for i in range(8):
+            for j in range(8):
+                if board[i][j] != EMPTY:
+                    self._put(board[i][j], square_index(i, j))
+        self.checkers = self._compute_checkers()
+        self.is_check = bool(self.checkers)
+        self._undo_stack = []
+        self.zobrist_key = self._compute_zobrist_key()
+        self._key_counts = {self.zobrist_key: 1}
+
+    def _put(self, piece: str, square: int) -> None:
+        """Place a piece on an empty square."""
+        bit = 1 << square
+        self._bitboards[piece] |= bit
+        self._occupancy['white' if piece.isupper() else 'black'] |= bit
+        self._all_occupancy |= bit
+        self._squares[square] = piece
+        self.zobrist_key ^= PIECE_KEYS[piece][square]
+        self.psq_score += PIECE_SQUARE_SCORES[piece][square]
+
+    def _remove(self, square: int) -> str:
+        """Remove and return the piece on a square."""
+        piece = self._squares[square]
+        if piece != EMPTY:
+            mask = ~(1 << square)
+            self._bitboards[piece] &= mask
+            self._occupancy['white' if piece.isupper() else 'black'] &= mask
+            self._all_occupancy &= mask
+            self._squares[square] = EMPTY
+            self.zobrist_key ^= PIECE_KEYS[piece][square]
+            self.psq_score -= PIECE_SQUARE_SCORES[piece][square]
+        return piece
+
+    def _en_passant_key(self) -> int:
+        """Zobrist term for the en passant square.
+
+        As in Polyglot it only counts when a pawn of the side to move can
+        actually capture there, so positions that differ only by an unusable
+        en passant square still repeat.
+        """
+        if self.ep_square is None:
+            return 0
+        pawns = self._bitboards['P' if self.current_player == 'white' else 'p']
+        attackers_side = 'black' if self.current_player == 'white' else 'white'
+        if PAWN_ATTACKS[attackers_side][self.ep_square] & pawns:
+            return EN_PASSANT_KEYS[self.ep_square & 7]
+        return 0
+
+    def _compute_zobrist_key(self) -> int:
+        """Compute the Zobrist key of the position from scratch."""
+        key = 0
+        for square, piece in enumerate(self._squares):
+            if piece != EMPTY:
+                key ^= PIECE_KEYS[piece][square]
+        key ^= CASTLING_KEYS[self.castling] ^ self._en_passant_key()
+        if self.current_player == 'white':
+            key ^= WHITE_TO_MOVE_KEY
+        return key
+
+    def evaluate(self) -> int:
+        """Piece-square evaluation in centipawns for white, from the incrementally kept sum."""
+        bitboards = self._bitboards
+        # PHASE_WEIGHTS, counted per piece type over both colors
+        phase = ((bitboards['N'] | bitboards['n'] | bitboards['B'] | bitboards['b']).bit_count()
+                 + 2 * (bitboards['R'] | bitboards['r']).bit_count()
+                 + 4 * (bitboards['Q'] | bitboards['q']).bit_count())
+        return self.psq_score + king_adjustment(lsb_square(bitboards['K']), lsb_square(bitboards['k']), phase)
+
+    def is_repetition(self, count: int = 3) -> bool:
+        """Check if the current position has occurred at least `count` times."""
+        return self._key_counts.get(self.zobrist_key, 0) >= count
+
+    def is_fifty_moves(self) -> bool:
+        """Check if fifty moves by each side passed without a capture or pawn move."""
+        return self.halfmove_clock >= 100
+
+    @property
+    def board(self) -> List[List[str]]:
+        """8x8 view of the position, built on demand."""
+        return self.get_board()
+
+    @property
+    def ply_count(self) -> int:
+        """Moves played since the position was set up, i.e. how many pop() can take back."""
+        return len(self._undo_stack)
+
+    def piece_at(self, square: int) -> str:
+        """Piece letter on a 0..63 square, EMPTY if there is none."""
+        return self._squares[square]
+
+    @property
+    def castling_rights(self) -> Dict[str, Dict[str, bool]]:
+        """Castling rights in the nested dict form used by get_status()."""
+        return {
+            'white': {'kingside': bool(self.castling & WHITE_KINGSIDE),
+                      'queenside': bool(self.castling & WHITE_QUEENSIDE)},
+            'black': {'kingside': bool(self.castling & BLACK_KINGSIDE),
+                      'queenside': bool(self.castling & BLACK_QUEENSIDE)}
+        }
+
+    @property
+    def en_passant_target(self) -> Optional[Position]:
+        """En passant target square, if the last move was a double pawn push."""
+        if self.ep_square is None:
+            return None
+        return Position(self.ep_square >> 3, self.ep_square & 7)
+
+    @property
+    def move_history(self) -> List[Tuple[Position, Position]]:
+        """(from, to) positions of every move played so far."""
+        return [(Position(entry[0].from_square >> 3, entry[0].from_square & 7),
+                 Position(entry[0].to_square >> 3, entry[0].to_square & 7))
+                for entry in self._undo_stack]
+
     def is_valid_move(self, from_pos: Dict[str, int], to_pos: Dict[str, int]) -> bool:
-        """Check if a move is valid according to chess rules."""
-        # Convert dictionary positions to Position objects
-        from_square = Position(from_pos['row'], from_pos['col'])
-        to_square = Position(to_pos['row'], to_pos['col'])
-        
+        """Check if a move is valid according to chess rules.
+
+        This checks the one move; callers after every move of a position
+        should iterate legal_moves() instead of probing each from/to pair.
+        Pawns, knights and sliders are answered from the attack tables,
+        the evasion mask and pin rays without a helper call.
+        """
+        from_row, from_col = from_pos['row'], from_pos['col']
+        to_row, to_col = to_pos['row'], to_pos['col']
+
         # Basic validation
-        if not self._is_within_bounds(from_square) or not self._is_within_bounds(to_square):
-            return False
-            
-        # Get the piece
-        piece = self.board[from_square.row][from_square.col]
-        
-        # Check if there's actually a piece to move
-        if piece == '.':
+        if not (0 <= from_row <= 7 and 0 <= from_col <= 7 and 0 <= to_row <= 7 and 0 <= to_col <= 7):
             return False
-            
-        # Check if piece belongs to current player
-        if not self._is_current_players_piece(piece):
-            return False
-            
-        # Check if destination has friendly piece
-        dest_piece = self.board[to_square.row][to_square.col]
-        if dest_piece != '.' and self._is_friendly_piece(dest_piece):
+
+        from_square = from_row * 8 + from_col
+        to_square = to_row * 8 + to_col
+
+        # There must be a piece of the current player to move, and no
+        # friendly piece on the destination
+        own = self._occupancy[self.current_player]
+        if not own >> from_square & 1 or own >> to_square & 1:
             return False
-            
-        # Get piece type and validate movement
-        piece_type = piece.upper()
-        
+
         # Check specific piece movement
-        if not self._is_valid_piece_movement(piece_type, from_square, to_square):
-            return False
-            
-        # Make temporary move to check for check
-        self._make_temporary_move(from_square, to_square)
-        in_check = self._is_in_check(self.current_player)
-        self._undo_temporary_move(from_square, to_square)
-        
-        if in_check:
+        piece_type = self._squares[from_square].upper()
+        if piece_type == 'N':
+            if not KNIGHT_ATTACKS[from_square] >> to_square & 1:
+                return False
+        elif piece_type == 'B' or piece_type == 'R' or piece_type == 'Q':
+            if piece_type == 'B':
+                lines = DIAGONAL_LINES[from_square]
+            elif piece_type == 'R':
+                lines = STRAIGHT_LINES[from_square]
+            else:
+                lines = DIAGONAL_LINES[from_square] | STRAIGHT_LINES[from_square]
+            if not lines >> to_square & 1 or BETWEEN[from_square][to_square] & self._all_occupancy:
+                return False
+        elif piece_type == 'P':
+            white = self.current_player == 'white'
+            step = -8 if white else 8
+            if PAWN_ATTACKS[self.current_player][from_square] >> to_square & 1:
+                # Diagonal capture, including en passant
+                if not (self._all_occupancy >> to_square & 1 or to_square == self.ep_square):
+                    return False
+            elif to_square == from_square + step:
+                if self._all_occupancy >> to_square & 1:
+                    return False
+            elif to_square == from_square + 2 * step and from_square >> 3 == (6 if white else 1):
+                # Initial two-square move
+                if self._all_occupancy & ((1 << to_square) | (1 << (from_square + step))):
+                    return False
+            else:
+                return False
+        elif not self._is_valid_king_move(from_square, to_square, (to_square >> 3) - (from_square >> 3),
+                                          (to_square & 7) - (from_square & 7)):
             return False
-            
-        return True
-        
-    def _is_within_bounds(self, pos: Position) -> bool:
-        """Check if position is within board boundaries."""
-        return 0 <= pos.row <= 7 and 0 <= pos.col <= 7
-        
-    def _is_current_players_piece(self, piece: str) -> bool:
-        """Check if piece belongs to current player."""
-        return (self.current_player == 'white' and piece.isupper()) or \
-               (self.current_player == 'black' and piece.islower())
-               
-    def _is_friendly_piece(self, piece: str) -> bool:
-        """Check if piece belongs to current player."""
-        return (self.current_player == 'white' and piece.isupper()) or \
-               (self.current_player == 'black' and piece.islower())
-               
-    def _is_valid_piece_movement(self, piece_type: str, from_pos: Position, to_pos: Position) -> bool:
-        """Validate piece-specific movement patterns."""
-        dx = to_pos.row - from_pos.row
-        dy = to_pos.col - from_pos.col
-        
-        if piece_type == 'P':
-            return self._is_valid_pawn_move(from_pos, to_pos)
-        elif piece_type == 'R':
-            return self._is_valid_rook_move(from_pos, to_pos)
-        elif piece_type == 'N':
-            return self._is_valid_knight_move(dx, dy)
-        elif piece_type == 'B':
-            return self._is_valid_bishop_move(from_pos, to_pos)
-        elif piece_type == 'Q':
-            return self._is_valid_queen_move(from_pos, to_pos)
-        elif piece_type == 'K':
-            return self._is_valid_king_move(from_pos, to_pos)
-        return False
-        
-    def _is_valid_pawn_move(self, from_pos: Position, to_pos: Position) -> bool:
-        """Validate pawn movement including captures and en passant."""
-        direction = -1 if self.current_player == 'white' else 1
-        start_row = 6 if self.current_player == 'white' else 1
-        
-        # Normal move
-        if to_pos.col == from_pos.col:
-            if from_pos.row + direction == to_pos.row:
-                return self.board[to_pos.row][to_pos.col] == '.'
-            # Initial two-square move
-            if from_pos.row == start_row and from_pos.row + 2 * direction == to_pos.row:
-                middle_row = from_pos.row + direction
-                return (self.board[to_pos.row][to_pos.col] == '.' and 
-                       self.board[middle_row][to_pos.col] == '.')
-                       
-        # Diagonal capture
-        if abs(to_pos.col - from_pos.col) == 1 and to_pos.row == from_pos.row + direction:
-            # Normal capture
-            if self.board[to_pos.row][to_pos.col] != '.':
-                return not self._is_friendly_piece(self.board[to_pos.row][to_pos.col])
-            # En passant
-            if self.en_passant_target and \
-               self.en_passant_target.row == to_pos.row and \
-               self.en_passant_target.col == to_pos.col:
+
+        # A king may not step onto an attacked square; lift it off the board
+        # first so sliders checking it also cover the squares behind it.
+        # Castling has already had its path checked for attacks.
+        if piece_type == 'K':
+            if abs(to_square - from_square) == 2:
                 return True
-                
-        return False
-        
-    def _is_valid_rook_move(self, from_pos: Position, to_pos: Position) -> bool:
-        """Validate rook movement."""
-        if from_pos.row != to_pos.row and from_pos.col != to_pos.col:
-            return False
-        return self._is_path_clear(from_pos, to_pos)
-        
-    def _is_valid_knight_move(self, dx: int, dy: int) -> bool:
-        """Validate knight movement."""
-        return (abs(dx) == 2 and abs(dy) == 1) or (abs(dx) == 1 and abs(dy) == 2)
-        
-    def _is_valid_bishop_move(self, from_pos: Position, to_pos: Position) -> bool:
-        """Validate bishop movement."""
-        if abs(to_pos.row - from_pos.row) != abs(to_pos.col - from_pos.col):
+            king_bit = 1 << from_square
+            self._all_occupancy ^= king_bit
+            attacked = self._attackers_to(to_square, 'black' if self.current_player == 'white' else 'white')
+            self._all_occupancy ^= king_bit
+            return not attacked
+
+        # En passant removes two pieces from a line at once, which pins
+        # don't describe, so play it out and take it back
+        if piece_type == 'P' and to_square == self.ep_square:
+            return not self._leaves_king_in_check(Move(from_square, to_square))
+
+        # Any other move must resolve a check and stay on its pin ray
+        evasion_mask, pins = self._check_info_cache or self._check_info()
+        if not evasion_mask >> to_square & 1:
             return False
-        return self._is_path_clear(from_pos, to_pos)
-        
-    def _is_valid_queen_move(self, from_pos: Position, to_pos: Position) -> bool:
-        """Validate queen movement."""
-        is_diagonal = abs(to_pos.row - from_pos.row) == abs(to_pos.col - from_pos.col)
-        is_straight = from_pos.row == to_pos.row or from_pos.col == to_pos.col
-        return (is_diagonal or is_straight) and self._is_path_clear(from_pos, to_pos)
-        
-    def _is_valid_king_move(self, from_pos: Position, to_pos: Position) -> bool:
+        pin_ray = pins.get(from_square)
+        return pin_ray is None or bool(pin_ray >> to_square & 1)
+
+    def _is_valid_king_move(self, from_square: int, to_square: int, dx: int, dy: int) -> bool:
         """Validate king movement including castling."""
-        dx = abs(to_pos.row - from_pos.row)
-        dy = abs(to_pos.col - from_pos.col)
-        
         # Normal king move
-        if dx <= 1 and dy <= 1:
+        if abs(dx) <= 1 and abs(dy) <= 1:
             return True
-            
+
         # Castling
-        if dx == 0 and dy == 2 and not self.is_check:
+        if dx == 0 and abs(dy) == 2 and not self.is_check:
             if self.current_player == 'white':
-                if from_pos.row == 7 and from_pos.col == 4:
-                    # Kingside castling
-                    if to_pos.col == 6 and self.castling_rights['white']['kingside']:
+                if from_square == 60:
+                    if to_square == 62 and self.castling & WHITE_KINGSIDE:
                         return self._can_castle_kingside('white')
-                    # Queenside castling
-                    if to_pos.col == 2 and self.castling_rights['white']['queenside']:
+                    if to_square == 58 and self.castling & WHITE_QUEENSIDE:
                         return self._can_castle_queenside('white')
             else:
-                if from_pos.row == 0 and from_pos.col == 4:
-                    # Kingside castling
-                    if to_pos.col == 6 and self.castling_rights['black']['kingside']:
+                if from_square == 4:
+                    if to_square == 6 and self.castling & BLACK_KINGSIDE:
                         return self._can_castle_kingside('black')
-                    # Queenside castling
-                    if to_pos.col == 2 and self.castling_rights['black']['queenside']:
+                    if to_square == 2 and self.castling & BLACK_QUEENSIDE:
                         return self._can_castle_queenside('black')
-                        
+
         return False
-        
-    def _is_path_clear(self, from_pos: Position, to_pos: Position) -> bool:
-        """Check if path between two positions is clear of pieces."""
-        dx = to_pos.row - from_pos.row
-        dy = to_pos.col - from_pos.col
-        
-        if dx == 0 and dy == 0:
-            return True
-            
-        step_x = 0 if dx == 0 else dx // abs(dx)
-        step_y = 0 if dy == 0 else dy // abs(dy)
-        
-        current_x = from_pos.row + step_x
-        current_y = from_pos.col + step_y
-        
-        while current_x != to_pos.row or current_y != to_pos.col:
-            if self.board[current_x][current_y] != '.':
-                return False
-            current_x += step_x
-            current_y += step_y
-            
-        return True
-        
+
     def _can_castle_kingside(self, color: str) -> bool:
         """Check if kingside castling is possible."""
-        row = 7 if color == 'white' else 0
-        return (self.board[row][5] == '.' and 
-                self.board[row][6] == '.' and 
-                self.board[row][7] in 'Rr' and
-                not self._is_square_attacked(Position(row, 4), color) and
-                not self._is_square_attacked(Position(row, 5), color) and
-                not self._is_square_attacked(Position(row, 6), color))
-                
+        base = 56 if color == 'white' else 0
+        rook = 'R' if color == 'white' else 'r'
+        return (not self._all_occupancy & ((1 << (base + 5)) | (1 << (base + 6))) and
+                self._squares[base + 7] == rook and
+                not self._is_square_attacked(base + 4, color) and
+                not self._is_square_attacked(base + 5, color) and
+                not self._is_square_attacked(base + 6, color))
+
     def _can_castle_queenside(self, color: str) -> bool:
         """Check if queenside castling is possible."""
-        row = 7 if color == 'white' else 0
-        return (self.board[row][3] == '.' and 
-                self.board[row][2] == '.' and 
-                self.board[row][1] == '.' and
-                self.board[row][0] in 'Rr' and
-                not self._is_square_attacked(Position(row, 4), color) and
-                not self._is_square_attacked(Position(row, 3), color) and
-                not self._is_square_attacked(Position(row, 2), color))
-                
-    def _is_square_attacked(self, pos: Position, defending_color: str) -> bool:
+        base = 56 if color == 'white' else 0
+        rook = 'R' if color == 'white' else 'r'
+        return (not self._all_occupancy & ((1 << (base + 1)) | (1 << (base + 2)) | (1 << (base + 3))) and
+                self._squares[base] == rook and
+                not self._is_square_attacked(base + 4, color) and
+                not self._is_square_attacked(base + 3, color) and
+                not self._is_square_attacked(base + 2, color))
+
+    def _attackers_to(self, square: int, attacking_color: str) -> int:
+        """Return a bitboard of the attacking_color pieces that attack a square.
+
+        Leaper attacks are single table lookups. A slider on a line through
+        the square attacks it when BETWEEN them is empty; there are rarely
+        more than two, so testing each beats tracing all four rays.
+        """
+        bitboards = self._bitboards
+        if attacking_color == 'black':
+            attackers = (PAWN_ATTACKS['white'][square] & bitboards['p'] |
+                         KNIGHT_ATTACKS[square] & bitboards['n'] |
+                         KING_ATTACKS[square] & bitboards['k'])
+            straight = (bitboards['r'] | bitboards['q']) & STRAIGHT_LINES[square]
+            diagonal = (bitboards['b'] | bitboards['q']) & DIAGONAL_LINES[square]
+        else:
+            attackers = (PAWN_ATTACKS['black'][square] & bitboards['P'] |
+                         KNIGHT_ATTACKS[square] & bitboards['N'] |
+                         KING_ATTACKS[square] & bitboards['K'])
+            straight = (bitboards['R'] | bitboards['Q']) & STRAIGHT_LINES[square]
+            diagonal = (bitboards['B'] | bitboards['Q']) & DIAGONAL_LINES[square]
+
+        sliders = straight | diagonal
+        if sliders:
+            occupancy = self._all_occupancy
+            between = BETWEEN[square]
+            while sliders:
+                bit = sliders & -sliders
+                sliders ^= bit
+                if not between[bit.bit_length() - 1] & occupancy:
+                    attackers |= bit
+        return attackers
+
+    def _is_square_attacked(self, square: int, defending_color: str) -> bool:
         """Check if a square is attacked by any opponent piece."""
-        for i in range(8):
-            for j in range(8):
-                piece = self.board[i][j]
-                if piece != '.' and self._is_opponent_piece(piece, defending_color):
-                    from_pos = Position(i, j)
-                    if self._is_valid_piece_movement(piece.upper(), from_pos, pos):
-                        if self._is_path_clear(from_pos, pos):
-                            return True
-        return False
-        
-    def _is_opponent_piece(self, piece: str, defending_color: str) -> bool:
-        """Check if piece belongs to opponent."""
-        return (defending_color == 'white' and piece.islower()) or \
-               (defending_color == 'black' and piece.isupper())
-               
+        return bool(self._attackers_to(square, 'black' if defending_color == 'white' else 'white'))
+
+    def _check_info(self) -> Tuple[int, Dict[int, int]]:
+        """Return (evasion mask, pin rays) for the side to move.
+
+        The evasion mask holds the squares a non-king move must land on:
+        every square when not in check, the checker plus the squares between
+        it and the king under single check, and nothing under double check.
+        Pin rays map each absolutely pinned piece to the line it may still
+        move along. The result is cached until the position changes.
+        """
+        if self._check_info_cache is not None:
+            return self._check_info_cache
+
+        color = self.current_player
+        king = self._bitboards['K' if color == 'white' else 'k']
+        if not king:
+            self._check_info_cache = ((1 << 64) - 1, {})
+            return self._check_info_cache
+        king_square = lsb_square(king)
+
+        checkers = self.checkers
+        if not checkers:
+            evasion_mask = (1 << 64) - 1
+        elif checkers & (checkers - 1):
+            evasion_mask = 0
+        else:
+            evasion_mask = checkers | BETWEEN[king_square][lsb_square(checkers)]
+
+        # A piece is pinned when it is the only piece between the king and
+        # an enemy slider that moves along that line
+        bitboards = self._bitboards
+        if color == 'white':
+            snipers = ((bitboards['r'] | bitboards['q']) & STRAIGHT_LINES[king_square] |
+                       (bitboards['b'] | bitboards['q']) & DIAGONAL_LINES[king_square])
+        else:
+            snipers = ((bitboards['R'] | bitboards['Q']) & STRAIGHT_LINES[king_square] |
+                       (bitboards['B'] | bitboards['Q']) & DIAGONAL_LINES[king_square])
+        own = self._occupancy[color]
+        pins: Dict[int, int] = {}
+        while snipers:
+            bit = snipers & -snipers
+            snipers ^= bit
+            sniper = bit.bit_length() - 1
+            between = BETWEEN[king_square][sniper]
+            blockers = between & self._all_occupancy
+            if blockers and not blockers & (blockers - 1) and blockers & own:
+                pins[lsb_square(blockers)] = between | bit
+
+        self._check_info_cache = (evasion_mask, pins)
+        return self._check_info_cache
+
+    def _compute_checkers(self) -> int:
+        """Find the pieces checking the side to move from scratch."""
+        king = self._bitboards['K' if self.current_player == 'white' else 'k']
+        if not king:
+            return 0
+        return self._attackers_to(lsb_square(king), 'black' if self.current_player == 'white' else 'white')
+
+    def _checkers_after_move(self, piece: str, from_square: int, to_square: int) -> int:
+        """Find the pieces checking the side to move right after `piece` moved.
+
+        Only the moved piece itself or a slider it uncovered on the line from
+        the enemy king through `from_square` can have started giving check,
+        so both are answered with a few table lookups.
+        """
+        bitboards = self._bitboards
+        mover = 'white' if piece.isupper() else 'black'
+        king = bitboards['k' if mover == 'white' else 'K']
+        if not king:
+            return 0
+        king_square = lsb_square(king)
+        occupancy = self._all_occupancy
+        piece_type = piece.upper()
+        checkers = 0
+
+        # Direct check by the moved piece
+        if piece_type == 'P':
+            if PAWN_ATTACKS[mover][to_square] >> king_square & 1:
+                checkers |= 1 << to_square
+        elif piece_type == 'N':
+            if KNIGHT_ATTACKS[to_square] >> king_square & 1:
+                checkers |= 1 << to_square
+        elif piece_type != 'K':
+            direction = DIRECTION[to_square][king_square]
+            if direction >= 0 and (piece_type == 'Q' or (piece_type == 'R') == (direction < 4)) and \
+                    not BETWEEN[to_square][king_square] & occupancy:
+                checkers |= 1 << to_square
+
+        # Discovered check by a slider behind the vacated square
+        direction = DIRECTION[king_square][from_square]
+        if direction >= 0:
+            if mover == 'white':
+                sliders = bitboards['Q'] | (bitboards['R'] if direction < 4 else bitboards['B'])
+            else:
+                sliders = bitboards['q'] | (bitboards['r'] if direction < 4 else bitboards['b'])
+            checkers |= ray_attacks(king_square, occupancy, direction) & sliders
+        return checkers
+
     def _is_in_check(self, color: str) -> bool:
         """Check if the specified color's king is in check."""
-        # Find king position
-        king_char = 'K' if color == 'white' else 'k'
-        king_pos = None
-        for i in range(8):
-            for j in range(8):
-                if self.board[i][j] == king_char:
-                    king_pos = Position(i, j)
-                    break
-            if king_pos:
-                break
-                
-        if not king_pos:
+        king = self._bitboards['K' if color == 'white' else 'k']
+        if not king:
             # This shouldn't happen in a valid game state
             return False
-                
-        return self._is_square_attacked(king_pos, color)
-        
-    def _make_temporary_move(self, from_pos: Position, to_pos: Position) -> None:
-        """Make a temporary move to test for check."""
-        self.temp_piece = self.board[to_pos.row][to_pos.col]
-        self.board[to_pos.row][to_pos.col] = self.board[from_pos.row][from_pos.col]
-        self.board[from_pos.row][from_pos.col] = '.'
-        
-    def _undo_temporary_move(self, from_pos: Position, to_pos: Position) -> None:
-        """Undo a temporary move."""
-        self.board[from_pos.row][from_pos.col] = self.board[to_pos.row][to_pos.col]
-        self.board[to_pos.row][to_pos.col] = self.temp_piece
-        
-    def make_move(self, from_pos: Dict[str, int], to_pos: Dict[str, int]) -> Dict[str, bool]:
-        """Make a move and update game state."""
-        if not self.is_valid_move(from_pos, to_pos):
-            return {'valid': False}
-            
-        from_square = Position(from_pos['row'], from_pos['col'])
-        to_square = Position(to_pos['row'], to_pos['col'])
-        
-        # Store move for history
-        self.move_history.append((from_square, to_square))
-        
-        piece = self.board[from_square.row][from_square.col]
+        return self._is_square_attacked(lsb_square(king), color)
+
+    def legal_moves(self) -> Iterator[Move]:
+        """Generate every legal move for the side to move.
+
+        Moves are produced per piece from the bitboards and filtered with the
+        cached evasion mask and pin rays, so only king steps and en passant
+        need an attack test. The position must not change while the
+        generator is being consumed.
+        """
+        color = self.current_player
+        enemy_color = 'black' if color == 'white' else 'white'
+        letters = WHITE_PIECES if color == 'white' else BLACK_PIECES
+        bitboards = self._bitboards
+        own = self._occupancy[color]
+        enemy = self._occupancy[enemy_color]
+        occupancy = self._all_occupancy
+        evasion_mask, pins = self._check_info()
+
+        # King steps, tested with the king lifted off the board. They are
+        # collected before yielding so the board is whole between moves.
+        king = bitboards[letters[5]]
+        if king:
+            king_square = lsb_square(king)
+            targets = KING_ATTACKS[king_square] & ~own
+            king_targets = []
+            self._all_occupancy ^= king
+            while targets:
+                bit = targets & -targets
+                targets ^= bit
+                to_square = bit.bit_length() - 1
+                if not self._attackers_to(to_square, enemy_color):
+                    king_targets.append(to_square)
+            self._all_occupancy ^= king
+            for to_square in king_targets:
+                yield Move(king_square, to_square)
+
+            # Castling
+            if king_square & 7 == 4:
+                for to_square in (king_square + 2, king_square - 2):
+                    if self._is_valid_king_move(king_square, to_square, 0, to_square - king_square):
+                        yield Move(king_square, to_square)
+
+        # Under double check only the king may move
+        if not evasion_mask:
+            return
+
+        # Knights never move along a pin ray, so pinned knights are skipped.
+        # Sliders are clipped to their pin ray when pinned.
+        for letter, directions in ((letters[1], None), (letters[2], DIAGONAL_RAYS),
+                                   (letters[3], STRAIGHT_RAYS), (letters[4], range(8))):
+            pieces = bitboards[letter]
+            while pieces:
+                bit = pieces & -pieces
+                pieces ^= bit
+                from_square = bit.bit_length() - 1
+                if directions is None:
+                    if from_square in pins:
+                        continue
+                    targets = KNIGHT_ATTACKS[from_square]
+                else:
+                    targets = slider_attacks(from_square, occupancy, directions)
+                    if from_square in pins:
+                        targets &= pins[from_square]
+                targets &= evasion_mask & ~own
+                while targets:
+                    target = targets & -targets
+                    targets ^= target
+                    yield Move(from_square, target.bit_length() - 1)
+
+        # Pawns: pushes, double pushes, captures, en passant and promotions
+        if color == 'white':
+            direction, start_row, last_row = -8, 6, 0
+        else:
+            direction, start_row, last_row = 8, 1, 7
+        pawns = bitboards[letters[0]]
+        while pawns:
+            bit = pawns & -pawns
+            pawns ^= bit
+            from_square = bit.bit_length() - 1
+            allowed = evasion_mask & pins.get(from_square, evasion_mask)
+
+            attacks = PAWN_ATTACKS[color][from_square]
+
+            to_square = from_square + direction
+            if not occupancy >> to_square & 1:
+                targets = 1 << to_square
+                double = to_square + direction
+                if from_square >> 3 == start_row and not occupancy >> double & 1:
+                    targets |= 1 << double
+            else:
+                targets = 0
+            targets = (targets | attacks & enemy) & allowed
+
+            if self.ep_square is not None and attacks >> self.ep_square & 1:
+                move = Move(from_square, self.ep_square)
+                if not self._leaves_king_in_check(move):
+                    yield move
+
+            while targets:
+                target = targets & -targets
+                targets ^= target
+                to_square = target.bit_length() - 1
+                if to_square >> 3 == last_row:
+                    for promotion in PROMOTION_PIECES:
+                        yield Move(from_square, to_square, promotion)
+                else:
+                    yield Move(from_square, to_square)
+
+    def _leaves_king_in_check(self, move: Move) -> bool:
+        """Play a move in place and report whether the mover's king is left in check."""
+        color = self.current_player
+        self.push(move)
+        in_check = self._is_in_check(color)
+        self.pop()
+        return in_check
+
+    def push(self, move: Move) -> None:
+        """Play a legal move in place, recording what pop() needs to undo it.
+
+        Unlike make_move() the move is not validated and checkmate/stalemate
+        are not recomputed, so search and perft can call it cheaply.
+        """
+        from_square, to_square, promotion = move
+        key = self.zobrist_key
+        # Take the side-specific terms out before the move changes them
+        self.zobrist_key ^= CASTLING_KEYS[self.castling] ^ self._en_passant_key()
+        piece = self._remove(from_square)
         piece_type = piece.upper()
-        
-        # Handle castling
-        if piece_type == 'K' and abs(to_square.col - from_square.col) == 2:
-            self._handle_castling(from_square, to_square)
-            
+        captured_square = to_square
+        # Castling and en passant move or remove a second piece, which the
+        # incremental check detection below does not account for
+        rescan_checkers = False
+
         # Handle en passant capture
-        elif piece_type == 'P' and self.en_passant_target and \
-             to_square.row == self.en_passant_target.row and \
-             to_square.col == self.en_passant_target.col:
-            self._handle_en_passant(from_square, to_square)
-            
-        # Normal move
+        if piece_type == 'P' and to_square == self.ep_square:
+            captured_square = (from_square & ~7) | (to_square & 7)
+            rescan_checkers = True
+
+        # Handle castling by moving the rook alongside the king
+        elif piece_type == 'K' and abs(to_square - from_square) == 2:
+            rescan_checkers = True
+            if to_square > from_square:  # Kingside
+                self._put(self._remove(from_square + 3), from_square + 1)
+            else:  # Queenside
+                self._put(self._remove(from_square - 4), from_square - 1)
+
+        captured = self._remove(captured_square)
+        self._undo_stack.append((move, piece, captured, captured_square, self.castling,
+                                 self.ep_square, self.halfmove_clock, self.checkers, key))
+
+        # Handle promotion
+        if piece_type == 'P' and to_square >> 3 in (0, 7):
+            promoted = promotion if promotion in PROMOTION_PIECES else 'Q'
+            self._put(promoted if piece.isupper() else promoted.lower(), to_square)
         else:
-            self.board[to_square.row][to_square.col] = piece
-            self.board[from_square.row][from_square.col] = '.'
-            
+            self._put(piece, to_square)
+
         # Update castling rights
-        self._update_castling_rights(piece_type, from_square)
-        
+        if self.castling:
+            self._update_castling_rights(from_square, to_square)
+
         # Update en passant target
-        self._update_en_passant_target(piece_type, from_square, to_square)
-        
+        self.ep_square = None
+        if piece_type == 'P' and abs(to_square - from_square) == 16:
+            self.ep_square = (from_square + to_square) // 2
+
+        # Update move counters
+        if piece_type == 'P' or captured != EMPTY:
+            self.halfmove_clock = 0
+        else:
+            self.halfmove_clock += 1
+        if self.current_player == 'black':
+            self.fullmove_number += 1
+
         # Switch current player
         self.current_player = 'black' if self.current_player == 'white' else 'white'
-        
+        self._check_info_cache = None
+
+        # Put the side-specific terms back and count the new position
+        self.zobrist_key ^= CASTLING_KEYS[self.castling] ^ self._en_passant_key() ^ WHITE_TO_MOVE_KEY
+        self._key_counts[self.zobrist_key] = self._key_counts.get(self.zobrist_key, 0) + 1
+
         # Update check status
-        self.is_check = self._is_in_check(self.current_player)
-        
+        if rescan_checkers:
+            self.checkers = self._compute_checkers()
+        else:
+            self.checkers = self._checkers_after_move(self._squares[to_square], from_square, to_square)
+        self.is_check = bool(self.checkers)
+
+    def pop(self) -> Move:
+        """Take back the last move played with push() or make_move()."""
+        move, piece, captured, captured_square, castling, ep_square, halfmove_clock, checkers, key = \
+            self._undo_stack.pop()
+        from_square, to_square, _ = move
+
+        count = self._key_counts[self.zobrist_key] - 1
+        if count:
+            self._key_counts[self.zobrist_key] = count
+        else:
+            del self._key_counts[self.zobrist_key]
+
+        self._remove(to_square)
+        self._put(piece, from_square)
+        if captured != EMPTY:
+            self._put(captured, captured_square)
+        if piece in 'Kk' and abs(to_square - from_square) == 2:
+            if to_square > from_square:  # Kingside
+                self._put(self._remove(from_square + 1), from_square + 3)
+            else:  # Queenside
+                self._put(self._remove(from_square - 1), from_square - 4)
+
+        self.current_player = 'black' if self.current_player == 'white' else 'white'
+        if self.current_player == 'black':
+            self.fullmove_number -= 1
+        self.castling = castling
+        self.ep_square = ep_square
+        self.halfmove_clock = halfmove_clock
+        self.checkers = checkers
+        self.is_check = bool(checkers)
+        self.zobrist_key = key
+        # A position a move was played from can be neither mate nor stalemate
+        self.is_checkmate = False
+        self.is_stalemate = False
+        self.is_draw = self.is_repetition() or self.is_fifty_moves()
+        self._check_info_cache = None
+        return move
+
+    def make_move(self, from_pos: Dict[str, int], to_pos: Dict[str, int],
+                  promotion: Optional[str] = None) -> Dict[str, bool]:
+        """Make a move and update game state.
+
+        A pawn reaching the last rank promotes to `promotion` ('Q', 'R', 'B'
+        or 'N'), defaulting to a queen.
+        """
+        if not self.is_valid_move(from_pos, to_pos):
+            return {'valid': False}
+
+        from_square = square_index(from_pos['row'], from_pos['col'])
+        to_square = square_index(to_pos['row'], to_pos['col'])
+
+        # Handle promotion
+        if self._squares[from_square] in 'Pp' and to_square >> 3 in (0, 7):
+            promotion = (promotion or 'Q').upper()
+            if promotion not in PROMOTION_PIECES:
+                promotion = 'Q'
+        else:
+            promotion = None
+
+        self.push(Move(from_square, to_square, promotion))
+        self._update_game_status()
+
         return {'valid': True}
-        
-    def _handle_castling(self, from_pos: Position, to_pos: Position) -> None:
-        """Handle castling move."""
-        # Move king
-        self.board[to_pos.row][to_pos.col] = self.board[from_pos.row][from_pos.col]
-        self.board[from_pos.row][from_pos.col] = '.'
-        
-        # Move rook
-        if to_pos.col == 6:  # Kingside
-            self.board[to_pos.row][5] = self.board[to_pos.row][7]
-            self.board[to_pos.row][7] = '.'
-        else:  # Queenside
-            self.board[to_pos.row][3] = self.board[to_pos.row][0]
-            self.board[to_pos.row][0] = '.'
-            
-    def _handle_en_passant(self, from_pos: Position, to_pos: Position) -> None:
-        """Handle en passant capture."""
-        # Move pawn
-        self.board[to_pos.row][to_pos.col] = self.board[from_pos.row][from_pos.col]
-        self.board[from_pos.row][from_pos.col] = '.'
-        
-        # Remove captured pawn
-        capture_row = from_pos.row
-        self.board[capture_row][to_pos.col] = '.'
-        
-    def _update_castling_rights(self, piece_type: str, from_pos: Position) -> None:
-        """Update castling rights when king or rook moves."""
-        if piece_type == 'K':
-            if self.current_player == 'white':
-                self.castling_rights['white'] = {'kingside': False, 'queenside': False}
-            else:
-                self.castling_rights['black'] = {'kingside': False, 'queenside': False}
-        elif piece_type == 'R':
-            if self.current_player == 'white':
-                if from_pos.row == 7:
-                    if from_pos.col == 0:
-                        self.castling_rights['white']['queenside'] = False
-                    elif from_pos.col == 7:
-                        self.castling_rights['white']['kingside'] = False
-            else:
-                if from_pos.row == 0:
-                    if from_pos.col == 0:
-                        self.castling_rights['black']['queenside'] = False
-                    elif from_pos.col == 7:
-                        self.castling_rights['black']['kingside'] = False
-                        
-    def _update_en_passant_target(self, piece_type: str, from_pos: Position, to_pos: Position) -> None:
-        """Update en passant target square when pawn moves two squares."""
-        self.en_passant_target = None
-        if piece_type == 'P' and abs(to_pos.row - from_pos.row) == 2:
-            self.en_passant_target = Position(
-                (from_pos.row + to_pos.row) // 2,
-                to_pos.col
-            )
-            
+
+    def _update_game_status(self) -> None:
+        """Update checkmate, stalemate and draw status for the side to move."""
+        has_moves = next(self.legal_moves(), None) is not None
+        self.is_checkmate = self.is_check and not has_moves
+        self.is_stalemate = not self.is_check and not has_moves
+        self.is_draw = self.is_stalemate or (not self.is_checkmate and
+                                             (self.is_repetition() or self.is_fifty_moves()))
+
+    def _update_castling_rights(self, from_square: int, to_square: int) -> None:
+        """Drop castling rights when a king or rook leaves, or a rook is captured on, its home square."""
+        for square in (from_square, to_square):
+            if square == 60:
+                self.castling &= ~(WHITE_KINGSIDE | WHITE_QUEENSIDE)
+            elif square == 4:
+                self.castling &= ~(BLACK_KINGSIDE | BLACK_QUEENSIDE)
+            elif square == 63:
+                self.castling &= ~WHITE_KINGSIDE
+            elif square == 56:
+                self.castling &= ~WHITE_QUEENSIDE
+            elif square == 7:
+                self.castling &= ~BLACK_KINGSIDE
+            elif square == 0:
+                self.castling &= ~BLACK_QUEENSIDE
+
+    def set_fen(self, fen: str) -> None:
+        """Set up the position described by a FEN string.
+
+        Move counters are optional. The move history is cleared.
+        """
+        fields = fen.split()
+        if len(fields) < 4:
+            raise ValueError(f"Invalid FEN: {fen}")
+
+        board = []
+        for rank in fields[0].split('/'):
+            row = []
+            for char in rank:
+                if char.isdigit():
+                    row.extend([EMPTY] * int(char))
+                elif char in WHITE_PIECES + BLACK_PIECES:
+                    row.append(char)
+                else:
+                    raise ValueError(f"Invalid FEN piece '{char}': {fen}")
+            if len(row) != 8:
+                raise ValueError(f"Invalid FEN rank '{rank}': {fen}")
+            board.append(row)
+        if len(board) != 8:
+            raise ValueError(f"Invalid FEN board: {fen}")
+
+        if fields[1] not in ('w', 'b'):
+            raise ValueError(f"Invalid FEN side to move: {fen}")
+        self.current_player = 'white' if fields[1] == 'w' else 'black'
+        self.castling = 0
+        for char, bit in (('K', WHITE_KINGSIDE), ('Q', WHITE_QUEENSIDE),
+                          ('k', BLACK_KINGSIDE), ('q', BLACK_QUEENSIDE)):
+            if char in fields[2]:
+                self.castling |= bit
+        self.ep_square = None
+        if fields[3] != '-':
+            self.ep_square = square_index(8 - int(fields[3][1]), ord(fields[3][0]) - ord('a'))
+        self.halfmove_clock = int(fields[4]) if len(fields) > 4 else 0
+        self.fullmove_number = int(fields[5]) if len(fields) > 5 else 1
+
+        self._load_board(board)
+        self._update_game_status()
+
+    def get_fen(self) -> str:
+        """Get the position as a FEN string."""
+        ranks = []
+        for i in range(8):
+            rank = ''
+            empty = 0
+            for piece in self._squares[i * 8:i * 8 + 8]:
+                if piece == EMPTY:
+                    empty += 1
+                    continue
+                if empty:
+                    rank += str(empty)
+                    empty = 0
+                rank += piece
+            ranks.append(rank + (str(empty) if empty else ''))
+
+        castling = ''.join(char for char, bit in (('K', WHITE_KINGSIDE), ('Q', WHITE_QUEENSIDE),
+                                                  ('k', BLACK_KINGSIDE), ('q', BLACK_QUEENSIDE))
+                           if self.castling & bit) or '-'
+        en_passant = str(self.en_passant_target) if self.en_passant_target else '-'
+        side = 'w' if self.current_player == 'white' else 'b'
+        return f"{'/'.join(ranks)} {side} {castling} {en_passant} {self.halfmove_clock} {self.fullmove_number}"
+
     def get_board(self) -> List[List[str]]:
         """Get current board state."""
-        return self.board
-        
+        return [self._squares[i * 8:i * 8 + 8] for i in range(8)]
+
     def get_status(self) -> Dict:
         """Get current game status."""
         return {
-            'board': self.board,
+            'board': self.get_board(),
             'currentPlayer': self.current_player,
             'isCheck': self.is_check,
             'isCheckmate': self.is_checkmate,
             'isStalemate': self.is_stalemate,
+            'isDraw': self.is_draw,
             'enPassantTarget': self.en_passant_target,
             'castlingRights': self.castling_rights
         }
-        
+
     def __str__(self) -> str:
         """Return string representation of the board."""
         display = "\n  a b c d e f g h\n"
@@ -405,7 +964,7 @@ class ChessGame:
         for i in range(8):
             display += f"{8-i}|"
             for j in range(8):
-                display += f"{self.board[i][j]}|"
+                display += f"{self._squares[i * 8 + j]}|"
             display += f"{8-i}\n"
         display += "  ---------------\n"
         display += "  a b c d e f g h\n"
@@ -0,0 +1,221 @@
+"""Piece-square-table evaluation for chess positions.
+
+Every piece on every square has a fixed score (material plus a
+positional bonus), so a position's evaluation is a sum that ChessGame
+keeps up to date as pieces are put and removed. Kings switch to an
+endgame table as material comes off, which is applied on top of the
+sum when a position is evaluated. Scores are in centipawns, positive
+for white. Squares are indexed as in chess_engine, a8 = 0 to h1 = 63.
+
+evaluate_batch() scores many positions at once: they are encoded as
+NumPy piece planes and scored with array operations, giving exactly the
+scores of the per-position functions.
+"""
+from typing import Dict, List, Sequence, Union
+
+import numpy as np
+
+PIECE_VALUES = {'P': 100, 'N': 320, 'B': 330, 'R': 500, 'Q': 900, 'K': 0}
+
+# Material left on the board, used to blend the king tables: 24 at the start, 0 with only kings and pawns
+PHASE_WEIGHTS = {'N': 1, 'B': 1, 'R': 2, 'Q': 4}
+MAX_PHASE = 24
+
+# Positional bonuses for white, rank 8 first (Simplified Evaluation Function tables)
+PIECE_TABLES = {
+    'P': [
+        0, 0, 0, 0, 0, 0, 0, 0,
+        50, 50, 50, 50, 50, 50, 50, 50,
+        10, 10, 20, 30, 30, 20, 10, 10,
+        5, 5, 10, 25, 25, 10, 5, 5,
+        0, 0, 0, 20, 20, 0, 0, 0,
+        5, -5, -10, 0, 0, -10, -5, 5,
+        5, 10, 10, -20, -20, 10, 10, 5,
+        0, 0, 0, 0, 0, 0, 0, 0,
+    ],
+    'N': [
+        -50, -40, -30, -30, -30, -30, -40, -50,
+        -40, -20, 0, 0, 0, 0, -20, -40,
+        -30, 0, 10, 15, 15, 10, 0, -30,
+        -30, 5, 15, 20, 20, 15, 5, -30,
+        -30, 0, 15, 20, 20, 15, 0, -30,
+        -30, 5, 10, 15, 15, 10, 5, -30,
+        -40, -20, 0, 5, 5, 0, -20, -40,
+        -50, -40, -30, -30, -30, -30, -40, -50,
+    ],
+    'B': [
+        -20, -10, -10, -10, -10, -10, -10, -20,
+        -10, 0, 0, 0, 0, 0, 0, -10,
+        -10, 0, 5, 10, 10, 5, 0, -10,
+        -10, 5, 5, 10, 10, 5, 5, -10,
+        -10, 0, 10, 10, 10, 10, 0, -10,
+        -10, 10, 10, 10, 10, 10, 10, -10,
+        -10, 5, 0, 0, 0, 0, 5, -10,
+        -20, -10, -10, -10, -10, -10, -10, -20,
+    ],
+    'R': [
+        0, 0, 0, 0, 0, 0, 0, 0,
+        5, 10, 10, 10, 10, 10, 10, 5,
+        -5, 0, 0, 0, 0, 0, 0, -5,
+        -5, 0, 0, 0, 0, 0, 0, -5,
+        -5, 0, 0, 0, 0, 0, 0, -5,
+        -5, 0, 0, 0, 0, 0, 0, -5,
+        -5, 0, 0, 0, 0, 0, 0, -5,
+        0, 0, 0, 5, 5, 0, 0, 0,
+    ],
+    'Q': [
+        -20, -10, -10, -5, -5, -10, -10, -20,
+        -10, 0, 0, 0, 0, 0, 0, -10,
+        -10, 0, 5, 5, 5, 5, 0, -10,
+        -5, 0, 5, 5, 5, 5, 0, -5,
+        0, 0, 5, 5, 5, 5, 0, -5,
+        -10, 5, 5, 5, 5, 5, 0, -10,
+        -10, 0, 5, 0, 0, 0, 0, -10,
+        -20, -10, -10, -5, -5, -10, -10, -20,
+    ],
+    'K': [
+        -30, -40, -40, -50, -50, -40, -40, -30,
+        -30, -40, -40, -50, -50, -40, -40, -30,
+        -30, -40, -40, -50, -50, -40, -40, -30,
+        -30, -40, -40, -50, -50, -40, -40, -30,
+        -20, -30, -30, -40, -40, -30, -30, -20,
+        -10, -20, -20, -20, -20, -20, -20, -10,
+        20, 20, 0, 0, 0, 0, 20, 20,
+        20, 30, 10, 0, 0, 10, 30, 20,
+    ],
+}
+KING_ENDGAME_TABLE = [
+    -50, -40, -30, -20, -20, -30, -40, -50,
+    -30, -20, -10, 0, 0, -10, -20, -30,
+    -30, -10, 20, 30, 30, 20, -10, -30,
+    -30, -10, 30, 40, 40, 30, -10, -30,
+    -30, -10, 30, 40, 40, 30, -10, -30,
+    -30, -10, 20, 30, 30, 20, -10, -30,
+    -30, -30, 0, 0, 0, 0, -30, -30,
+    -50, -30, -30, -30, -30, -30, -30, -50,
+]
+
+def _build_piece_square_scores() -> Dict[str, List[int]]:
+    """Signed score of each piece letter on each square; black reads the white table mirrored."""
+    scores = {}
+    for piece, table in PIECE_TABLES.items():
+        scores[piece] = [PIECE_VALUES[piece] + table[square] for square in range(64)]
+        scores[piece.lower()] = [-PIECE_VALUES[piece] - table[square ^ 56] for square in range(64)]
+    return scores
+
+PIECE_SQUARE_SCORES = _build_piece_square_scores()
+# What a king on each square gains, for its side, in a pure endgame over the middlegame table
+KING_ENDGAME_GAIN = [KING_ENDGAME_TABLE[square] - PIECE_TABLES['K'][square] for square in range(64)]
+
+def king_adjustment(white_king: int, black_king: int, phase: int) -> int:
+    """Blend the king terms toward the endgame table as `phase` drops from MAX_PHASE to 0."""
+    gain = 0
+    if white_king >= 0:
+        gain += KING_ENDGAME_GAIN[white_king]
+    if black_king >= 0:
+        gain -= KING_ENDGAME_GAIN[black_king ^ 56]
+    return gain * (MAX_PHASE - min(phase, MAX_PHASE)) // MAX_PHASE
+
+def evaluate_squares(squares: Sequence[str]) -> int:
+    """Evaluate 64 piece letters ('.' for empty) from scratch, in centipawns for white."""
+    score = phase = 0
+    white_king = black_king = -1
+    for square, piece in enumerate(squares):
+        if piece == '.':
+            continue
+        score += PIECE_SQUARE_SCORES[piece][square]
+        phase += PHASE_WEIGHTS.get(piece.upper(), 0)
+        if piece == 'K':
+            white_king = square
+        elif piece == 'k':
+            black_king = square
+    return score + king_adjustment(white_king, black_king, phase)
+
+def evaluate_board(board: List[List[str]]) -> int:
+    """Evaluate an 8x8 board of piece letters from scratch, in centipawns for white."""
+    return evaluate_squares([piece for row in board for piece in row])
+
+# Piece planes: one (64,) boolean plane per piece letter, in this order.
+# Positions are first read into the compact form of the planes, an (n, 64)
+# array holding the plane index of each square's piece (EMPTY_PLANE if none).
+PIECE_LETTERS = 'PNBRQKpnbrqk'
+EMPTY_PLANE = len(PIECE_LETTERS)
+PLANE_SCORES = np.array([PIECE_SQUARE_SCORES[piece] for piece in PIECE_LETTERS])
+PLANE_PHASE = np.array([PHASE_WEIGHTS.get(piece.upper(), 0) for piece in PIECE_LETTERS])
+_KING_ENDGAME_GAIN = np.array(KING_ENDGAME_GAIN)
+# Score and phase weight of each piece index, with a zero row for empty squares
+_INDEX_SCORES = np.vstack([PLANE_SCORES, np.zeros(64, dtype=PLANE_SCORES.dtype)])
+_INDEX_PHASE = np.append(PLANE_PHASE, 0)
+# Piece index of each character code
+_INDEX_OF_CODE = np.full(128, EMPTY_PLANE, dtype=np.uint8)
+_INDEX_OF_CODE[[ord(piece) for piece in PIECE_LETTERS]] = np.arange(len(PIECE_LETTERS))
+# Expands the digits of a FEN placement into that many empty squares
+_EXPAND_FEN = str.maketrans({**{str(count): '.' * count for count in range(1, 9)}, '/': ''})
+
+def fen_piece_indices(fens: Sequence[str]) -> np.ndarray:
+    """(n, 64) piece indices of FEN strings; only the placement field is read."""
+    placements = [fen.split(' ', 1)[0].translate(_EXPAND_FEN) for fen in fens]
+    for fen, placement in zip(fens, placements):
+        if len(placement) != 64 or not placement.isascii():
+            raise ValueError(f"Invalid FEN: {fen}")
+    codes = np.frombuffer(''.join(placements).encode('ascii'), dtype=np.uint8).reshape(len(fens), 64)
+    return _INDEX_OF_CODE[codes]
+
+def board_piece_indices(boards: Union[np.ndarray, Sequence[List[List[str]]]]) -> np.ndarray:
+    """(n, 64) piece indices of stacked 8x8 boards of piece letters."""
+    if isinstance(boards, np.ndarray):
+        letters = boards.astype('U1').reshape(-1, 64)
+        return _INDEX_OF_CODE[np.minimum(letters.view(np.uint32), 127)]
+    # Joining nested lists into one string is much faster than np.asarray()
+    text = ''.join(''.join(''.join(row) for row in board) for board in boards)
+    if len(text) != 64 * len(boards) or not text.isascii():
+        raise ValueError("Boards must be 8x8 lists of single piece letters")
+    return _INDEX_OF_CODE[np.frombuffer(text.encode('ascii'), dtype=np.uint8).reshape(len(boards), 64)]
+
+def to_planes(indices: np.ndarray) -> np.ndarray:
+    """Expand (n, 64) piece indices into (n, 12, 64) boolean piece planes."""
+    return indices[:, None, :] == np.arange(len(PIECE_LETTERS), dtype=indices.dtype)[None, :, None]
+
+def encode_fens(fens: Sequence[str]) -> np.ndarray:
+    """(n, 12, 64) boolean piece planes of FEN strings."""
+    return to_planes(fen_piece_indices(fens))
+
+def encode_boards(boards: Union[np.ndarray, Sequence[List[List[str]]]]) -> np.ndarray:
+    """(n, 12, 64) boolean piece planes of stacked 8x8 boards of piece letters."""
+    return to_planes(board_piece_indices(boards))
+
+def _blend_kings(scores: np.ndarray, phase: np.ndarray, white_kings: np.ndarray, black_kings: np.ndarray) -> np.ndarray:
+    """Vectorized king_adjustment() over (n, 64) king masks."""
+    gain = np.where(white_kings.any(axis=1), _KING_ENDGAME_GAIN[white_kings.argmax(axis=1)], 0) - \
+        np.where(black_kings.any(axis=1), _KING_ENDGAME_GAIN[black_kings.argmax(axis=1) ^ 56], 0)
+    return scores + gain * (MAX_PHASE - np.minimum(phase, MAX_PHASE)) // MAX_PHASE
+
+def evaluate_indices(indices: np.ndarray) -> np.ndarray:
+    """Scores of (n, 64) piece indices, in centipawns for white."""
+    indices = np.asarray(indices)
+    scores = _INDEX_SCORES[indices, np.arange(64)].sum(axis=1)
+    phase = _INDEX_PHASE[indices].sum(axis=1)
+    return _blend_kings(scores, phase, indices == 5, indices == 11)
+
+def evaluate_planes(planes: np.ndarray) -> np.ndarray:
+    """Scores of (n, 12, 64) or (n, 12, 8, 8) piece planes, in centipawns for white."""
+    planes = np.asarray(planes).reshape(len(planes), len(PIECE_LETTERS), 64)
+    # float32 holds every possible total exactly and takes the fast BLAS path
+    flat = planes.reshape(len(planes), -1).astype(np.float32)
+    scores = (flat @ PLANE_SCORES.ravel().astype(np.float32)).astype(np.int64)
+    phase = np.count_nonzero(planes, axis=2) @ PLANE_PHASE
+    return _blend_kings(scores, phase, planes[:, 5], planes[:, 11])
+
+def evaluate_batch(positions: Union[Sequence[str], np.ndarray]) -> np.ndarray:
+    """Score many positions in one call, in centipawns for white.
+
+    `positions` is a list of FEN strings, stacked 8x8 boards of piece
+    letters, or (n, 12, 64) piece planes as returned by encode_fens().
+    """
+    if len(positions) == 0:
+        return np.zeros(0, dtype=np.int64)
+    if isinstance(positions[0], str):
+        return evaluate_indices(fen_piece_indices(positions))
+    if isinstance(positions, np.ndarray) and positions.dtype == bool:
+        return evaluate_planes(positions)
+    return evaluate_indices(board_piece_indices(positions))
@@ -0,0 +1,238 @@
+"""Alpha-beta chess search on the in-house engine.
+
+Searcher runs iterative deepening negamax with alpha-beta pruning under a
+time limit. Positions are cached in a size-capped transposition table keyed
+by the engine's Zobrist key. Moves are ordered by the table move, then
+captures by MVV-LVA, then killer moves, then the history heuristic. A
+quiescence search over captures and promotions settles the leaves.
+"""
+import time
+from typing import Dict, List, Optional, Tuple
+
+from chess_engine import EMPTY, ChessGame, Move
+from chess_eval import PIECE_VALUES
+
+MATE_SCORE = 100000
+MATE_BOUND = MATE_SCORE - 1000  # Scores beyond this are mates, counted in plies
+INFINITY = MATE_SCORE + 1
+MAX_PLY = 64
+
+# Transposition table bounds
+EXACT = 0
+LOWER = 1
+UPPER = 2
+
+# Move ordering tiers, kept apart so MVV-LVA and history scores never overlap
+TT_MOVE_ORDER = 1 << 30
+CAPTURE_ORDER = 1 << 28
+KILLER_ORDER = 1 << 27
+
+class SearchTimeout(Exception):
+    """Raised inside the search when the time budget runs out."""
+
+def evaluate(game: ChessGame) -> int:
+    """Piece-square evaluation in centipawns from the side to move's point of view."""
+    score = game.evaluate()
+    return score if game.current_player == 'white' else -score
+
+class Searcher:
+    def __init__(self, max_entries: int = 1 << 18):
+        if max_entries <= 0:
+            raise ValueError("max_entries must be positive")
+        self.max_entries = max_entries
+        # Zobrist key -> (depth, score, bound, best move)
+        self.table: Dict[int, Tuple[int, int, int, Optional[Move]]] = {}
+        self.killers: List[List[Optional[Move]]] = [[None, None] for _ in range(MAX_PLY)]
+        self.history: Dict[Tuple[str, int], int] = {}
+        self.nodes = 0
+        self.depth = 0  # Deepest fully searched iteration of the last search
+        self.score = 0  # Its score in centipawns for the side to move
+        self._deadline = 0.0
+
+    def search(self, game: ChessGame, time_limit: float = 1.0, max_depth: int = MAX_PLY - 1) -> Optional[Move]:
+        """Return the best move found within the time limit, or None without legal moves.
+
+        The position is restored before returning. At least the first
+        iteration always completes, so a move is returned even with a
+        tiny budget.
+        """
+        moves = list(game.legal_moves())
+        if not moves:
+            return None
+        self._deadline = time.perf_counter() + time_limit
+        self.nodes = 0
+        self.killers = [[None, None] for _ in range(MAX_PLY)]
+        self.history.clear()
+        status = (game.is_checkmate, game.is_stalemate, game.is_draw)
+        stack_size = game.ply_count
+
+        best_move = moves[0]
+        self.depth = 0
+        try:
+            for depth in range(1, max_depth + 1):
+                score, move = self._root(game, moves, depth, bool(self.depth))
+                best_move, self.score, self.depth = move, score, depth
+                if abs(score) >= MATE_BOUND or time.perf_counter() >= self._deadline:
+                    break
+        except SearchTimeout:
+            while game.ply_count > stack_size:
+                game.pop()
+        game.is_checkmate, game.is_stalemate, game.is_draw = status
+        return best_move
+
+    def _root(self, game: ChessGame, moves: List[Move], depth: int, can_stop: bool) -> Tuple[int, Move]:
+        """Search every root move to `depth`, best move of the previous iteration first."""
+        entry = self.table.get(game.zobrist_key)
+        moves.sort(key=lambda move: self._order(game, move, entry[3] if entry else None, 0), reverse=True)
+        alpha = -INFINITY
+        best_move = moves[0]
+        for move in moves:
+            game.push(move)
+            score = -self._negamax(game, depth - 1, -INFINITY, -alpha, 1, can_stop)
+            game.pop()
+            if score > alpha:
+                alpha, best_move = score, move
+        # Keep the best move at the front for the next iteration
+        moves.remove(best_move)
+        moves.insert(0, best_move)
+        self._store(game.zobrist_key, depth, alpha, EXACT, best_move)
+        return alpha, best_move
+
+    def _negamax(self, game: ChessGame, depth: int, alpha: int, beta: int, ply: int, can_stop: bool) -> int:
+        self._count_node(can_stop)
+        if game.halfmove_clock >= 100 or game.is_repetition(2):
+            return 0
+        if depth <= 0 or ply >= MAX_PLY - 1:
+            return self._quiescence(game, alpha, beta, ply, can_stop)
+
+        key = game.zobrist_key
+        entry = self.table.get(key)
+        tt_move = None
+        if entry is not None:
+            entry_depth, entry_score, bound, tt_move = entry
+            if entry_depth >= depth:
+                entry_score = _score_from_table(entry_score, ply)
+                if bound == EXACT or (bound == LOWER and entry_score >= beta) or \
+                        (bound == UPPER and entry_score <= alpha):
+                    return entry_score
+
+        moves = list(game.legal_moves())
+        if not moves:
+            return -MATE_SCORE + ply if game.is_check else 0
+        if game.is_check:
+            depth += 1  # Check extension
+        moves.sort(key=lambda move: self._order(game, move, tt_move, ply), reverse=True)
+
+        original_alpha = alpha
+        best_score = -INFINITY
+        best_move = None
+        for move in moves:
+            quiet = not self._is_capture(game, move) and not move.promotion
+            game.push(move)
+            score = -self._negamax(game, depth - 1, -beta, -alpha, ply + 1, can_stop)
+            game.pop()
+            if score > best_score:
+                best_score, best_move = score, move
+            if score > alpha:
+                alpha = score
+            if alpha >= beta:
+                if quiet:
+                    killers = self.killers[ply]
+                    if killers[0] != move:
+                        killers[1], killers[0] = killers[0], move
+                    history_key = (game.piece_at(move.from_square), move.to_square)
+                    self.history[history_key] = self.history.get(history_key, 0) + depth * depth
+                break
+
+        if best_score <= original_alpha:
+            bound = UPPER
+        elif best_score >= beta:
+            bound = LOWER
+        else:
+            bound = EXACT
+        self._store(key, depth, _score_to_table(best_score, ply), bound, best_move)
+        return best_score
+
+    def _quiescence(self, game: ChessGame, alpha: int, beta: int, ply: int, can_stop: bool) -> int:
+        """Search captures and promotions until the position is quiet; all moves when in check."""
+        self._count_node(can_stop)
+        if ply >= MAX_PLY - 1:
+            return evaluate(game)
+        in_check = game.is_check
+        if not in_check:
+            stand_pat = evaluate(game)
+            if stand_pat >= beta:
+                return stand_pat
+            alpha = max(alpha, stand_pat)
+
+        moves = list(game.legal_moves())
+        if not moves:
+            return -MATE_SCORE + ply if in_check else 0
+        if not in_check:
+            moves = [move for move in moves if self._is_capture(game, move) or move.promotion == 'Q']
+        moves.sort(key=lambda move: self._order(game, move, None, ply), reverse=True)
+
+        for move in moves:
+            game.push(move)
+            score = -self._quiescence(game, -beta, -alpha, ply + 1, can_stop)
+            game.pop()
+            if score >= beta:
+                return score
+            alpha = max(alpha, score)
+        return alpha
+
+    def _count_node(self, can_stop: bool) -> None:
+        """Count a node and, every 1024 nodes, give up once the deadline has passed."""
+        self.nodes += 1
+        if can_stop and not self.nodes & 1023 and time.perf_counter() >= self._deadline:
+            raise SearchTimeout
+
+    def _is_capture(self, game: ChessGame, move: Move) -> bool:
+        return game.piece_at(move.to_square) != EMPTY or \
+            (move.to_square == game.ep_square and game.piece_at(move.from_square) in 'Pp')
+
+    def _order(self, game: ChessGame, move: Move, tt_move: Optional[Move], ply: int) -> int:
+        """Sort key: table move, captures by MVV-LVA, promotions, killers, then history."""
+        if move == tt_move:
+            return TT_MOVE_ORDER
+        piece = game.piece_at(move.from_square)
+        victim = game.piece_at(move.to_square)
+        if victim != EMPTY or move.promotion:
+            gain = PIECE_VALUES[victim.upper()] if victim != EMPTY else 0
+            if move.promotion:
+                gain += PIECE_VALUES[move.promotion]
+            return CAPTURE_ORDER + gain * 16 - PIECE_VALUES[piece.upper()] // 100
+        if move.to_square == game.ep_square and piece in 'Pp':
+            return CAPTURE_ORDER + PIECE_VALUES['P'] * 16 - 1
+        if move in self.killers[ply]:
+            return KILLER_ORDER
+        return self.history.get((piece, move.to_square), 0)
+
+    def _store(self, key: int, depth: int, score: int, bound: int, move: Optional[Move]) -> None:
+        """Add a table entry, evicting the oldest entries once the table is full."""
+        table = self.table
+        if key not in table and len(table) >= self.max_entries:
+            del table[next(iter(table))]
+        table[key] = (depth, score, bound, move)
+
+def _score_to_table(score: int, ply: int) -> int:
+    """Store mate scores relative to the node rather than the root."""
+    if score >= MATE_BOUND:
+        return score + ply
+    if score <= -MATE_BOUND:
+        return score - ply
+    return score
+
+def _score_from_table(score: int, ply: int) -> int:
+    if score >= MATE_BOUND:
+        return score - ply
+    if score <= -MATE_BOUND:
+        return score + ply
+    return score
+
+def best_move_uci(fen: str, time_limit: float = 1.0) -> Optional[str]:
+    """Search a FEN position and return the best move in UCI notation, or None without legal moves."""
+    game = ChessGame('white', 'black')
+    game.set_fen(fen)
+    move = Searcher().search(game, time_limit)
+    return move.uci() if move else None
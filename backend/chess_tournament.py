@@ -6,33 +6,63 @@ load_dotenv()
 
 import chess
 import chess.engine
-import openai
-import anthropic
+import chess.polyglot
 import google.generativeai as generativeai
 import asyncio
+import time
 from datetime import datetime
-from leaderboard import leaderboard
+from leaderboard import Leaderboard
+from chess_engine import ChessGame
+from chess_search import best_move_uci, evaluate
+from eco import OpeningClassifier
+from llm_clients import close_clients, player_api, scheduled_call
+from move_cache import cache_key, default_cache
+from rate_limit import BATCH
+from hedging import LatencyTracker, move_budget
+from prompts import CHESS_TEMPLATE, chess_move_prompt, parse_move, request_params, token_meter
 from typing import Optional, List, Dict
 import random
 
+# Provider model and sampling parameters of each player
+PLAYER_MODELS = {
+    "OpenAI": ("gpt-3.5-turbo", request_params('openai', temperature=0.2)),
+    "Anthropic": ("claude-3-opus-20240229", request_params('anthropic')),
+    "Gemini": ("gemini-pro", request_params('google'))
+}
+
 class ChessTournament:
-    def __init__(self):
+    def __init__(self, game_time: float = 900.0):
         self.players = ["OpenAI", "Anthropic", "Gemini"]
         self.matches = []
         self.rankings = {}
+        self.leaderboard = Leaderboard('chess')  # Every game with its opening
         
-        # Initialize AI clients
-        self.openai_client = openai.OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
-        self.claude = anthropic.Anthropic(api_key=os.getenv('ANTHROPIC_API_KEY'))
+        # Providers are called through llm_clients; its shared async clients let a
+        # hedged or timed-out request be cancelled rather than left running
         generativeai.configure(api_key=os.getenv('GOOGLE_API_KEY'))
         
-        # Initialize Stockfish
-        self.engine = chess.engine.SimpleEngine.popen_uci("stockfish")
+        # Initialize Stockfish, falling back to the built-in searcher without it
+        try:
+            self.engine = chess.engine.SimpleEngine.popen_uci("stockfish")
+        except (FileNotFoundError, chess.engine.EngineError, chess.engine.EngineTerminatedError):
+            print("Stockfish not found, using the built-in alpha-beta searcher")
+            self.engine = None
+
+        self.move_cache = default_cache()
+        # Seconds of LLM time each player gets per game. A move may take its
+        # share, move_budget(), before the local engine answers instead;
+        # requests slower than the player's recent p95 are hedged with a duplicate
+        self.game_time = game_time
+        self.latency = {player: LatencyTracker() for player in self.players}
     
     async def play_game(self, white_player, black_player, game_number):
+        """Play one game; return the winner (None for a draw) and the opening reached."""
         print(f"\nGame {game_number}: {white_player} (White) vs {black_player} (Black)\n")
         board = chess.Board()
         move_count = 1
+        classifier = OpeningClassifier()
+        # Seconds each player's LLM has left for the game; the engine moves for it once out
+        clock = {player: self.game_time for player in (white_player, black_player)}
         
         while not board.is_game_over():
             print(f"\nMove {move_count}")
@@ -40,7 +70,9 @@ class ChessTournament:
             
             current = white_player if board.turn == chess.WHITE else black_player
             try:
-                move_uci = await self.get_move(current, board)
+                start = time.monotonic()
+                move_uci = await self.get_move(current, board, clock[current])
+                clock[current] -= time.monotonic() - start
                 if move_uci is None:
                     break
                     
@@ -50,8 +82,8 @@ class ChessTournament:
                     board.push(move)
                     print(f"{current} plays: {move_uci}")
                 else:
-                    # Use first legal move as fallback
-                    fallback = list(board.legal_moves)[0]
+                    # Use the engine's best move as fallback
+                    fallback = chess.Move.from_uci(self.best_move(board))
                     board.push(fallback)
                     print(f"Invalid move {move_uci}, using {fallback.uci()}")
                     
@@ -60,13 +92,18 @@ class ChessTournament:
                     
             except Exception as e:
                 print(f"Error during move: {e}")
-                fallback = list(board.legal_moves)[0]
+                fallback = chess.Move.from_uci(self.best_move(board))
                 board.push(fallback)
                 print(f"Using fallback move: {fallback.uci()}")
                 
                 if board.turn == chess.WHITE:
                     move_count += 1
+
+            # Exactly one move was pushed above
+            classifier.push_board(board)
         
+        opening = str(classifier.opening) if classifier.opening else None
+        print(f"\nOpening: {opening or 'Unclassified'}")
         # Game over - determine winner
         if board.is_checkmate():
             winner = black_player if board.turn == chess.WHITE else white_player
@@ -75,7 +112,7 @@ class ChessTournament:
             print("\nGame drawn!")
             winner = None
             
-        return winner
+        return winner, opening
     
     async def run_tournament(self):
         print("\n=== Chess AI Tournament ===")
@@ -90,13 +127,15 @@ class ChessTournament:
                 
                 # Play 4 games
                 for game in range(4):
-                    if game % 2 == 0:
-                        await self.play_game(player1, player2, game + 1)
-                    else:
-                        await self.play_game(player2, player1, game + 1)
+                    white, black = (player1, player2) if game % 2 == 0 else (player2, player1)
+                    winner, opening = await self.play_game(white, black, game + 1)
+                    self.update_rankings(winner)
+                    self.leaderboard.add_game(white, black, winner or 'draw', opening=opening)
         
         self.show_rankings()
-        self.engine.quit()
+        await close_clients()
+        if self.engine is not None:
+            self.engine.quit()
 
     def update_rankings(self, winner):
         if winner:
@@ -115,74 +154,79 @@ class ChessTournament:
             print(f"{player}: {wins} wins")
         print("====================\n")
         
-        # Show overall leaderboard
-        leaderboard.show_rankings('chess')
-        leaderboard.show_rankings()
+        # Tokens each player spent per move
+        for player, stats in token_meter.stats().items():
+            print(f"{player}: {stats['tokens_per_move']:.0f} tokens/move over {stats['moves']} moves, "
+                  f"{stats['illegal']} illegal replies")
+
+        # Results per opening reached
+        for opening, stats in self.leaderboard.opening_stats().items():
+            print(f"{opening}: {stats['games']} games, white scored {stats['white_score']:.0%}")
 
-    async def get_move(self, player, board):
+    async def get_move(self, player, board, time_left):
+        """The player's move in UCI, from the engine when its LLM misses move_budget(time_left) or fails."""
         try:
             legal_moves = [move.uci() for move in board.legal_moves]
             if not legal_moves:
                 return None
                 
-            # Get Stockfish evaluation for current position
-            info = self.engine.analyse(board, chess.engine.Limit(time=0.1))
-            eval_score = info["score"].relative.score()
+            # Answers already given for this position by the same model and prompt
+            model, sampling = PLAYER_MODELS.get(player, PLAYER_MODELS["Gemini"])
+            key = cache_key(player, model, CHESS_TEMPLATE.version, chess.polyglot.zobrist_hash(board), **sampling)
+            cached = await self.move_cache.get(key, legal_moves)
+            if cached:
+                print(f"{player} plays: {cached} (cached)")
+                return cached
+
+            # Evaluate the current position
+            eval_score = self.evaluate(board)
             
-            prompt = f"""You are a chess master. Current position evaluation: {eval_score/100} pawns.
-            Choose the best move from these legal moves: {', '.join(legal_moves)}
-            Avoid repetitive moves. Think strategically about piece development and king safety.
-            Respond with ONLY the chosen move in UCI format."""
-                
-            if player == "OpenAI":
-                completion = self.openai_client.chat.completions.create(
-                    model="gpt-3.5-turbo",
-                    temperature=0.2,
-                    max_tokens=10,
-                    messages=[{
-                        "role": "system",
-                        "content": prompt
-                    }]
-                )
-                move = completion.choices[0].message.content.strip().lower()
-                
-            elif player == "Anthropic":
-                response = self.claude.messages.create(
-                    model="claude-3-opus-20240229",
-                    max_tokens=10,
-                    messages=[{
-                        "role": "user",
-                        "content": prompt
-                    }]
-                )
-                move = response.content[0].text.strip().lower()
+            prompt = chess_move_prompt(board, evaluation=eval_score / 100)
                 
-            else:  # Gemini
-                model = generativeai.GenerativeModel('gemini-pro')
-                response = await model.generate_content(prompt)
-                move = response.text.strip().lower()
+            # Queued behind the provider's rate limits, after live games
+            api_type, api_key = player_api(player)
+            budget = move_budget(time_left)
+            reply, tokens_in, tokens_out = await asyncio.wait_for(scheduled_call(
+                api_type, api_key, model, sampling, prompt, BATCH, self.latency.setdefault(player, LatencyTracker())),
+                budget)
                 
-            # Clean and validate move
-            move = ''.join(c for c in move if c.isalnum())
-            if move in legal_moves:
+            # Validate move, in UCI or SAN
+            move = parse_move(reply, board)
+            token_meter.record(player, tokens_in, tokens_out, legal=move is not None)
+            if move is not None:
                 # Get evaluation after potential move
                 test_board = board.copy()
                 test_board.push(chess.Move.from_uci(move))
-                info = self.engine.analyse(test_board, chess.engine.Limit(time=0.1))
-                new_eval = info["score"].relative.score()
+                new_eval = self.evaluate(test_board)
                 
                 print(f"{player} plays: {move} (position change: {(new_eval - eval_score)/100:.2f} pawns)")
+                await self.move_cache.put(key, move)
                 return move
                 
-            print(f"Invalid move {move}, using best move")
-            # Use Stockfish's best move as fallback
-            result = self.engine.play(board, chess.engine.Limit(time=0.1))
-            return result.move.uci()
+            print(f"Invalid move {reply}, using best move")
+            return self.best_move(board)
                 
+        except asyncio.TimeoutError:
+            print(f"{player} did not answer within its {budget:.1f}s budget")
+            return self.best_move(board)
         except Exception as e:
             print(f"Error in get_move for {player}: {e}")
-            result = self.engine.play(board, chess.engine.Limit(time=0.1))
-            return result.move.uci()
+            return self.best_move(board)
+
+    def evaluate(self, board):
+        """Centipawn evaluation for the side to move, from Stockfish when available."""
+        if self.engine is None:
+            game = ChessGame('white', 'black')
+            game.set_fen(board.fen())
+            return evaluate(game)
+        info = self.engine.analyse(board, chess.engine.Limit(time=0.1))
+        return info["score"].relative.score(mate_score=100000)
+
+    def best_move(self, board):
+        """Fallback move in UCI notation from Stockfish, or from the built-in searcher without it."""
+        if self.engine is not None:
+            return self.engine.play(board, chess.engine.Limit(time=0.1)).move.uci()
+        return best_move_uci(board.fen(), time_limit=0.5)
 
     def board_to_ascii(self, board):
         """Convert chess board to ASCII representation"""
@@ -0,0 +1,210 @@
+"""ECO opening classification.
+
+EcoIndex maps the Zobrist key of every position on a named opening line
+to its ECO code and name, so classifying a game is one dict lookup per
+move. Keys are Polyglot keys, the same as ChessGame.zobrist_key and
+chess.polyglot.zobrist_hash, and transpositions land on the same entry.
+OpeningClassifier follows a game move by move and keeps the deepest
+opening reached; opening_stats() turns classified results into
+per-opening win rates.
+"""
+import csv
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple, TypedDict
+
+import chess
+import chess.polyglot
+
+from chess_engine import ChessGame, Move, square_index
+
+class Opening(NamedTuple):
+    eco: str
+    name: str
+    ply: int  # Length of the line that defines it
+
+    def __str__(self) -> str:
+        return f"{self.eco} {self.name}"
+
+class OpeningStats(TypedDict):
+    games: int
+    white_wins: int
+    draws: int
+    black_wins: int
+    white_score: float  # Points per game for white, draws counting half
+
+# Built-in lines as (ECO code, name, UCI moves); EcoIndex.from_tsv() loads fuller tables
+ECO_OPENINGS: List[Tuple[str, str, str]] = [
+    ('A00', "Polish Opening", 'b2b4'),
+    ('A00', "Hungarian Opening", 'g2g3'),
+    ('A00', "Van Geet Opening", 'b1c3'),
+    ('A01', "Nimzo-Larsen Attack", 'b2b3'),
+    ('A02', "Bird Opening", 'f2f4'),
+    ('A04', "Zukertort Opening", 'g1f3'),
+    ('A10', "English Opening", 'c2c4'),
+    ('A15', "English Opening: Anglo-Indian Defense", 'c2c4 g8f6'),
+    ('A20', "English Opening: King's English Variation", 'c2c4 e7e5'),
+    ('A30', "English Opening: Symmetrical Variation", 'c2c4 c7c5'),
+    ('A40', "Queen's Pawn Game", 'd2d4'),
+    ('A45', "Indian Defense", 'd2d4 g8f6'),
+    ('A56', "Benoni Defense", 'd2d4 g8f6 c2c4 c7c5'),
+    ('A57', "Benko Gambit", 'd2d4 g8f6 c2c4 c7c5 d4d5 b7b5'),
+    ('A80', "Dutch Defense", 'd2d4 f7f5'),
+    ('B00', "King's Pawn Game", 'e2e4'),
+    ('B01', "Scandinavian Defense", 'e2e4 d7d5'),
+    ('B02', "Alekhine Defense", 'e2e4 g8f6'),
+    ('B06', "Modern Defense", 'e2e4 g7g6'),
+    ('B07', "Pirc Defense", 'e2e4 d7d6 d2d4 g8f6'),
+    ('B10', "Caro-Kann Defense", 'e2e4 c7c6'),
+    ('B12', "Caro-Kann Defense: Advance Variation", 'e2e4 c7c6 d2d4 d7d5 e4e5'),
+    ('B13', "Caro-Kann Defense: Exchange Variation", 'e2e4 c7c6 d2d4 d7d5 e4d5 c6d5'),
+    ('B20', "Sicilian Defense", 'e2e4 c7c5'),
+    ('B21', "Sicilian Defense: Smith-Morra Gambit", 'e2e4 c7c5 d2d4 c5d4 c2c3'),
+    ('B22', "Sicilian Defense: Alapin Variation", 'e2e4 c7c5 c2c3'),
+    ('B23', "Sicilian Defense: Closed", 'e2e4 c7c5 b1c3'),
+    ('B27', "Sicilian Defense", 'e2e4 c7c5 g1f3'),
+    ('B30', "Sicilian Defense: Old Sicilian", 'e2e4 c7c5 g1f3 b8c6'),
+    ('B40', "Sicilian Defense: French Variation", 'e2e4 c7c5 g1f3 e7e6'),
+    ('B50', "Sicilian Defense: Modern Variations", 'e2e4 c7c5 g1f3 d7d6'),
+    ('B70', "Sicilian Defense: Dragon Variation", 'e2e4 c7c5 g1f3 d7d6 d2d4 c5d4 f3d4 g8f6 b1c3 g7g6'),
+    ('B90', "Sicilian Defense: Najdorf Variation", 'e2e4 c7c5 g1f3 d7d6 d2d4 c5d4 f3d4 g8f6 b1c3 a7a6'),
+    ('C00', "French Defense", 'e2e4 e7e6'),
+    ('C02', "French Defense: Advance Variation", 'e2e4 e7e6 d2d4 d7d5 e4e5'),
+    ('C03', "French Defense: Tarrasch Variation", 'e2e4 e7e6 d2d4 d7d5 b1d2'),
+    ('C11', "French Defense: Classical Variation", 'e2e4 e7e6 d2d4 d7d5 b1c3 g8f6'),
+    ('C15', "French Defense: Winawer Variation", 'e2e4 e7e6 d2d4 d7d5 b1c3 f8b4'),
+    ('C20', "King's Pawn Game", 'e2e4 e7e5'),
+    ('C21', "Danish Gambit", 'e2e4 e7e5 d2d4 e5d4 c2c3'),
+    ('C23', "Bishop's Opening", 'e2e4 e7e5 f1c4'),
+    ('C25', "Vienna Game", 'e2e4 e7e5 b1c3'),
+    ('C30', "King's Gambit", 'e2e4 e7e5 f2f4'),
+    ('C33', "King's Gambit Accepted", 'e2e4 e7e5 f2f4 e5f4'),
+    ('C40', "King's Knight Opening", 'e2e4 e7e5 g1f3'),
+    ('C41', "Philidor Defense", 'e2e4 e7e5 g1f3 d7d6'),
+    ('C42', "Petrov's Defense", 'e2e4 e7e5 g1f3 g8f6'),
+    ('C44', "King's Knight Opening: Normal Variation", 'e2e4 e7e5 g1f3 b8c6'),
+    ('C45', "Scotch Game", 'e2e4 e7e5 g1f3 b8c6 d2d4 e5d4 f3d4'),
+    ('C47', "Four Knights Game", 'e2e4 e7e5 g1f3 b8c6 b1c3 g8f6'),
+    ('C50', "Italian Game", 'e2e4 e7e5 g1f3 b8c6 f1c4'),
+    ('C50', "Italian Game: Giuoco Piano", 'e2e4 e7e5 g1f3 b8c6 f1c4 f8c5'),
+    ('C51', "Italian Game: Evans Gambit", 'e2e4 e7e5 g1f3 b8c6 f1c4 f8c5 b2b4'),
+    ('C55', "Italian Game: Two Knights Defense", 'e2e4 e7e5 g1f3 b8c6 f1c4 g8f6'),
+    ('C60', "Ruy Lopez", 'e2e4 e7e5 g1f3 b8c6 f1b5'),
+    ('C65', "Ruy Lopez: Berlin Defense", 'e2e4 e7e5 g1f3 b8c6 f1b5 g8f6'),
+    ('C68', "Ruy Lopez: Exchange Variation", 'e2e4 e7e5 g1f3 b8c6 f1b5 a7a6 b5c6'),
+    ('C70', "Ruy Lopez: Morphy Defense", 'e2e4 e7e5 g1f3 b8c6 f1b5 a7a6 b5a4'),
+    ('D00', "Queen's Pawn Game", 'd2d4 d7d5'),
+    ('D06', "Queen's Gambit", 'd2d4 d7d5 c2c4'),
+    ('D07', "Queen's Gambit Declined: Chigorin Defense", 'd2d4 d7d5 c2c4 b8c6'),
+    ('D10', "Slav Defense", 'd2d4 d7d5 c2c4 c7c6'),
+    ('D20', "Queen's Gambit Accepted", 'd2d4 d7d5 c2c4 d5c4'),
+    ('D30', "Queen's Gambit Declined", 'd2d4 d7d5 c2c4 e7e6'),
+    ('D80', "Grünfeld Defense", 'd2d4 g8f6 c2c4 g7g6 b1c3 d7d5'),
+    ('E12', "Queen's Indian Defense", 'd2d4 g8f6 c2c4 e7e6 g1f3 b7b6'),
+    ('E20', "Nimzo-Indian Defense", 'd2d4 g8f6 c2c4 e7e6 b1c3 f8b4'),
+    ('E60', "King's Indian Defense", 'd2d4 g8f6 c2c4 g7g6'),
+]
+
+def _uci_to_move(uci: str) -> Move:
+    from_square = square_index(8 - int(uci[1]), ord(uci[0]) - 97)
+    to_square = square_index(8 - int(uci[3]), ord(uci[2]) - 97)
+    return Move(from_square, to_square, uci[4].upper() if len(uci) > 4 else None)
+
+class EcoIndex:
+    def __init__(self, lines: Iterable[Tuple[str, str, List[str]]]):
+        """Index (ECO code, name, UCI moves) lines by the key of the position each line ends in.
+
+        When lines end in the same position, the longer line wins, then the later one.
+        """
+        self.positions: Dict[int, Opening] = {}
+        self.max_ply = 0
+        for eco, name, moves in lines:
+            game = ChessGame('white', 'black')
+            for uci in moves:
+                move = _uci_to_move(uci)
+                if move not in set(game.legal_moves()):
+                    raise ValueError(f"Illegal move {uci} in {eco} {name}")
+                game.push(move)
+            known = self.positions.get(game.zobrist_key)
+            if known is None or known.ply <= len(moves):
+                self.positions[game.zobrist_key] = Opening(eco, name, len(moves))
+            self.max_ply = max(self.max_ply, len(moves))
+
+    @classmethod
+    def from_tsv(cls, path: str) -> 'EcoIndex':
+        """Load a table with eco, name and pgn columns, like the lichess chess-openings files."""
+        lines = []
+        with open(path, encoding='utf-8', newline='') as table:
+            for row in csv.DictReader(table, delimiter='\t'):
+                board = chess.Board()
+                moves = []
+                for token in row['pgn'].split():
+                    if token[0].isdigit():  # Move numbers
+                        continue
+                    moves.append(board.push_san(token).uci())
+                lines.append((row['eco'], row['name'], moves))
+        return cls(lines)
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def get(self, key: int) -> Optional[Opening]:
+        return self.positions.get(key)
+
+    def classify(self, keys: Iterable[int]) -> Optional[Opening]:
+        """Deepest opening among the position keys of one game, in move order."""
+        classifier = OpeningClassifier(self)
+        for key in keys:
+            classifier.update(key)
+        return classifier.opening
+
+_default_index: Optional[EcoIndex] = None
+
+def default_index() -> EcoIndex:
+    """Index of ECO_OPENINGS, built on first use."""
+    global _default_index
+    if _default_index is None:
+        _default_index = EcoIndex((eco, name, moves.split()) for eco, name, moves in ECO_OPENINGS)
+    return _default_index
+
+class OpeningClassifier:
+    """Streaming classifier: feed it the position key after every move.
+
+    The latest matching position is the deepest opening reached. Once the
+    game is longer than every indexed line no further lookups are made.
+    """
+    def __init__(self, index: Optional[EcoIndex] = None):
+        self.index = index or default_index()
+        self.opening: Optional[Opening] = None
+        self.ply = 0
+
+    def update(self, key: int) -> Optional[Opening]:
+        """Record the key of the position after the next move and return the opening so far."""
+        self.ply += 1
+        if self.ply <= self.index.max_ply:
+            found = self.index.get(key)
+            if found is not None:
+                self.opening = found
+        return self.opening
+
+    def push_board(self, board: chess.Board) -> Optional[Opening]:
+        """update() from a python-chess board, after its move has been pushed."""
+        return self.update(chess.polyglot.zobrist_hash(board))
+
+def opening_stats(results: Iterable[Tuple[Optional[str], str]]) -> Dict[str, OpeningStats]:
+    """Per-opening results from (opening, result) pairs, result being 'white', 'black' or 'draw'.
+
+    Games without an opening are counted under 'Unclassified'.
+    """
+    stats: Dict[str, OpeningStats] = {}
+    for opening, result in results:
+        entry = stats.setdefault(opening or 'Unclassified',
+                                 {'games': 0, 'white_wins': 0, 'draws': 0, 'black_wins': 0, 'white_score': 0.0})
+        entry['games'] += 1
+        if result == 'white':
+            entry['white_wins'] += 1
+        elif result == 'black':
+            entry['black_wins'] += 1
+        else:
+            entry['draws'] += 1
+    for entry in stats.values():
+        entry['white_score'] = (entry['white_wins'] + entry['draws'] / 2) / entry['games']
+    return stats
@@ -1,20 +1,71 @@
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from go_engine import GoBoard as GoEngine
+
 class GoBoard:
-    def __init__(self, size=9):
+    """List-of-lists Go board API used by the tournament runners and the REST API.
+
+    The rules (captures, suicide, ko, scoring) come from the go_engine core.
+    Coordinates keep this API's convention: make_move(x, y) plays column x of
+    row y, and get_state()[y][x] reads it back.
+    """
+    def __init__(self, size=9, ko_rule='simple'):
         self.size = size
-        self.board = [[0 for _ in range(size)] for _ in range(size)]
-        self.current_player = 1  # 1 for black, 2 for white
-        
+        self.engine = GoEngine(size, ko_rule)
+
+    @property
+    def current_player(self) -> int:
+        return self.engine.current_player
+
+    @property
+    def board(self) -> List[List[int]]:
+        return self.engine.board.tolist()
+
+    @property
+    def captured_black(self) -> int:
+        return self.engine.captured_black
+
+    @property
+    def captured_white(self) -> int:
+        return self.engine.captured_white
+
     def get_state(self):
         return self.board
-        
-    def make_move(self, x, y):
-        if 0 <= x < self.size and 0 <= y < self.size and self.board[y][x] == 0:
-            self.board[y][x] = self.current_player
-            # Switch player
-            self.current_player = 2 if self.current_player == 1 else 1
-            return True
-        return False
-        
+
+    def get_board(self):
+        return self.board
+
+    def is_valid_move(self, x, y) -> bool:
+        return self.engine.is_valid_move(y, x)
+
+    def legal_moves(self) -> List[Tuple[int, int]]:
+        """All legal (x, y) moves for the side to move."""
+        return [(int(x), int(y)) for y, x in np.argwhere(self.engine.legal_moves_mask())]
+
+    def make_move(self, x, y, player: Optional[int] = None) -> bool:
+        """Play at column x, row y; `player`, if given, must be the side to move."""
+        if player is not None and player != self.current_player:
+            return False
+        return self.engine.make_move(y, x)
+
+    def pass_move(self) -> None:
+        self.engine.pass_move()
+
+    @property
+    def consecutive_passes(self) -> int:
+        return self.engine.consecutive_passes
+
+    @property
+    def is_over(self) -> bool:
+        """Whether both players passed in a row."""
+        return self.consecutive_passes >= 2
+
+    def get_score(self, scoring='area', komi=6.5) -> Tuple[float, float]:
+        """Black and white scores, area scoring by default."""
+        return self.engine.get_score(scoring, komi)
+
     def __str__(self):
         """Convert board to string representation"""
         symbols = {0: '.', 1: '●', 2: '○'}
@@ -23,7 +74,7 @@ class GoBoard:
         cols = '   ' + ' '.join(chr(ord('A') + i) for i in range(self.size))
         rows.append(cols)
         # Add board rows with row numbers
-        for i in range(self.size):
-            row = f"{i+1:2d} " + ' '.join(symbols[cell] for cell in self.board[i])
+        for i, cells in enumerate(self.board):
+            row = f"{i+1:2d} " + ' '.join(symbols[cell] for cell in cells)
             rows.append(row)
-        return '\n'.join(rows) 
\ No newline at end of file
+        return '\n'.join(rows)
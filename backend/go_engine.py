@@ -1,27 +1,163 @@
+import random
 import numpy as np
-from typing import List, Set, Tuple, Optional
-from dataclasses import dataclass
-from collections import defaultdict
+from typing import Dict, List, Tuple, Optional
 
-@dataclass
-class Position:
-    x: int
-    y: int
+# Ko rules: 'simple' forbids retaking a ko immediately, 'positional' forbids
+# repeating any earlier board, 'situational' any earlier board with the same
+# player to move
+KO_RULES = ('simple', 'positional', 'situational')
 
-    def __hash__(self):
-        return hash((self.x, self.y))
+# Scoring rules: 'territory' counts territory plus prisoners, 'area' counts
+# territory plus stones on the board
+SCORING_RULES = ('territory', 'area')
+
+PASS = -1  # Point recorded for a pass
+
+_ZOBRIST_SEED = 0x60B0A4D
+_zobrist_tables: Dict[int, List[List[int]]] = {}
+# Mixed into position keys with white to move under situational superko
+WHITE_TO_MOVE_KEY = random.Random(_ZOBRIST_SEED).getrandbits(64)
+
+def zobrist_table(size: int) -> List[List[int]]:
+    """Zobrist keys indexed [color][point], shared by all boards of a size."""
+    if size not in _zobrist_tables:
+        rng = random.Random(_ZOBRIST_SEED + size)
+        _zobrist_tables[size] = [[0] * (size * size)] + [
+            [rng.getrandbits(64) for _ in range(size * size)] for _ in range(2)
+        ]
+    return _zobrist_tables[size]
+
+# (destination, source) slice pairs pairing every point with its neighbour
+# above, below, left and right, over the last two axes
+NEIGHBOR_SLICES = (
+    (np.s_[..., 1:, :], np.s_[..., :-1, :]),
+    (np.s_[..., :-1, :], np.s_[..., 1:, :]),
+    (np.s_[..., 1:], np.s_[..., :-1]),
+    (np.s_[..., :-1], np.s_[..., 1:]),
+)
+
+def adjacent_points(mask: np.ndarray) -> np.ndarray:
+    """Points orthogonally adjacent to any point set in `mask`."""
+    adjacent = np.zeros_like(mask)
+    for dst, src in NEIGHBOR_SLICES:
+        adjacent[dst] |= mask[src]
+    return adjacent
+
+def label_groups(board: np.ndarray) -> np.ndarray:
+    """Label the connected groups of a board, or of a stack of boards.
+
+    A group is a chain of stones of one color or a region of empty points.
+    Each point gets the smallest flat index in its group. Labels spread to
+    equal neighbours by repeated minimum filters, with pointer jumping so
+    long groups converge in a few passes.
+    """
+    labels = np.arange(board.size).reshape(board.shape)
+    links = [(dst, src, board[dst] == board[src]) for dst, src in NEIGHBOR_SLICES]
+    while True:
+        smallest = labels.copy()
+        for dst, src, linked in links:
+            np.minimum(smallest[dst], np.where(linked, labels[src], board.size), out=smallest[dst])
+        # Pointer jumping: adopt the label of the point our label names
+        flat = smallest.ravel()
+        smallest = flat[flat[smallest]]
+        if np.array_equal(smallest, labels):
+            return labels
+        labels = smallest
+
+def territory_map(board: np.ndarray) -> np.ndarray:
+    """Owner (1 black, 2 white, 0 neither) of each empty point, for a board or stack of boards.
+
+    An empty region belongs to a player when it borders only that player's stones.
+    """
+    labels = label_groups(board)
+    empty = board == 0
+    borders_black = np.zeros(board.size, dtype=bool)
+    borders_white = np.zeros(board.size, dtype=bool)
+    borders_black[labels[empty & adjacent_points(board == 1)]] = True
+    borders_white[labels[empty & adjacent_points(board == 2)]] = True
+    owner = np.where(borders_black & ~borders_white, 1, np.where(borders_white & ~borders_black, 2, 0))
+    return np.where(empty, owner[labels], 0)
 
 class GoBoard:
-    def __init__(self, size=19):
+    def __init__(self, size=19, ko_rule='simple'):
+        if ko_rule not in KO_RULES:
+            raise ValueError(f"Unknown ko rule '{ko_rule}', expected one of {KO_RULES}")
         self.size = size
+        self.ko_rule = ko_rule
         self.board = np.zeros((size, size), dtype=int)
         self.current_player = 1  # 1 for black, 2 for white
         self.captured_black = 0
         self.captured_white = 0
-        self.move_history = []  # For ko rule checking
         self.territory_black = 0
         self.territory_white = 0
-        
+
+        # Chain tracking in flat arrays indexed by point = x * size + y.
+        # Every stone stores the id (root point) of its chain; each root
+        # keeps its stone list and a liberty bitset with bit `point` set for
+        # each empty neighbouring point.
+        self._neighbors = [
+            tuple(nx * size + ny for nx, ny in self._get_neighbors(point // size, point % size))
+            for point in range(size * size)
+        ]
+        self._chain_id = [-1] * (size * size)
+        self._chain_stones: List[List[int]] = [[] for _ in range(size * size)]
+        self._chain_liberties = [0] * (size * size)
+
+        # Zobrist key of the stones on the board, the key after every move
+        # (passes included) and the keys the ko rule forbids repeating
+        self._zobrist = zobrist_table(size)
+        self.zobrist_key = 0
+        self.key_history = [0]
+        self._position_counts = {self._situation_key(0, self.current_player): 1}
+
+        # (point or PASS, color, stone lists of captured chains) per move, for undo()
+        self._undo_stack: List[Tuple[int, int, List[List[int]]]] = []
+        self._start_ko = PASS  # Ko point the history started with, see from_array()
+
+    @classmethod
+    def from_array(cls, stones: np.ndarray, current_player: int = 1, ko_rule: str = 'simple',
+                   ko_point: int = PASS, passes: int = 0) -> 'GoBoard':
+        """Create a board from a (size, size) array of 0/1/2 stones, e.g. one board of a GoBatch.
+
+        The position history starts here. `ko_point` is a point the side to
+        move may not retake, which is recorded as the position before the
+        last move; `passes` ends the history with that many passes.
+        """
+        board = cls(len(stones), ko_rule)
+        # Stones of a legal position all keep a liberty, so placing them captures nothing
+        for point in np.flatnonzero(stones).tolist():
+            board._place_stone(point, int(stones.flat[point]))
+        # Passes are replayed below, so start with the player who made the first of them
+        board.current_player = current_player if passes % 2 == 0 else 3 - current_player
+        board.key_history = [board.zobrist_key]
+        if ko_point != PASS:
+            # Retaking would restore the position from before the ko capture
+            retake = board.zobrist_key ^ board._zobrist[board.current_player][ko_point]
+            for stone in board._captured_by(ko_point, board.current_player):
+                retake ^= board._zobrist[3 - board.current_player][stone]
+            board.key_history.insert(0, retake)
+            board._start_ko = ko_point
+        board._position_counts = {}
+        for key, to_move in zip(board.key_history[::-1], (board.current_player, 3 - board.current_player)):
+            board._position_counts[board._situation_key(key, to_move)] = 1
+        for _ in range(passes):
+            board.pass_move()
+        return board
+
+    def clone(self) -> 'GoBoard':
+        """Copy the position and its history; the neighbour and Zobrist tables are shared."""
+        board = GoBoard.__new__(GoBoard)
+        board.__dict__.update(self.__dict__)
+        board.board = self.board.copy()
+        board._chain_id = self._chain_id.copy()
+        board._chain_stones = [stones.copy() for stones in self._chain_stones]
+        board._chain_liberties = self._chain_liberties.copy()
+        board.key_history = self.key_history.copy()
+        board._position_counts = self._position_counts.copy()
+        # Undo records are never modified, so the copies can share them
+        board._undo_stack = self._undo_stack.copy()
+        return board
+
     def is_valid_move(self, x: int, y: int) -> bool:
         """Check if a move is valid according to Go rules."""
         # Basic boundary and occupation checks
@@ -29,64 +165,298 @@ class GoBoard:
             return False
         if self.board[x][y] != 0:
             return False
-            
-        # Make temporary move to check captures and suicide rule
-        self.board[x][y] = self.current_player
-        
-        # Check for captures
-        opponent = 3 - self.current_player
-        captured_groups = []
-        for nx, ny in self._get_neighbors(x, y):
-            if self.board[nx][ny] == opponent:
-                group = self._get_group(nx, ny)
-                if self._count_liberties(group) == 0:
-                    captured_groups.append(group)
-        
+
+        point = x * self.size + y
+        captured = self._captured_by(point, self.current_player)
+
         # If no captures, check for suicide rule
-        if not captured_groups:
-            own_group = self._get_group(x, y)
-            if self._count_liberties(own_group) == 0:
-                self.board[x][y] = 0  # Undo temporary move
-                return False
-                
-        # Check ko rule
-        if len(self.move_history) >= 2:
-            potential_board = self.board.copy()
-            for group in captured_groups:
-                for pos in group:
-                    potential_board[pos.x][pos.y] = 0
-            if any(np.array_equal(potential_board, prev_board) for prev_board in self.move_history[-2:]):
-                self.board[x][y] = 0  # Undo temporary move
-                return False
-        
-        self.board[x][y] = 0  # Undo temporary move
-        return True
-        
+        if not captured and not self._liberties_after(point, self.current_player):
+            return False
+
+        # Check ko rule against the key of the resulting position
+        key = self.zobrist_key ^ self._zobrist[self.current_player][point]
+        opponent_keys = self._zobrist[3 - self.current_player]
+        for stone in captured:
+            key ^= opponent_keys[stone]
+        return not self._repeats(key, 3 - self.current_player)
+
+    def legal_moves_mask(self) -> np.ndarray:
+        """Boolean (size, size) array of every point where the side to move may play."""
+        size = self.size
+        color = self.current_player
+        opponent = 3 - color
+
+        # Liberty count of the chain each stone belongs to
+        liberty_counts = np.zeros(size * size, dtype=int)
+        for chain, stones in enumerate(self._chain_stones):
+            if stones:
+                liberty_counts[stones] = bin(self._chain_liberties[chain]).count('1')
+        liberty_counts = liberty_counts.reshape(size, size)
+
+        empty = self.board == 0
+        # A stone keeps a liberty next to an empty point or a friendly chain
+        # with another liberty, and captures next to an opponent chain in atari
+        safe = empty | ((self.board == color) & (liberty_counts > 1))
+        captures = empty & adjacent_points((self.board == opponent) & (liberty_counts == 1))
+        mask = empty & (adjacent_points(safe) | captures)
+
+        # Only captures can recreate the previous position; superko needs every move checked
+        candidates = np.flatnonzero(mask & captures if self.ko_rule == 'simple' else mask)
+        own_keys = self._zobrist[color]
+        opponent_keys = self._zobrist[opponent]
+        for point in candidates.tolist():
+            key = self.zobrist_key ^ own_keys[point]
+            if captures.flat[point]:
+                for stone in self._captured_by(point, color):
+                    key ^= opponent_keys[stone]
+            if self._repeats(key, opponent):
+                mask.flat[point] = False
+        return mask
+
+    def ko_point(self) -> int:
+        """Point the side to move may not play because it would retake a simple ko, or PASS."""
+        if not self._undo_stack:
+            return self._start_ko
+        point, _, captured = self._undo_stack[-1]
+        if point == PASS or len(captured) != 1 or len(captured[0]) != 1:
+            return PASS
+        retake = captured[0][0]
+        return PASS if self.is_valid_move(retake // self.size, retake % self.size) else retake
+
+    def _situation_key(self, key: int, to_move: int) -> int:
+        """Key stored for the ko rule: the board key, plus the side to move if situational."""
+        if self.ko_rule == 'situational' and to_move == 2:
+            return key ^ WHITE_TO_MOVE_KEY
+        return key
+
+    def _repeats(self, key: int, to_move: int) -> bool:
+        """Whether reaching board `key` with `to_move` to play breaks the ko rule."""
+        if self.ko_rule == 'simple':
+            # Recreating the position before the opponent's last move
+            return len(self.key_history) >= 2 and key == self.key_history[-2]
+        return self._situation_key(key, to_move) in self._position_counts
+
+    def _captured_by(self, point: int, color: int) -> List[int]:
+        """Stones of the opponent that a stone of `color` at `point` would capture."""
+        opponent = 3 - color
+        bit = 1 << point
+        captured = []
+        seen = []
+        for neighbor in self._neighbors[point]:
+            chain = self._chain_id[neighbor]
+            if chain >= 0 and chain not in seen and self.board.flat[neighbor] == opponent:
+                seen.append(chain)
+                if self._chain_liberties[chain] == bit:
+                    captured.extend(self._chain_stones[chain])
+        return captured
+
+    def _liberties_after(self, point: int, color: int) -> int:
+        """Liberty bitset of the chain a stone of `color` at `point` would join, ignoring captures."""
+        liberties = 0
+        for neighbor in self._neighbors[point]:
+            chain = self._chain_id[neighbor]
+            if chain < 0:
+                liberties |= 1 << neighbor
+            elif self.board.flat[neighbor] == color:
+                liberties |= self._chain_liberties[chain]
+        return liberties & ~(1 << point)
+
     def make_move(self, x: int, y: int) -> bool:
         """Make a move and handle captures."""
         if not self.is_valid_move(x, y):
             return False
-            
-        # Store previous board state for ko rule
-        self.move_history.append(self.board.copy())
-        if len(self.move_history) > 2:
-            self.move_history.pop(0)
-            
+
         # Place stone
-        self.board[x][y] = self.current_player
-        
-        # Handle captures
-        opponent = 3 - self.current_player
-        for nx, ny in self._get_neighbors(x, y):
-            if self.board[nx][ny] == opponent:
-                group = self._get_group(nx, ny)
-                if self._count_liberties(group) == 0:
-                    self._remove_group(group)
-                    
+        point = x * self.size + y
+        captured = self._place_stone(point, self.current_player)
+        self._undo_stack.append((point, self.current_player, captured))
+
         # Switch players
-        self.current_player = opponent
+        self.current_player = 3 - self.current_player
+        self._record_position()
         return True
-        
+
+    def pass_move(self) -> None:
+        """Pass the turn to the other player."""
+        self._undo_stack.append((PASS, self.current_player, []))
+        self.current_player = 3 - self.current_player
+        self._record_position()
+
+    @property
+    def consecutive_passes(self) -> int:
+        """Number of passes at the end of the move history."""
+        count = 0
+        for point, _, _ in reversed(self._undo_stack):
+            if point != PASS:
+                break
+            count += 1
+        return count
+
+    def undo(self) -> Optional[Tuple[int, int]]:
+        """Take back the last move or pass, returning its (x, y), or None for a pass."""
+        point, color, captured = self._undo_stack.pop()
+        key = self._situation_key(self.key_history.pop(), self.current_player)
+        count = self._position_counts[key] - 1
+        if count:
+            self._position_counts[key] = count
+        else:
+            del self._position_counts[key]
+        self.current_player = color
+
+        if point == PASS:
+            return None
+        self._lift_stone(point, color)
+        for stones in captured:
+            self._restore_chain(stones, 3 - color)
+        return divmod(point, self.size)
+
+    def _record_position(self) -> None:
+        """Remember the position reached by the last move for the ko rule."""
+        self.key_history.append(self.zobrist_key)
+        key = self._situation_key(self.zobrist_key, self.current_player)
+        self._position_counts[key] = self._position_counts.get(key, 0) + 1
+
+    def _place_stone(self, point: int, color: int) -> List[List[int]]:
+        """Place a stone, merge it with friendly chains and remove captured chains.
+
+        Returns the stone lists of the captured chains.
+        """
+        size = self.size
+        opponent = 3 - color
+        bit = 1 << point
+        self.board[point // size][point % size] = color
+        self.zobrist_key ^= self._zobrist[color][point]
+
+        # The new stone starts as its own chain
+        chain = point
+        self._chain_id[point] = point
+        self._chain_stones[point] = [point]
+        self._chain_liberties[point] = 0
+        liberties = 0
+
+        for neighbor in self._neighbors[point]:
+            neighbor_chain = self._chain_id[neighbor]
+            if neighbor_chain < 0:
+                liberties |= 1 << neighbor
+                continue
+            # The point is no longer a liberty of any adjacent chain
+            self._chain_liberties[neighbor_chain] &= ~bit
+            if self.board.flat[neighbor] == color and neighbor_chain != chain:
+                chain = self._merge_chains(chain, neighbor_chain)
+        self._chain_liberties[chain] |= liberties & ~bit
+
+        # Remove opponent chains left without liberties
+        captured = []
+        for neighbor in self._neighbors[point]:
+            neighbor_chain = self._chain_id[neighbor]
+            if neighbor_chain >= 0 and self.board.flat[neighbor] == opponent \
+                    and not self._chain_liberties[neighbor_chain]:
+                captured.append(self._remove_chain(neighbor_chain))
+        return captured
+
+    def _merge_chains(self, first: int, second: int) -> int:
+        """Merge two chains, relabelling the smaller one, and return the surviving id."""
+        if len(self._chain_stones[first]) < len(self._chain_stones[second]):
+            first, second = second, first
+        stones = self._chain_stones[second]
+        for stone in stones:
+            self._chain_id[stone] = first
+        self._chain_stones[first].extend(stones)
+        self._chain_stones[second] = []
+        self._chain_liberties[first] |= self._chain_liberties[second]
+        self._chain_liberties[second] = 0
+        return first
+
+    def _remove_chain(self, chain: int) -> List[int]:
+        """Remove a captured chain, giving its points back as liberties to the chains around it.
+
+        Returns the removed stones.
+        """
+        size = self.size
+        stones = self._chain_stones[chain]
+        captured_color = self.board.flat[stones[0]]
+        keys = self._zobrist[captured_color]
+
+        for stone in stones:
+            self.board[stone // size][stone % size] = 0
+            self._chain_id[stone] = -1
+            self.zobrist_key ^= keys[stone]
+        for stone in stones:
+            for neighbor in self._neighbors[stone]:
+                neighbor_chain = self._chain_id[neighbor]
+                if neighbor_chain >= 0:
+                    self._chain_liberties[neighbor_chain] |= 1 << stone
+        self._chain_stones[chain] = []
+        self._chain_liberties[chain] = 0
+
+        if captured_color == 1:  # Black
+            self.captured_black += len(stones)
+        else:  # White
+            self.captured_white += len(stones)
+        return stones
+
+    def _lift_stone(self, point: int, color: int) -> None:
+        """Take a stone off the board, splitting its chain back into the chains it joined."""
+        size = self.size
+        chain = self._chain_id[point]
+        for stone in self._chain_stones[chain]:
+            self._chain_id[stone] = -1
+        self._chain_stones[chain] = []
+        self._chain_liberties[chain] = 0
+        self.board[point // size][point % size] = 0
+        self.zobrist_key ^= self._zobrist[color][point]
+
+        for neighbor in self._neighbors[point]:
+            neighbor_chain = self._chain_id[neighbor]
+            if neighbor_chain >= 0:
+                self._chain_liberties[neighbor_chain] |= 1 << point
+            elif self.board.flat[neighbor] == color:
+                self._rebuild_chain(neighbor, color)
+
+    def _rebuild_chain(self, start: int, color: int) -> None:
+        """Flood-fill the unassigned stones of `color` connected to `start` into one chain."""
+        self._chain_id[start] = start
+        stones = [start]
+        liberties = 0
+        index = 0
+        while index < len(stones):
+            for neighbor in self._neighbors[stones[index]]:
+                value = self.board.flat[neighbor]
+                if value == 0:
+                    liberties |= 1 << neighbor
+                elif value == color and self._chain_id[neighbor] < 0:
+                    self._chain_id[neighbor] = start
+                    stones.append(neighbor)
+            index += 1
+        self._chain_stones[start] = stones
+        self._chain_liberties[start] = liberties
+
+    def _restore_chain(self, stones: List[int], color: int) -> None:
+        """Put a captured chain back, taking its points away from the liberties of the chains around it."""
+        size = self.size
+        chain = stones[0]
+        keys = self._zobrist[color]
+        for stone in stones:
+            self.board[stone // size][stone % size] = color
+            self._chain_id[stone] = chain
+            self.zobrist_key ^= keys[stone]
+
+        liberties = 0
+        for stone in stones:
+            for neighbor in self._neighbors[stone]:
+                neighbor_chain = self._chain_id[neighbor]
+                if neighbor_chain < 0:
+                    liberties |= 1 << neighbor
+                elif neighbor_chain != chain:
+                    self._chain_liberties[neighbor_chain] &= ~(1 << stone)
+        self._chain_stones[chain] = list(stones)
+        self._chain_liberties[chain] = liberties
+
+        if color == 1:  # Black
+            self.captured_black -= len(stones)
+        else:  # White
+            self.captured_white -= len(stones)
+
     def _get_neighbors(self, x: int, y: int) -> List[Tuple[int, int]]:
         """Get valid neighboring positions."""
         neighbors = []
@@ -95,114 +465,27 @@ class GoBoard:
             if 0 <= nx < self.size and 0 <= ny < self.size:
                 neighbors.append((nx, ny))
         return neighbors
-        
-    def _get_group(self, x: int, y: int) -> Set[Position]:
-        """Find all connected stones of the same color."""
-        color = self.board[x][y]
-        if color == 0:
-            return set()
-            
-        group = set()
-        to_check = {Position(x, y)}
-        
-        while to_check:
-            pos = to_check.pop()
-            if pos in group:
-                continue
-            group.add(pos)
-            
-            for nx, ny in self._get_neighbors(pos.x, pos.y):
-                if self.board[nx][ny] == color:
-                    new_pos = Position(nx, ny)
-                    if new_pos not in group:
-                        to_check.add(new_pos)
-        
-        return group
-        
-    def _count_liberties(self, group: Set[Position]) -> int:
-        """Count the number of liberties for a group of stones."""
-        liberties = set()
-        for pos in group:
-            for nx, ny in self._get_neighbors(pos.x, pos.y):
-                if self.board[nx][ny] == 0:
-                    liberties.add(Position(nx, ny))
-        return len(liberties)
-        
-    def _remove_group(self, group: Set[Position]) -> None:
-        """Remove a captured group and update capture counts."""
-        first_stone = next(iter(group))
-        captured_color = self.board[first_stone.x][first_stone.y]
-        
-        for pos in group:
-            self.board[pos.x][pos.y] = 0
-            
-        if captured_color == 1:  # Black
-            self.captured_black += len(group)
-        else:  # White
-            self.captured_white += len(group)
-            
+
     def calculate_territory(self) -> Tuple[int, int]:
         """Calculate territory control at the end of the game."""
-        territory = np.zeros((self.size, self.size), dtype=int)
-        visited = set()
-        
-        for x in range(self.size):
-            for y in range(self.size):
-                if Position(x, y) in visited or self.board[x][y] != 0:
-                    continue
-                    
-                # Find empty region
-                region = self._get_empty_region(x, y)
-                visited.update(region)
-                
-                # Determine territory owner
-                owner = self._get_territory_owner(region)
-                if owner:
-                    for pos in region:
-                        territory[pos.x][pos.y] = owner
-                        
-        self.territory_black = np.sum(territory == 1)
-        self.territory_white = np.sum(territory == 2)
+        territory = territory_map(self.board)
+        self.territory_black = int(np.count_nonzero(territory == 1))
+        self.territory_white = int(np.count_nonzero(territory == 2))
         return self.territory_black, self.territory_white
-        
-    def _get_empty_region(self, x: int, y: int) -> Set[Position]:
-        """Find connected empty positions."""
-        region = set()
-        to_check = {Position(x, y)}
-        
-        while to_check:
-            pos = to_check.pop()
-            if pos in region:
-                continue
-            region.add(pos)
-            
-            for nx, ny in self._get_neighbors(pos.x, pos.y):
-                if self.board[nx][ny] == 0:
-                    new_pos = Position(nx, ny)
-                    if new_pos not in region:
-                        to_check.add(new_pos)
-        
-        return region
-        
-    def _get_territory_owner(self, region: Set[Position]) -> Optional[int]:
-        """Determine if a region is territory of either player."""
-        borders = set()
-        for pos in region:
-            for nx, ny in self._get_neighbors(pos.x, pos.y):
-                if self.board[nx][ny] != 0:
-                    borders.add(self.board[nx][ny])
-                    
-        if len(borders) == 1:  # Region is surrounded by one color
-            return borders.pop()
-        return None
-        
-    def get_score(self) -> Tuple[float, float]:
-        """Get final score (territory + captures)."""
+
+    def get_score(self, scoring: str = 'territory', komi: float = 6.5) -> Tuple[float, float]:
+        """Get final score: territory plus captures, or territory plus stones for area scoring."""
+        if scoring not in SCORING_RULES:
+            raise ValueError(f"Unknown scoring rule '{scoring}', expected one of {SCORING_RULES}")
         territory_black, territory_white = self.calculate_territory()
-        black_score = territory_black + self.captured_white
-        white_score = territory_white + self.captured_black + 6.5  # Komi
+        if scoring == 'area':
+            black_score = territory_black + int(np.count_nonzero(self.board == 1))
+            white_score = territory_white + int(np.count_nonzero(self.board == 2)) + komi
+        else:
+            black_score = territory_black + self.captured_white
+            white_score = territory_white + self.captured_black + komi
         return black_score, white_score
-        
+
     def __str__(self) -> str:
         """Return string representation of the board."""
         symbols = {0: '.', 1: '●', 2: '○'}
@@ -0,0 +1,223 @@
+"""Monte Carlo tree search Go player built on go_engine and go_batch.
+
+Each iteration selects a batch of leaves with UCT or PUCT (virtual loss
+keeps the selections apart), expands them, and scores them all with one
+GoBatch random playout per side to move. The tree is kept between moves
+and reused when the game reaches one of its nodes. The process pool is
+opt-in: with `workers` > 1, extra root searches run in a pool, whose root
+statistics are merged into the main tree before the move is chosen, and
+close() shuts the pool down. The default of 0 searches in-process only.
+"""
+import math
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from go_batch import GoBatch
+from go_engine import PASS, GoBoard, adjacent_points
+
+SELECTION_RULES = ('uct', 'puct')
+
+@dataclass
+class Node:
+    move: int  # Point played to reach this node, or PASS
+    player: int  # Color that played `move`
+    key: Tuple[int, int]  # (Zobrist key, side to move) of the position
+    passes: int  # Consecutive passes leading here
+    prior: float = 1.0
+    parent: Optional['Node'] = None
+    children: Dict[int, 'Node'] = field(default_factory=dict)
+    untried: Optional[List[int]] = None  # Moves not expanded yet; None until first visit
+    visits: int = 0
+    wins: float = 0.0  # Playout wins for `player`
+
+    def value(self) -> float:
+        return self.wins / self.visits if self.visits else 0.5
+
+class MCTSPlayer:
+    def __init__(self, time_limit: float = 1.0, selection: str = 'uct', exploration: Optional[float] = None,
+                 leaf_batch: int = 16, playouts_per_leaf: int = 4, workers: int = 0,
+                 komi: float = 6.5, seed: Optional[int] = None):
+        if selection not in SELECTION_RULES:
+            raise ValueError(f"Unknown selection rule '{selection}', expected one of {SELECTION_RULES}")
+        self.time_limit = time_limit
+        self.selection = selection
+        if exploration is None:
+            exploration = 1.4 if selection == 'uct' else 2.0
+        self.exploration = exploration
+        self.leaf_batch = leaf_batch
+        self.playouts_per_leaf = playouts_per_leaf
+        self.workers = workers
+        self.komi = komi
+        self.rng = random.Random(seed)
+        self._root: Optional[Node] = None
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def choose_move(self, board: GoBoard, time_limit: Optional[float] = None) -> Optional[Tuple[int, int]]:
+        """Search the position and return the best (x, y) move, or None to pass."""
+        move = self.search(board, time_limit)
+        return None if move == PASS else divmod(move, board.size)
+
+    def search(self, board: GoBoard, time_limit: Optional[float] = None) -> int:
+        """Run MCTS for the time budget and return the most visited move (a point or PASS)."""
+        if time_limit is None:
+            time_limit = self.time_limit
+        deadline = time.perf_counter() + time_limit
+        root = self._find_root(board)
+
+        jobs = []
+        if self.workers > 1:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(self.workers - 1)
+            jobs = [self._pool.submit(_root_statistics, board, time_limit * 0.9, self._settings(), self.rng.random())
+                    for _ in range(self.workers - 1)]
+
+        # At least one iteration, so a tiny budget still yields a move rather than a pass
+        work = board.clone()
+        self._iterate(root, work)
+        while time.perf_counter() < deadline:
+            self._iterate(root, work)
+
+        for job in jobs:
+            for move, (visits, wins) in job.result().items():
+                child = root.children.get(move)
+                if child is not None:
+                    child.visits += visits
+                    child.wins += wins
+        self._root = root
+        if not root.children:
+            return PASS
+        return max(root.children.values(), key=lambda child: child.visits).move
+
+    def root_statistics(self) -> Dict[int, Tuple[int, float]]:
+        """Visits and wins of each root move from the last search."""
+        if self._root is None:
+            return {}
+        return {move: (child.visits, child.wins) for move, child in self._root.children.items()}
+
+    def close(self) -> None:
+        """Shut down the worker pool, if one was started."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def _settings(self) -> dict:
+        return {'selection': self.selection, 'exploration': self.exploration, 'leaf_batch': self.leaf_batch,
+                'playouts_per_leaf': self.playouts_per_leaf, 'komi': self.komi}
+
+    def _find_root(self, board: GoBoard) -> Node:
+        """Reuse the subtree for this position from the last search, or start a new tree."""
+        key = (board.zobrist_key, board.current_player)
+        if self._root is not None:
+            # The position is usually our last move followed by the opponent's reply
+            candidates = [self._root] + list(self._root.children.values())
+            for node in candidates:
+                for child in [node] + list(node.children.values()):
+                    if child.key == key:
+                        child.parent = None
+                        return child
+        return Node(PASS, 3 - board.current_player, key, board.consecutive_passes)
+
+    def _iterate(self, root: Node, work: GoBoard) -> None:
+        """Select and expand a batch of leaves, score them with playouts and back the results up."""
+        leaves: List[Tuple[Node, GoBoard]] = []
+        for _ in range(self.leaf_batch):
+            node = root
+            depth = 0
+            while True:
+                # Virtual loss: count the visit now, add the win once the playout is in
+                node.visits += 1
+                if node.passes >= 2:
+                    break
+                if node.untried is None:
+                    node.untried = self._candidate_moves(work)
+                if node.untried:
+                    node = self._expand(node, work)
+                    depth += 1
+                    node.visits += 1
+                    break
+                if not node.children:
+                    break
+                node = self._select(node)
+                self._play(work, node.move)
+                depth += 1
+            if node.passes >= 2:
+                # Both sides passed: the game is over and the score is exact
+                self._backup(node, self._final_score(work))
+            else:
+                leaves.append((node, work.clone()))
+            for _ in range(depth):
+                work.undo()
+
+        # One batched playout per side to move
+        for player in (1, 2):
+            group = [(node, board) for node, board in leaves if board.current_player == player]
+            if not group:
+                continue
+            boards = [board for _, board in group for _ in range(self.playouts_per_leaf)]
+            batch = GoBatch.from_boards(boards, self.komi, self.rng.randrange(2 ** 32))
+            black_wins = (batch.playout() > 0).reshape(len(group), self.playouts_per_leaf).mean(axis=1)
+            for (node, _), result in zip(group, black_wins):
+                self._backup(node, float(result))
+
+    def _candidate_moves(self, board: GoBoard) -> List[int]:
+        """Legal moves that do not fill the mover's own eyes, shuffled, with a pass tried last."""
+        mask = board.legal_moves_mask() & adjacent_points(board.board != board.current_player)
+        moves = np.flatnonzero(mask).tolist()
+        self.rng.shuffle(moves)
+        return [PASS] + moves
+
+    def _expand(self, node: Node, work: GoBoard) -> Node:
+        move = node.untried.pop()
+        player = work.current_player
+        self._play(work, move)
+        child = Node(move, player, (work.zobrist_key, work.current_player),
+                     node.passes + 1 if move == PASS else 0, self._prior(move, work.size), node)
+        node.children[move] = child
+        return child
+
+    def _prior(self, move: int, size: int) -> float:
+        """Heuristic prior for PUCT: passes and first-line moves are rarely best."""
+        if move == PASS:
+            return 0.1
+        x, y = divmod(move, size)
+        return 0.5 if min(x, y, size - 1 - x, size - 1 - y) == 0 else 1.0
+
+    def _select(self, node: Node) -> Node:
+        children = list(node.children.values())
+        if self.selection == 'uct':
+            log_visits = math.log(node.visits)
+            return max(children, key=lambda child: child.value()
+                       + self.exploration * math.sqrt(log_visits / (child.visits + 1)))
+        total_prior = sum(child.prior for child in children)
+        sqrt_visits = math.sqrt(node.visits)
+        return max(children, key=lambda child: child.value()
+                   + self.exploration * child.prior / total_prior * sqrt_visits / (1 + child.visits))
+
+    def _play(self, board: GoBoard, move: int) -> None:
+        """Play a tree move; an illegal one means the tree no longer matches the board."""
+        if move == PASS:
+            board.pass_move()
+        elif not board.make_move(*divmod(move, board.size)):
+            raise ValueError(f"Tree move {divmod(move, board.size)} is illegal on the searched board")
+
+    def _final_score(self, board: GoBoard) -> float:
+        """1.0 if black wins the finished game on area score, else 0.0."""
+        black, white = board.get_score('area', self.komi)
+        return 1.0 if black > white else 0.0
+
+    def _backup(self, node: Optional[Node], black_wins: float) -> None:
+        """Add a playout result to the node and its ancestors; visits were counted on the way down."""
+        while node is not None:
+            node.wins += black_wins if node.player == 1 else 1.0 - black_wins
+            node = node.parent
+
+def _root_statistics(board: GoBoard, time_limit: float, settings: dict, seed: float) -> Dict[int, Tuple[int, float]]:
+    """Run an independent search in a worker process and return its root statistics."""
+    player = MCTSPlayer(time_limit, seed=seed, **settings)
+    player.search(board)
+    return player.root_statistics()
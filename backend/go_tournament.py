@@ -2,28 +2,48 @@ from dotenv import load_dotenv
 import os
 import random
 import asyncio
-import openai
-import anthropic
+import time
 import google.generativeai as generativeai
 import subprocess
 from datetime import datetime
 from go_board import GoBoard
-from leaderboard import leaderboard
+from go_mcts import MCTSPlayer
+from leaderboard import Leaderboard
+from llm_clients import close_clients, player_api, scheduled_call
+from move_cache import cache_key, default_cache
+from rate_limit import BATCH
+from hedging import LatencyTracker, move_budget
+from prompts import GO_TEMPLATE, go_move_prompt, gtp_coordinate, parse_gtp_move, request_params, token_meter
 from typing import Optional, List, Dict, Tuple
 
 # Load environment variables from .env file
 load_dotenv()
 
+# Provider model and sampling parameters of each player
+PLAYER_MODELS = {
+    "OpenAI": ("gpt-3.5-turbo", request_params('openai', max_tokens=4, temperature=0.1)),
+    "Anthropic": ("claude-3-opus-20240229", request_params('anthropic', max_tokens=4, temperature=0.1)),
+    "Gemini": ("gemini-pro", request_params('google', max_tokens=4, temperature=0.1))
+}
+
 class GoTournament:
-    def __init__(self):
+    def __init__(self, game_time: float = 900.0):
         self.players = ["OpenAI", "Anthropic", "Gemini"]
         self.matches = []
         self.rankings = {}
+        self.leaderboard = Leaderboard('go')
         self.board_size = 9
+        # Local fallback when an LLM move is illegal or the call fails
+        self.mcts = MCTSPlayer(time_limit=0.5)
+        self.move_cache = default_cache()
+        # Seconds of LLM time each player gets per game. A move may take its
+        # share, move_budget(), before the local engine answers instead;
+        # requests slower than the player's recent p95 are hedged with a duplicate
+        self.game_time = game_time
+        self.latency = {player: LatencyTracker() for player in self.players}
         
-        # Initialize AI clients
-        self.openai_client = openai.OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
-        self.claude = anthropic.Anthropic(api_key=os.getenv('ANTHROPIC_API_KEY'))
+        # Providers are called through llm_clients; its shared async clients let a
+        # hedged or timed-out request be cancelled rather than left running
         generativeai.configure(api_key=os.getenv('GOOGLE_API_KEY'))
         
         # Initialize KataGo
@@ -40,104 +60,54 @@ class GoTournament:
             print(f"Could not initialize KataGo: {e}")
             self.katago = None
     
-    async def get_move(self, player, board_state):
+    async def get_move(self, player, board_state, legal_moves, color='black', time_left=None) -> Optional[str]:
+        """Ask the player's LLM for one of the legal (x, y) moves as `color`; None when it gives no usable move.
+
+        The LLM gets move_budget(time_left) seconds, or the whole game time without a clock.
+        """
         try:
-            # Create list of valid moves
-            valid_moves = []
-            occupied_moves = []
-            for i in range(self.board_size):
-                for j in range(self.board_size):
-                    col = chr(ord('A') + j)
-                    if col >= 'I':
-                        continue
-                    row = str(i + 1)
-                    move = f"{col}{row}"
-                    if board_state[i][j] == 0:
-                        valid_moves.append(move)
-                    else:
-                        occupied_moves.append(move)
+            # Legal moves from the engine (no suicide or ko retakes), in GTP coordinates
+            valid_moves = [gtp_coordinate(y, x) for x, y in legal_moves]
             
             if not valid_moves:
                 return "PASS"
+
+            # Answers already given for this position by the same model and prompt; the
+            # legal moves are part of the key since the board alone does not show a ko
+            model, sampling = PLAYER_MODELS.get(player, PLAYER_MODELS["Gemini"])
+            key = cache_key(player, model, GO_TEMPLATE.version, (color, board_state, valid_moves), **sampling)
+            cached = await self.move_cache.get(key, valid_moves)
+            if cached:
+                print(f"{player} plays: {cached} (cached)")
+                return cached
                 
-            # Create board visualization
-            header = '   A B C D E F G H'
-            rows = []
-            for i in range(self.board_size):
-                row = f"{i+1:2d} " + ' '.join(['.' if cell == 0 else '●' if cell == 1 else '○' for cell in board_state[i]])
-                rows.append(row)
-            board_str = header + '\n' + '\n'.join(rows)
-            
-            prompt = f"""You are playing Go. Current board:
-            {board_str}
-            
-            IMPORTANT: Your last move was invalid. Choose a different move.
-            
-            OCCUPIED POSITIONS (DO NOT PLAY HERE): {', '.join(occupied_moves)}
-            VALID MOVES (CHOOSE ONE OF THESE): {', '.join(valid_moves)}
-            
-            Rules:
-            1. You MUST choose exactly ONE move from the VALID MOVES list
-            2. DO NOT choose from the OCCUPIED POSITIONS list
-            3. DO NOT repeat invalid moves
-            4. Respond with ONLY the move (e.g., 'D4')
-            
-            Your move:"""
-                
-            if player == "OpenAI":
-                completion = self.openai_client.chat.completions.create(
-                    model="gpt-3.5-turbo",
-                    temperature=0.1,  # Low temperature for consistent, focused moves
-                    max_tokens=2,
-                    messages=[
-                        {"role": "system", "content": "You are playing Go. Be strategic and avoid invalid moves."},
-                        {"role": "user", "content": prompt}
-                    ]
-                )
-                move = completion.choices[0].message.content.strip().upper()
-                
-            elif player == "Anthropic":
-                response = self.claude.messages.create(
-                    model="claude-3-opus-20240229",
-                    temperature=0.1,  # Low temperature for consistent, focused moves
-                    max_tokens=2,
-                    messages=[{
-                        "role": "user",
-                        "content": prompt
-                    }]
-                )
-                move = response.content[0].text.strip().upper()
+            prompt = go_move_prompt(board_state, valid_moves, color)
                 
-            else:  # Gemini
-                model = generativeai.GenerativeModel('gemini-pro')
-                chat = model.start_chat(temperature=0.1)  # Low temperature for consistent, focused moves
-                response = await chat.send_message_async(prompt)
-                move = response.text.strip().upper()
+            # Queued behind the provider's rate limits, after live games
+            api_type, api_key = player_api(player)
+            budget = move_budget(self.game_time if time_left is None else time_left)
+            reply, tokens_in, tokens_out = await asyncio.wait_for(scheduled_call(
+                api_type, api_key, model, sampling, prompt, BATCH, self.latency.setdefault(player, LatencyTracker())),
+                budget)
                 
-            # Clean and validate move
-            move = ''.join(c for c in move if c.isalnum()).upper()
-            if move in valid_moves:
+            # Validate move
+            move = parse_gtp_move(reply, valid_moves)
+            token_meter.record(player, tokens_in, tokens_out, legal=move is not None)
+            if move is not None:
                 print(f"{player} plays: {move}")
+                if move != "PASS":
+                    await self.move_cache.put(key, move)
                 return move
                 
-            print(f"{player} suggested invalid move: {move}")
-            print(f"Occupied positions: {', '.join(occupied_moves)}")
-            print(f"Valid moves: {', '.join(valid_moves)}")
-            
-            # Choose a strategic move when LLM fails
-            center = ['D4', 'D5', 'E4', 'E5']
-            corners = ['A1', 'A9', 'H1', 'H9']
-            strategic_moves = [m for m in (center + corners) if m in valid_moves]
-            if strategic_moves:
-                move = random.choice(strategic_moves)
-                print(f"Choosing strategic move: {move}")
-                return move
-            
-            return random.choice(valid_moves)
+            print(f"{player} suggested invalid move: {reply}")
+            return None
                 
+        except asyncio.TimeoutError:
+            print(f"{player} did not answer within its {budget:.1f}s budget")
+            return None
         except Exception as e:
             print(f"Error in get_move for {player}: {e}")
-            return random.choice(valid_moves)
+            return None
             
     def clean_move_response(self, move: str) -> str:
         """Clean and validate the move response from LLMs"""
@@ -168,55 +138,68 @@ class GoTournament:
         print(f"\nGame {game_number}: {black} (Black) vs {white} (White)\n")
         board = GoBoard(self.board_size)
         move_count = 1
+        # Seconds each player's LLM has left for the game; the engine moves for it once out
+        clock = {player: self.game_time for player in (black, white)}
         
         while move_count <= 81:  # Maximum moves for 9x9 board
             print(f"\nMove {move_count}")
             print(board)  # This will now use the __str__ method
             
             current_player = black if board.current_player == 1 else white
+            legal_moves = board.legal_moves()
+            if not legal_moves:
+                print(f"{current_player} has no legal move and passes")
+                board.pass_move()
+                if board.is_over:
+                    break
+                continue
             try:
-                move = await self.get_move(current_player, board.get_state())
+                color = 'black' if board.current_player == 1 else 'white'
+                start = time.monotonic()
+                move = await self.get_move(current_player, board.get_state(), legal_moves, color,
+                                           clock[current_player])
+                clock[current_player] -= time.monotonic() - start
                 if move == "PASS":
-                    break
+                    board.pass_move()
+                    if board.is_over:
+                        break
+                    continue
                     
-                # Convert GTP format (e.g., "D4") to board coordinates
-                col = ord(move[0]) - ord('A')
-                if col >= 8:  # Adjust for skipped 'I'
-                    col -= 1
-                row = int(move[1:]) - 1
-                
-                if board.make_move(row, col, board.current_player):
-                    print(f"{current_player} plays: {move}")
-                    move_count += 1
-                else:
+                if move is not None:
+                    # Convert GTP format (e.g., "D4") to board coordinates
+                    row, col = self.parse_move(move)
+                    if board.make_move(col, row):
+                        print(f"{current_player} plays: {move}")
+                        move_count += 1
+                        continue
                     print(f"Invalid move {move}")
                     
             except Exception as e:
                 print(f"Error during move: {e}")
-                # Make a random valid move
-                valid_moves = []
-                for i in range(self.board_size):
-                    for j in range(self.board_size):
-                        if board.board[i][j] == 0:
-                            valid_moves.append((i, j))
-                if valid_moves:
-                    row, col = random.choice(valid_moves)
-                    board.make_move(row, col, board.current_player)
-                    col_letter = chr(ord('A') + (col + 1 if col >= 8 else col))
-                    print(f"Random move: {col_letter}{row + 1}")
-                    move_count += 1
-                else:
+
+            # Search a move locally instead (no answer, occupied, suicide or ko),
+            # in a worker thread so the event loop keeps serving other requests
+            search_move = await asyncio.to_thread(self.mcts.choose_move, board.engine)
+            if search_move is None:
+                print(f"{current_player} passes (MCTS)")
+                board.pass_move()
+                if board.is_over:
                     break
+                continue
+            row, col = search_move
+            board.make_move(col, row)
+            col_letter = chr(ord('A') + (col + 1 if col >= 8 else col))
+            print(f"MCTS move: {col_letter}{row + 1}")
+            move_count += 1
         
-        # Determine winner (in a real game, we'd count territory)
-        black_stones = sum(row.count(1) for row in board.board)
-        white_stones = sum(row.count(2) for row in board.board)
+        # Area scoring with komi decides the winner
+        black_score, white_score = board.get_score()
         
-        if black_stones > white_stones:
-            print(f"\n{black} (Black) wins with {black_stones} stones vs {white_stones}!")
+        if black_score > white_score:
+            print(f"\n{black} (Black) wins {black_score} to {white_score}!")
             return black
-        elif white_stones > black_stones:
-            print(f"\n{white} (White) wins with {white_stones} stones vs {black_stones}!")
+        elif white_score > black_score:
+            print(f"\n{white} (White) wins {white_score} to {black_score}!")
             return white
         else:
             print("\nGame drawn!")
@@ -236,12 +219,14 @@ class GoTournament:
                 
                 # Play 4 games
                 for game in range(4):
-                    if game % 2 == 0:
-                        await self.play_game(player1, player2, game + 1)
-                    else:
-                        await self.play_game(player2, player1, game + 1)
+                    black, white = (player1, player2) if game % 2 == 0 else (player2, player1)
+                    winner = await self.play_game(black, white, game + 1)
+                    if winner:
+                        self.update_rankings(winner)
+                    self.leaderboard.add_game(white, black, winner or 'draw')
         
         self.show_rankings()
+        await close_clients()
         self.katago.terminate()
     
     def update_rankings(self, winner):
@@ -260,9 +245,14 @@ class GoTournament:
             print(f"{player}: {wins} wins")
         print("====================\n")
         
+        # Tokens each player spent per move
+        for player, stats in token_meter.stats().items():
+            print(f"{player}: {stats['tokens_per_move']:.0f} tokens/move over {stats['moves']} moves, "
+                  f"{stats['illegal']} illegal replies")
+
         # Show overall leaderboard
-        leaderboard.show_rankings('go')
-        leaderboard.show_rankings()
+        for entry in self.leaderboard.get_rankings():
+            print(f"{entry['name']}: {entry['wins']}-{entry['draws']}-{entry['losses']} ({entry['winRate']}%)")
     
     def board_to_string(self, board_state):
         """Convert board state to ASCII representation"""
@@ -0,0 +1,84 @@
+"""Deadlines and hedged requests for LLM moves.
+
+move_budget() turns a player's remaining clock into the time one move may
+take. hedged() runs a request and, if it has not answered after the
+hedge delay (the provider's recent p95 latency from a LatencyTracker),
+starts a duplicate and takes whichever answers first. Callers bound the
+whole thing with asyncio.wait_for(..., budget) and play a local engine
+move on timeout, so a slow or hung provider costs one weaker move
+instead of the game.
+"""
+import asyncio
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Optional
+
+MOVES_TO_GO = 30  # Moves the remaining clock is assumed to cover
+SAFETY_MARGIN = 1.0  # Seconds kept back for the fallback move and bookkeeping
+
+def move_budget(time_left: float, moves_to_go: int = MOVES_TO_GO, margin: float = SAFETY_MARGIN) -> float:
+    """Seconds the next move may take with `time_left` on the clock; 0 when there is no time to spare."""
+    if moves_to_go <= 0:
+        raise ValueError("moves_to_go must be positive")
+    return max(0.0, min(time_left / moves_to_go, time_left - margin))
+
+class LatencyTracker:
+    """Recent response times of one provider and model."""
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        self.samples: 'deque[float]' = deque(maxlen=window)
+        self.min_samples = min_samples
+
+    def observe(self, seconds: float) -> None:
+        self.samples.append(seconds)
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        """Latency below which `fraction` of recent responses fell, None until there are enough samples."""
+        if len(self.samples) < self.min_samples:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    def hedge_delay(self) -> Optional[float]:
+        return self.percentile(0.95)
+
+async def hedged(request: Callable[[], Awaitable[Any]], hedge_after: Optional[float] = None,
+                 latency: Optional[LatencyTracker] = None) -> Any:
+    """Result of `request()`, started a second time if the first has not answered after `hedge_after` seconds.
+
+    The first successful answer wins and the other attempt is cancelled,
+    and waited for, before returning. If both fail, the last error is
+    raised. `latency` gets the time of every attempt that answered or was
+    cancelled, so slow requests cut short by a hedge or a deadline still
+    push the p95 up instead of only the fast winners being counted.
+    """
+    async def attempt() -> Any:
+        start = time.monotonic()
+        try:
+            result = await request()
+        except asyncio.CancelledError:
+            if latency is not None:
+                latency.observe(time.monotonic() - start)
+            raise
+        if latency is not None:
+            latency.observe(time.monotonic() - start)
+        return result
+
+    pending = {asyncio.ensure_future(attempt())}
+    try:
+        if hedge_after is not None:
+            done, _ = await asyncio.wait(pending, timeout=hedge_after)
+            if not done:
+                pending.add(asyncio.ensure_future(attempt()))
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                error = task.exception()
+        raise error
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
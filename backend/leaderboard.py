@@ -7,11 +7,12 @@ class Leaderboard:
         self.games = []
         self.rankings = {}
         
-    def add_game(self, white, black, winner):
+    def add_game(self, white, black, winner, opening=None):
         game_data = {
             'white': white,
             'black': black,
-            'winner': winner
+            'winner': winner,
+            'opening': opening
         }
         self.games.append(game_data)
         
@@ -47,6 +48,15 @@ class Leaderboard:
             })
         return sorted(rankings_list, key=lambda x: (x['wins'], -x['losses']), reverse=True)
     
+    def opening_stats(self):
+        """Results per recorded opening, looked up from the stored games without replaying them."""
+        # eco loads the chess engine, so only import it when the stats are asked for
+        from eco import opening_stats
+        return opening_stats(
+            (game.get('opening'), 'white' if game['winner'] == game['white'] else
+             'black' if game['winner'] == game['black'] else 'draw')
+            for game in self.games if game['winner'])
+
     def _calculate_win_rate(self, stats):
         total_games = stats['total_games']
         if total_games == 0:
@@ -0,0 +1,133 @@
+"""Shared async provider clients.
+
+One AsyncOpenAI, AsyncAnthropic or httpx client (for Perplexity) per
+(api_type, API key) and event loop, each with a pooled httpx transport
+that keeps connections alive between moves. Being async, a request can
+be cancelled: a hedged duplicate that loses or a call past its deadline
+stops instead of running on in a thread.
+
+call_provider() sends a move prompt to any provider and returns the
+answer with its token counts; scheduled_call() does the same behind the
+provider's rate limiter, hedged past its recent p95 latency. LLMInterface
+and both tournaments go through them.
+"""
+import asyncio
+import os
+import weakref
+from typing import Any, Dict, Optional, Tuple
+
+import anthropic
+import google.generativeai as generativeai
+import httpx
+import openai
+
+from hedging import LatencyTracker, hedged
+from prompts import Prompt, usage
+from rate_limit import BATCH, default_scheduler, estimate_tokens
+
+PERPLEXITY_URL = "https://api.perplexity.ai"
+# Connection pool shared by all requests to one provider, kept alive between moves
+POOL_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=60.0)
+REQUEST_TIMEOUT = httpx.Timeout(30.0, connect=5.0)
+# Provider API type and API key variable of each tournament player
+PLAYER_APIS = {
+    "OpenAI": ('openai', 'OPENAI_API_KEY'),
+    "Anthropic": ('anthropic', 'ANTHROPIC_API_KEY'),
+    "Gemini": ('google', 'GOOGLE_API_KEY')
+}
+
+# Async clients per event loop, keyed by (api_type, api_key). Connections
+# belong to the loop that opened them, so each loop gets its own pools.
+_clients: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Tuple[str, str], Any]]' = \
+    weakref.WeakKeyDictionary()
+
+def _sdk_http_client(sdk: Any) -> Any:
+    """Pooled transport for an SDK; newer SDKs require their own httpx client class."""
+    return getattr(sdk, 'DefaultAsyncHttpxClient', httpx.AsyncClient)(limits=POOL_LIMITS, timeout=REQUEST_TIMEOUT)
+
+def _create_client(api_type: str, api_key: str) -> Any:
+    if api_type == 'openai':
+        return openai.AsyncOpenAI(api_key=api_key, http_client=_sdk_http_client(openai))
+    if api_type == 'anthropic':
+        return anthropic.AsyncAnthropic(api_key=api_key, http_client=_sdk_http_client(anthropic))
+    return httpx.AsyncClient(
+        base_url=PERPLEXITY_URL,
+        headers={"Authorization": f"Bearer {api_key}"},
+        limits=POOL_LIMITS,
+        timeout=REQUEST_TIMEOUT
+    )
+
+def get_client(api_type: str, api_key: str) -> Any:
+    """Shared async client for a provider on the running event loop, created on first use."""
+    clients = _clients.setdefault(asyncio.get_running_loop(), {})
+    if (api_type, api_key) not in clients:
+        clients[(api_type, api_key)] = _create_client(api_type, api_key)
+    return clients[(api_type, api_key)]
+
+async def close_clients() -> None:
+    """Close the connection pools opened on the running event loop."""
+    clients = _clients.pop(asyncio.get_running_loop(), {})
+    for client in clients.values():
+        if isinstance(client, httpx.AsyncClient):
+            await client.aclose()
+        else:
+            await client.close()
+
+def player_api(player: str) -> Tuple[str, Optional[str]]:
+    """API type and key of a tournament player, Gemini for unknown players."""
+    api_type, key_variable = PLAYER_APIS.get(player, PLAYER_APIS["Gemini"])
+    return api_type, os.getenv(key_variable)
+
+async def call_provider(api_type: str, api_key: Optional[str], model: str, sampling: Dict[str, Any],
+                        prompt: Prompt) -> Tuple[str, int, int]:
+    """Send the prompt to the provider; return its answer and the tokens in and out.
+
+    Google's SDK is configured globally, so its callers run
+    generativeai.configure() with their key first.
+    """
+    messages = [{"role": "system", "content": prompt.system}, {"role": "user", "content": prompt.user}]
+    if api_type == 'openai':
+        response = await get_client(api_type, api_key).chat.completions.create(
+            model=model, **sampling, messages=messages)
+        return (response.choices[0].message.content.strip(), *usage('openai', response))
+
+    if api_type == 'anthropic':
+        response = await get_client(api_type, api_key).messages.create(
+            model=model,
+            **sampling,
+            system=prompt.system,
+            messages=[{"role": "user", "content": prompt.user}]
+        )
+        return (response.content[0].text.strip(), *usage('anthropic', response))
+
+    if api_type == 'google':
+        response = await generativeai.GenerativeModel(model).generate_content_async(
+            f"{prompt.system}\n\n{prompt.user}", **sampling)
+        return (response.text.strip(), *usage('google', response))
+
+    if api_type == 'perplexity':
+        response = await get_client(api_type, api_key).post(
+            "/chat/completions",
+            json={"model": model, "messages": messages, **sampling}
+        )
+        response.raise_for_status()
+        body = response.json()
+        return (body['choices'][0]['message']['content'].strip(), *usage('perplexity', body))
+
+    raise ValueError(f"Unsupported API type: {api_type}")
+
+async def scheduled_call(api_type: str, api_key: Optional[str], model: str, sampling: Dict[str, Any],
+                         prompt: Prompt, priority: int = BATCH, latency: Optional[LatencyTracker] = None,
+                         hedge: bool = True) -> Tuple[str, int, int]:
+    """call_provider() queued behind the provider's rate limiter.
+
+    `latency` records every attempt and, with `hedge`, its p95 is when a
+    duplicate request starts. Callers bound the call with
+    asyncio.wait_for() and their move deadline.
+    """
+    return await hedged(
+        lambda: default_scheduler().run(
+            api_type, api_key, lambda: call_provider(api_type, api_key, model, sampling, prompt),
+            tokens=estimate_tokens(prompt.system + prompt.user, sampling.get('max_tokens')),
+            priority=priority),
+        hedge_after=latency.hedge_delay() if hedge and latency is not None else None, latency=latency)
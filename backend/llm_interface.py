@@ -1,40 +1,74 @@
+import asyncio
 import chess
-import openai
-import anthropic
-import httpx
+import chess.polyglot
 import google.generativeai as generativeai
-from typing import Dict, Any
+from typing import Any, Dict, List, Optional, Tuple
 from .config import get_ai_config
+from llm_clients import scheduled_call
 from openings import get_opening_move, evaluate_position
+from chess_eval import evaluate_batch
+from move_cache import cache_key, default_cache
+from single_flight import SingleFlight
+from rate_limit import INTERACTIVE
+from hedging import LatencyTracker, move_budget
+from chess_search import best_move_uci
+from prompts import CHESS_TEMPLATE, chess_move_prompt, parse_move, request_params, token_meter
+
+# Sampling parameters sent to each provider, also part of the move cache key
+SAMPLING_PARAMS: Dict[str, Dict[str, Any]] = {
+    'openai': request_params('openai'),
+    'anthropic': request_params('anthropic'),
+    'google': request_params('google'),
+    'perplexity': request_params('perplexity', temperature=0.7)
+}
+FALLBACK_SEARCH_TIME = 0.2  # Seconds the local engine gets when the provider misses the deadline
+# Recent response times per (api_type, model), whose p95 is the hedge delay
+latencies: Dict[Tuple[str, str], LatencyTracker] = {}
+# Identical move queries in flight at once share one provider call, keyed like the move cache
+in_flight_moves = SingleFlight()
 
 class LLMInterface:
-    def __init__(self, player_id: str):
+    def __init__(self, player_id: str, hedge: bool = True):
         config = get_ai_config(player_id)
         self.api_type = config['api_type']
         self.model = config['model']
+        self.api_key = config['api_key']
+        # Send a duplicate request when the first is slower than the provider's p95
+        self.hedge = hedge
+        self.latency = latencies.setdefault((self.api_type, self.model), LatencyTracker())
         
-        # Initialize API clients
-        if self.api_type == 'openai':
-            self.client = openai.OpenAI(api_key=config['api_key'])
-        elif self.api_type == 'anthropic':
-            self.client = anthropic.Anthropic(api_key=config['api_key'])
-        elif self.api_type == 'google':
+        # Async clients are shared per provider and created on first use, see llm_clients
+        if self.api_type == 'google':
             generativeai.configure(api_key=config['api_key'])
-            self.client = generativeai.GenerativeModel(self.model)
-        elif self.api_type == 'perplexity':
-            self.client = httpx.Client(
-                base_url="https://api.perplexity.ai",
-                headers={"Authorization": f"Bearer {config['api_key']}"},
-                timeout=10.0
-            )
-        else:
+        elif self.api_type not in ('openai', 'anthropic', 'perplexity'):
             raise ValueError(f"Unsupported API type: {self.api_type}")
 
-    async def generate_move(self, game_state: Dict[str, Any]) -> str:
-        """Generate a move using the configured LLM."""
-        # Convert game state to string representation
+    def rank_candidate_moves(self, board: chess.Board, limit: int = 5) -> List[str]:
+        """Legal moves whose resulting positions score best for the side to move, in one batch evaluation."""
+        moves = list(board.legal_moves)
+        if not moves:
+            return []
+        fens = []
+        for move in moves:
+            board.push(move)
+            fens.append(board.fen())
+            board.pop()
+        scores = evaluate_batch(fens)
+        if board.turn == chess.BLACK:
+            scores = -scores
+        order = sorted(range(len(moves)), key=lambda index: scores[index], reverse=True)
+        return [moves[index].uci() for index in order[:limit]]
+
+    async def generate_move(self, game_state: Dict[str, Any], priority: int = INTERACTIVE,
+                            time_left: Optional[float] = None) -> str:
+        """Generate a move using the configured LLM; pass priority=BATCH for tournament games.
+
+        With `time_left`, the player's remaining clock in seconds, the
+        provider gets move_budget(time_left) to answer, after which the local
+        engine moves instead. A ChessGame of the position under 'game' is
+        evaluated incrementally rather than from the 'board' rows.
+        """
         board = chess.Board(game_state['fen']) if 'fen' in game_state else game_state['board']
-        board_str = str(board)
         
         # Check opening book
         if 'fen' in game_state:
@@ -43,93 +77,54 @@ class LLMInterface:
                 move, opening_name = opening_move
                 print(f"Using opening book: {opening_name}")
                 return move
-                
-        # Get position evaluation
-        position_score = evaluate_position(game_state['board'], game_state['currentPlayer'])
-        
-        # Get game context
-        current_player = game_state.get('currentPlayer', 'white')
-        last_move = game_state.get('lastMove', '')
-        is_check = game_state.get('isCheck', False)
-        
-        # Create detailed prompt
-        prompt = f"""You are playing a game of chess as {current_player}. Here is the current board state:
-{board_str}
 
-Game Context:
-- You are playing as: {current_player.upper()}
-- Last move by opponent: {last_move if last_move else 'Opening move'}
-- Your king is in check: {'Yes' if is_check else 'No'}
-
-Position Analysis:
-- Current evaluation: {position_score:.2f} (positive favors you)
-- Key considerations:
-  * Control of center squares
-  * Piece development and mobility
-  * King safety and pawn structure
-  * Material balance and tactical opportunities
+        # Answers already given for this position by the same model and prompt
+        key = None
+        if 'fen' in game_state:
+            legal_moves = [move.uci() for move in board.legal_moves]
+            key = cache_key(self.api_type, self.model, CHESS_TEMPLATE.version, chess.polyglot.zobrist_hash(board),
+                            **SAMPLING_PARAMS[self.api_type])
+            cached = await default_cache().get(key, legal_moves)
+            if cached:
+                return cached
+            # Games asking the same question right now wait on one request
+            request = in_flight_moves.do(
+                key, lambda: self._request_move(game_state, board, key, priority))
+        else:
+            request = self._request_move(game_state, board, key, priority)
+        if time_left is None:
+            return await request
 
-Chess Strategy Guidelines:
-1. Control the center (e4, d4, e5, d5)
-2. Develop pieces efficiently (knights before bishops)
-3. Protect your king (consider castling when safe)
-4. Create and defend pawn structures
-5. Look for tactical opportunities (pins, forks, discoveries)
-6. Maintain material balance (unless sacrificing for advantage)
+        budget = max(0.0, move_budget(time_left) - FALLBACK_SEARCH_TIME)
+        try:
+            return await asyncio.wait_for(request, budget)
+        except asyncio.TimeoutError:
+            print(f"{self.api_type} missed its {budget:.1f}s deadline, using the local engine")
+            return best_move_uci(board.fen(), time_limit=FALLBACK_SEARCH_TIME)
 
-Generate a valid move in algebraic notation (e.g., 'e2e4' or 'g1f3').
-Explain your strategic thinking, then provide ONLY the move notation on the last line."""
+    async def _request_move(self, game_state: Dict[str, Any], board: chess.Board,
+                            key: Optional[str], priority: int) -> str:
+        """Ask the provider for a move and cache it under `key` when it is legal."""
+        sampling = SAMPLING_PARAMS[self.api_type]
+        # FEN, legal moves and our evaluation (positive favors the side to move), nothing else
+        position = game_state['game'] if 'game' in game_state else game_state['board']
+        position_score = evaluate_position(position, game_state['currentPlayer'])
+        prompt = chess_move_prompt(board, evaluation=position_score)
 
         try:
-            if self.api_type == 'openai':
-                response = await self.client.chat.completions.create(
-                    model=self.model,
-                    messages=[{"role": "user", "content": prompt}]
-                )
-                move = response.choices[0].message.content.strip()
-            
-            elif self.api_type == 'anthropic':
-                response = await self.client.messages.create(
-                    model=self.model,
-                    max_tokens=10,
-                    messages=[{"role": "user", "content": prompt}]
-                )
-                move = response.content[0].text.strip()
-            
-            elif self.api_type == 'google':
-                response = await self.client.generate_content(prompt)
-                move = response.text.strip()
-            
-            elif self.api_type == 'perplexity':
-                response = await self.client.post(
-                    "/chat/completions",
-                    json={
-                        "model": self.model,
-                        "messages": [{"role": "user", "content": prompt}],
-                        "max_tokens": 100,
-                        "temperature": 0.7
-                    }
-                )
-                move = response.json()['choices'][0]['message']['content'].strip()
-            
-            # Extract move from response (last line)
-            move_lines = move.strip().split('\n')
-            final_move = move_lines[-1].strip()
-            
-            # Validate move format
-            if len(final_move) >= 4 and all(c in 'abcdefgh12345678' for c in final_move[:4]):
-                # Validate move is within board bounds
-                from_file = ord(final_move[0]) - ord('a')
-                from_rank = 8 - int(final_move[1])
-                to_file = ord(final_move[2]) - ord('a')
-                to_rank = 8 - int(final_move[3])
-                
-                if all(0 <= x <= 7 for x in [from_file, from_rank, to_file, to_rank]):
-                    return final_move[:4]
-                    
-            raise ValueError(f"Invalid move format: {final_move}")
-                
+            # Live games go ahead of tournament batches in the provider's rate limit queue
+            reply, tokens_in, tokens_out = await scheduled_call(
+                self.api_type, self.api_key, self.model, sampling, prompt, priority, self.latency, self.hedge)
+            move = parse_move(reply, board)
+            token_meter.record(self.api_type, tokens_in, tokens_out, legal=move is not None)
+            if move is None:
+                raise ValueError(f"No legal move in reply: {reply!r}")
+            if key is not None:
+                await default_cache().put(key, move)
+            return move
+
         except Exception as e:
             print(f"Error generating move with {self.api_type}: {str(e)}")
-            # Return a default move in case of error (e2e4)
-            return "e2e4"                                                      
\ No newline at end of file
+            # Best move by static evaluation instead
+            candidates = self.rank_candidate_moves(board, limit=1)
+            return candidates[0] if candidates else "e2e4"
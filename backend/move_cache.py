@@ -0,0 +1,154 @@
+"""Cache of LLM move answers, keyed by everything that shapes the answer.
+
+A key combines provider, model, prompt template version, a hash of the
+position and the sampling parameters. MoveCache keeps recent answers in an
+in-process LRU and, when given a Redis client, in a shared Redis tier, each
+with its own TTL and size limit. A cached move is only returned if it is
+still in the legal move list, so a stale or corrupt entry costs a provider
+call rather than an illegal move. get(), put() and discard() are
+coroutines: the Redis client is synchronous and runs in a worker thread,
+bounded by its socket timeout, so a slow Redis never blocks the event loop.
+"""
+import asyncio
+import hashlib
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Iterable, Optional, Tuple, TypedDict
+
+logger = logging.getLogger(__name__)
+
+class CacheStats(TypedDict):
+    hits: int
+    redis_hits: int  # Hits served by Redis, also counted in hits
+    misses: int
+    invalid: int  # Cached moves dropped because they were no longer legal
+    entries: int
+
+def position_hash(position: Any) -> str:
+    """Stable hash of a position: a FEN or Zobrist key, or a nested list board such as Go's."""
+    if isinstance(position, int):
+        return f"{position:016x}"
+    return hashlib.blake2b(repr(position).encode(), digest_size=8).hexdigest()
+
+def cache_key(provider: str, model: str, prompt_version: int, position: Any, **sampling: Any) -> str:
+    """Cache key for a move request; `sampling` holds the parameters sent to the provider."""
+    params = ','.join(f"{name}={value}" for name, value in sorted(sampling.items()))
+    return f"{provider}|{model}|v{prompt_version}|{position_hash(position)}|{params}"
+
+class MoveCache:
+    def __init__(self, max_entries: int = 10000, ttl: float = 3600.0, redis_client: Any = None,
+                 redis_ttl: int = 86400, redis_prefix: str = 'llm-move:'):
+        if max_entries <= 0:
+            raise ValueError("max_entries must be positive")
+        self.max_entries = max_entries
+        self.ttl = ttl
+        # Redis tier: its size is bounded by the TTL and the server's maxmemory policy
+        self.redis = redis_client
+        self.redis_ttl = redis_ttl
+        self.redis_prefix = redis_prefix
+        self._entries: 'OrderedDict[str, Tuple[str, float]]' = OrderedDict()  # key -> (move, expiry)
+        self.hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+        self.invalid = 0
+
+    async def get(self, key: str, legal_moves: Iterable[str]) -> Optional[str]:
+        """Cached move for the key if it is still legal, else None."""
+        move = self._get_local(key)
+        from_redis = False
+        if move is None and self.redis is not None:
+            move = await asyncio.to_thread(self._get_redis, key)
+            from_redis = move is not None
+        if move is None:
+            self.misses += 1
+            return None
+        if move not in set(legal_moves):
+            self.invalid += 1
+            self.misses += 1
+            await self.discard(key)
+            return None
+        if from_redis:
+            self.redis_hits += 1
+            self._put_local(key, move)
+        self.hits += 1
+        return move
+
+    async def put(self, key: str, move: str) -> None:
+        """Store a validated move in both tiers."""
+        self._put_local(key, move)
+        if self.redis is not None:
+            await asyncio.to_thread(self._set_redis, key, move)
+
+    async def discard(self, key: str) -> None:
+        self._entries.pop(key, None)
+        if self.redis is not None:
+            await asyncio.to_thread(self._delete_redis, key)
+
+    def clear(self) -> None:
+        """Empty the in-process tier and reset the counters; Redis entries expire on their own."""
+        self._entries.clear()
+        self.hits = self.redis_hits = self.misses = self.invalid = 0
+
+    def stats(self) -> CacheStats:
+        return {'hits': self.hits, 'redis_hits': self.redis_hits, 'misses': self.misses,
+                'invalid': self.invalid, 'entries': len(self._entries)}
+
+    def _get_local(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        move, expiry = entry
+        if expiry <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return move
+
+    def _put_local(self, key: str, move: str) -> None:
+        self._entries[key] = (move, time.monotonic() + self.ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    # Blocking Redis calls, run in a worker thread so they never stall the event loop
+
+    def _get_redis(self, key: str) -> Optional[str]:
+        try:
+            value = self.redis.get(self.redis_prefix + key)
+        except Exception as e:
+            logger.warning(f"Move cache: Redis read failed: {e}")
+            return None
+        if isinstance(value, bytes):
+            value = value.decode()
+        return value
+
+    def _set_redis(self, key: str, move: str) -> None:
+        try:
+            self.redis.set(self.redis_prefix + key, move, ex=self.redis_ttl)
+        except Exception as e:
+            logger.warning(f"Move cache: Redis write failed: {e}")
+
+    def _delete_redis(self, key: str) -> None:
+        try:
+            self.redis.delete(self.redis_prefix + key)
+        except Exception as e:
+            logger.warning(f"Move cache: Redis delete failed: {e}")
+
+_default_cache: Optional[MoveCache] = None
+
+def default_cache() -> MoveCache:
+    """Process-wide cache shared by the LLM players, with a Redis tier when REDIS_URL is set."""
+    global _default_cache
+    if _default_cache is None:
+        redis_client = None
+        redis_url = os.getenv('REDIS_URL', '')
+        if redis_url:
+            try:
+                from redis import Redis
+                redis_client = Redis.from_url(redis_url, socket_timeout=1)
+            except ImportError:
+                logger.warning("Move cache: redis package not installed, using the in-process tier only")
+        _default_cache = MoveCache(redis_client=redis_client)
+    return _default_cache
@@ -0,0 +1,179 @@
+"""Polyglot opening books: memory-mapped lookup and a PGN book builder.
+
+A Polyglot book is a file of 16-byte big-endian entries (key, move,
+weight, learn) sorted by the Zobrist key of the position. OpeningBook maps
+the file and binary-searches it, so even books with millions of entries
+open instantly and only the pages a lookup touches are read. The keys are
+the Polyglot keys that ChessGame.zobrist_key already follows.
+
+Build a book from PGN files with
+`python opening_book.py games.pgn more.pgn -o book.bin`.
+"""
+import argparse
+import mmap
+import random
+import struct
+import sys
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import chess
+import chess.pgn
+import chess.polyglot
+
+from chess_engine import ChessGame
+
+ENTRY = struct.Struct('>QHHI')  # key, move, weight, learn
+PROMOTION_CODES = {1: 'n', 2: 'b', 3: 'r', 4: 'q'}
+# Polyglot stores castling as the king taking its own rook
+CASTLING_MOVES = {'e1h1': 'e1g1', 'e1a1': 'e1c1', 'e8h8': 'e8g8', 'e8a8': 'e8c8'}
+
+class BookEntry(NamedTuple):
+    key: int
+    move: str  # UCI, with castling as the king taking its own rook as in the file
+    weight: int
+    learn: int
+
+def decode_move(move: int) -> str:
+    """Polyglot move bits (to file, to rank, from file, from rank, promotion) as UCI."""
+    to_file, to_rank = move & 7, move >> 3 & 7
+    from_file, from_rank = move >> 6 & 7, move >> 9 & 7
+    uci = f"{chr(from_file + 97)}{from_rank + 1}{chr(to_file + 97)}{to_rank + 1}"
+    return uci + PROMOTION_CODES.get(move >> 12 & 7, '')
+
+def encode_move(uci: str) -> int:
+    """UCI move (castling as king takes rook) in Polyglot move bits."""
+    move = (ord(uci[2]) - 97) | (int(uci[3]) - 1) << 3 | (ord(uci[0]) - 97) << 6 | (int(uci[1]) - 1) << 9
+    if len(uci) > 4:
+        move |= {code: value for value, code in PROMOTION_CODES.items()}[uci[4]] << 12
+    return move
+
+class OpeningBook:
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, 'rb')
+        size = self._file.seek(0, 2)
+        if size % ENTRY.size:
+            self._file.close()
+            raise ValueError(f"Not a Polyglot book: {path}")
+        # mmap cannot map an empty file
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b''
+        self._count = size // ENTRY.size
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __enter__(self) -> 'OpeningBook':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+        self._file.close()
+
+    def _key_at(self, index: int) -> int:
+        return struct.unpack_from('>Q', self._map, index * ENTRY.size)[0]
+
+    def entries(self, key: int) -> List[BookEntry]:
+        """All entries for a Zobrist key, in file order."""
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            if self._key_at(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        found = []
+        while low < self._count:
+            entry_key, move, weight, learn = ENTRY.unpack_from(self._map, low * ENTRY.size)
+            if entry_key != key:
+                break
+            found.append(BookEntry(entry_key, decode_move(move), weight, learn))
+            low += 1
+        return found
+
+    def moves(self, game: ChessGame) -> List[Tuple[str, int]]:
+        """Book moves for the position as (UCI move, weight), castling written as the king's move."""
+        board = game.get_board()
+        moves = []
+        for entry in self.entries(game.zobrist_key):
+            move = entry.move
+            if move in CASTLING_MOVES and board[8 - int(move[1])][4] in 'Kk':
+                move = CASTLING_MOVES[move]
+            moves.append((move, entry.weight))
+        return moves
+
+    def choose(self, game: ChessGame, rng: Optional[random.Random] = None) -> Optional[str]:
+        """Pick a book move at random in proportion to the weights, or None when out of book."""
+        moves = [(move, weight) for move, weight in self.moves(game) if weight > 0]
+        if not moves:
+            return None
+        rng = rng or random
+        return rng.choices([move for move, _ in moves], weights=[weight for _, weight in moves])[0]
+
+def _book_move(board: chess.Board, move: chess.Move) -> str:
+    """UCI of a python-chess move in Polyglot form, castling as the king taking its rook."""
+    if board.is_kingside_castling(move):
+        return move.uci()[:2] + 'h' + move.uci()[1]
+    if board.is_queenside_castling(move):
+        return move.uci()[:2] + 'a' + move.uci()[1]
+    return move.uci()
+
+def build_book(pgn_paths: Iterable[str], output_path: str, max_ply: int = 24, min_games: int = 1) -> int:
+    """Compile a Polyglot book from PGN files and return the number of entries written.
+
+    Every move of the first `max_ply` plies of each game is counted,
+    weighted 2 for the winner's moves, 1 in drawn games and 0 for the loser
+    (the usual Polyglot scoring). Moves played in fewer than `min_games`
+    games are left out and weights are scaled to fit 16 bits.
+    """
+    scores: Dict[Tuple[int, str], List[int]] = {}  # (key, move) -> [score, games]
+    for path in pgn_paths:
+        with open(path, encoding='utf-8', errors='replace') as pgn:
+            while True:
+                game = chess.pgn.read_game(pgn)
+                if game is None:
+                    break
+                result = game.headers.get('Result', '*')
+                board = game.board()
+                for ply, move in enumerate(game.mainline_moves()):
+                    if ply >= max_ply:
+                        break
+                    if result == '1/2-1/2':
+                        score = 1
+                    elif result in ('1-0', '0-1'):
+                        score = 2 if (result == '1-0') == (board.turn == chess.WHITE) else 0
+                    else:
+                        score = 0
+                    stats = scores.setdefault((chess.polyglot.zobrist_hash(board), _book_move(board, move)), [0, 0])
+                    stats[0] += score
+                    stats[1] += 1
+                    board.push(move)
+
+    kept = [(key, move, score) for (key, move), (score, games) in scores.items() if games >= min_games]
+    top = max((score for _, _, score in kept), default=0)
+    scale = top / 0xFFFF if top > 0xFFFF else 1
+    # Sorted by key as Polyglot requires, best moves first within a position
+    kept.sort(key=lambda entry: (entry[0], -entry[2]))
+    with open(output_path, 'wb') as book:
+        for key, move, score in kept:
+            book.write(ENTRY.pack(key, encode_move(move), int(score / scale), 0))
+    return len(kept)
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Build a Polyglot opening book from PGN files")
+    parser.add_argument('pgn', nargs='+', help="PGN files to read")
+    parser.add_argument('-o', '--output', default='book.bin', help="Book file to write (default: book.bin)")
+    parser.add_argument('--max-ply', type=int, default=24, help="Plies of each game to include (default: 24)")
+    parser.add_argument('--min-games', type=int, default=1,
+                        help="Leave out moves played in fewer games than this (default: 1)")
+    args = parser.parse_args(argv)
+
+    count = build_book(args.pgn, args.output, args.max_ply, args.min_games)
+    print(f"Wrote {count} entries to {args.output}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,14 +1,16 @@
 """Chess opening book and position evaluation."""
-from typing import Dict, List, Optional, Tuple, TypedDict, Literal
-from typing_extensions import NotRequired
+import os
+import random
+from pathlib import Path
+from typing import List, Optional, Tuple, Union
 
-class SquareBonus(TypedDict):
-    bonus: float
-    description: NotRequired[str]
+from chess_engine import ChessGame
+from chess_eval import evaluate_board
+from opening_book import OpeningBook
 
-# Type definitions for board positions
-CenterSquare = Tuple[Literal[3, 4], Literal[3, 4]]
-ExtendedSquare = Tuple[Literal[2, 3, 4, 5], Literal[2, 3, 4, 5]]
+# Polyglot book consulted before OPENING_BOOK, built with opening_book.py
+BOOK_PATH = os.getenv('OPENING_BOOK_PATH', str(Path(__file__).parent / 'book.bin'))
+_book: Optional[OpeningBook] = None
 
 # Simple opening book with common first moves
 OPENING_BOOK = {
@@ -35,80 +37,36 @@ OPENING_BOOK = {
     ]
 }
 
-def evaluate_position(board: List[List[str]], color: str) -> float:
-    """Evaluate chess position from given color's perspective."""
-    piece_values = {
-        'P': 1.0,   # Pawn
-        'N': 3.0,   # Knight
-        'B': 3.0,   # Bishop
-        'R': 5.0,   # Rook
-        'Q': 9.0,   # Queen
-        'K': 0.0    # King (not counted in material)
-    }
-    
-    # Center squares for piece-square tables
-    center_squares: Dict[CenterSquare, SquareBonus] = {
-        (3, 3): {"bonus": 0.3, "description": "center"},
-        (3, 4): {"bonus": 0.3, "description": "center"},
-        (4, 3): {"bonus": 0.3, "description": "center"},
-        (4, 4): {"bonus": 0.3, "description": "center"}
-    }
-    
-    # Extended center squares
-    extended_center: Dict[ExtendedSquare, SquareBonus] = {
-        (2, 2): {"bonus": 0.1}, (2, 3): {"bonus": 0.1},
-        (2, 4): {"bonus": 0.1}, (2, 5): {"bonus": 0.1},
-        (3, 2): {"bonus": 0.1}, (3, 5): {"bonus": 0.1},
-        (4, 2): {"bonus": 0.1}, (4, 5): {"bonus": 0.1},
-        (5, 2): {"bonus": 0.1}, (5, 3): {"bonus": 0.1},
-        (5, 4): {"bonus": 0.1}, (5, 5): {"bonus": 0.1}
-    }
-    
-    score = 0.0
-    
-    for i in range(8):
-        for j in range(8):
-            piece = board[i][j]
-            if piece == '.':
-                continue
-                
-            # Get piece value
-            value = piece_values.get(piece.upper(), 0)
-            
-            # Add/subtract based on piece color
-            if (color == 'white' and piece.isupper()) or \
-               (color == 'black' and piece.islower()):
-                # Piece belongs to evaluated color
-                score += value
-                
-                # Add positional bonus for center control
-                # Type cast to handle position tuples
-                pos = (i, j)
-                if pos in center_squares:
-                    score += center_squares[pos]["bonus"]
-                elif pos in extended_center:
-                    score += extended_center[pos]["bonus"]
-                    
-                # Pawn structure bonus
-                if piece.upper() == 'P':
-                    # Bonus for advanced pawns
-                    rank_bonus = (7 - i if color == 'white' else i) * 0.1
-                    score += rank_bonus
-                    
-                    # Penalty for doubled pawns
-                    file_pawns = sum(1 for row in board if row[j].upper() == 'P')
-                    if file_pawns > 1:
-                        score -= 0.5
-            else:
-                # Piece belongs to opponent
-                score -= value
-                
-    return score
+def evaluate_position(board: Union[ChessGame, List[List[str]]], color: str) -> float:
+    """Evaluate chess position from given color's perspective, in pawns.
+
+    Pass the ChessGame itself when there is one: its evaluate() reads the
+    score kept up to date move by move (about 0.9us) instead of summing
+    the piece-square tables over an 8x8 board (about 7us).
+    """
+    score = (board.evaluate() if isinstance(board, ChessGame) else evaluate_board(board)) / 100
+    return score if color == 'white' else -score
+
+def get_book() -> Optional[OpeningBook]:
+    """The Polyglot book at BOOK_PATH, mapped on first use; None if there is no such file."""
+    global _book
+    if _book is None and os.path.isfile(BOOK_PATH):
+        _book = OpeningBook(BOOK_PATH)
+    return _book
 
 def get_opening_move(fen: str) -> Optional[Tuple[str, str]]:
-    """Get move from opening book if position exists."""
+    """Get a book move and its source for the position, or None when out of book.
+
+    The Polyglot book picks among its moves by weight; the built-in
+    OPENING_BOOK picks uniformly.
+    """
+    book = get_book()
+    if book is not None:
+        game = ChessGame('white', 'black')
+        game.set_fen(fen)
+        move = book.choose(game)
+        if move:
+            return move, "Opening book"
     if fen in OPENING_BOOK:
-        moves = OPENING_BOOK[fen]
-        # For now, always return first move. Could be randomized.
-        return moves[0]
+        return random.choice(OPENING_BOOK[fen])
     return None
@@ -0,0 +1,213 @@
+"""Perft node counting and benchmarks for the in-house chess engine.
+
+Run `python perft.py` for the standard suite. It exits non-zero when a
+node count differs from the published value or the speed falls below
+--min-nps, so it can be used as a regression gate. `--probe` instead
+times is_valid_move() against one legal_moves() pass, which is what
+callers wanting every move of a position should use.
+"""
+import argparse
+import sys
+import time
+from typing import Dict, List, Optional, Tuple, TypedDict
+
+from chess_engine import ChessGame
+
+class PerftPosition(TypedDict):
+    name: str
+    fen: str
+    nodes: List[int]  # Expected node counts for depth 1, 2, ...
+
+# Standard perft positions with their published node counts
+PERFT_POSITIONS: List[PerftPosition] = [
+    {
+        'name': 'startpos',
+        'fen': 'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1',
+        'nodes': [20, 400, 8902, 197281, 4865609, 119060324]
+    },
+    {
+        'name': 'kiwipete',
+        'fen': 'r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1',
+        'nodes': [48, 2039, 97862, 4085603, 193690690]
+    },
+    {
+        'name': 'position3',
+        'fen': '8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1',
+        'nodes': [14, 191, 2812, 43238, 674624, 11030083]
+    },
+    {
+        'name': 'position4',
+        'fen': 'r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1',
+        'nodes': [6, 264, 9467, 422333, 15833292]
+    },
+    {
+        'name': 'position5',
+        'fen': 'rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8',
+        'nodes': [44, 1486, 62379, 2103487, 89941194]
+    },
+    {
+        'name': 'position6',
+        'fen': 'r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10',
+        'nodes': [46, 2079, 89890, 3894594, 164075551]
+    }
+]
+
+def perft(game: ChessGame, depth: int) -> int:
+    """Count the leaf nodes of the legal move tree to the given depth."""
+    if depth == 0:
+        return 1
+    if depth == 1:
+        # Bulk counting: the last ply only needs the number of legal moves
+        return sum(1 for _ in game.legal_moves())
+    nodes = 0
+    for move in list(game.legal_moves()):
+        game.push(move)
+        nodes += perft(game, depth - 1)
+        game.pop()
+    return nodes
+
+def divide(game: ChessGame, depth: int) -> Dict[str, int]:
+    """Return the perft count below each root move, keyed by UCI move."""
+    counts = {}
+    for move in list(game.legal_moves()):
+        game.push(move)
+        counts[move.uci()] = perft(game, depth - 1)
+        game.pop()
+    return counts
+
+def game_from_fen(fen: str) -> ChessGame:
+    """Create a ChessGame set up at the given FEN."""
+    game = ChessGame('white', 'black')
+    game.set_fen(fen)
+    return game
+
+def probe_sweep(game: ChessGame) -> List[Tuple[Dict[str, int], Dict[str, int]]]:
+    """Every (from, to) pair from a piece of the side to move to any square, as one sweep probes them."""
+    board = game.get_board()
+    white = game.current_player == 'white'
+    return [({'row': row, 'col': col}, {'row': to_row, 'col': to_col})
+            for row in range(8) for col in range(8)
+            if board[row][col] != '.' and board[row][col].isupper() == white
+            for to_row in range(8) for to_col in range(8)]
+
+def run_probe_benchmark(repeat: int = 5) -> float:
+    """Time is_valid_move() on each suite position; returns microseconds per call on its legal moves.
+
+    Legal moves are what a game asks about; the full from/to sweep is
+    mostly rejections. A sweep is also timed as callers should do it,
+    with one legal_moves() pass per position.
+    """
+    total_calls = 0
+    total_time = 0.0
+    print(f"{'position':<12}{'legal':>7}{'us/call':>9}{'probes':>8}{'us/call':>9}{'legal_moves() us':>18}")
+    for position in PERFT_POSITIONS:
+        game = game_from_fen(position['fen'])
+        probes = probe_sweep(game)
+        legal = [({'row': move.from_square >> 3, 'col': move.from_square & 7},
+                  {'row': move.to_square >> 3, 'col': move.to_square & 7}) for move in game.legal_moves()]
+        best_legal = best_sweep = best_moves = float('inf')
+        for _ in range(repeat):
+            game.set_fen(position['fen'])
+            start = time.perf_counter()
+            for from_pos, to_pos in legal:
+                game.is_valid_move(from_pos, to_pos)
+            best_legal = min(best_legal, time.perf_counter() - start)
+            start = time.perf_counter()
+            for from_pos, to_pos in probes:
+                game.is_valid_move(from_pos, to_pos)
+            best_sweep = min(best_sweep, time.perf_counter() - start)
+            game.set_fen(position['fen'])
+            start = time.perf_counter()
+            list(game.legal_moves())
+            best_moves = min(best_moves, time.perf_counter() - start)
+        total_calls += len(legal)
+        total_time += best_legal
+        print(f"{position['name']:<12}{len(legal):>7}{best_legal / len(legal) * 1e6:>9.2f}"
+              f"{len(probes):>8}{best_sweep / len(probes) * 1e6:>9.2f}{best_moves * 1e6:>18.1f}")
+    per_call = total_time / total_calls * 1e6
+    print(f"Total: {total_calls} legal moves, {per_call:.2f}us per is_valid_move call")
+    return per_call
+
+def run_suite(depth: int, names: Optional[List[str]] = None, show_divide: bool = False,
+              min_nps: float = 0.0) -> bool:
+    """Run perft on the standard positions and print a report.
+
+    Each position runs to `depth`, capped at the deepest published count.
+    Returns True when every count matches and the overall speed is at
+    least `min_nps` nodes per second.
+    """
+    total_nodes = 0
+    total_time = 0.0
+    passed = True
+
+    print(f"{'position':<12}{'depth':>6}{'nodes':>14}{'expected':>14}{'seconds':>10}{'nps':>12}  result")
+    for position in PERFT_POSITIONS:
+        if names and position['name'] not in names:
+            continue
+        position_depth = min(depth, len(position['nodes']))
+        expected = position['nodes'][position_depth - 1]
+        game = game_from_fen(position['fen'])
+
+        start = time.perf_counter()
+        if show_divide:
+            counts = divide(game, position_depth)
+            nodes = sum(counts.values())
+        else:
+            nodes = perft(game, position_depth)
+        elapsed = time.perf_counter() - start
+
+        total_nodes += nodes
+        total_time += elapsed
+        ok = nodes == expected
+        passed = passed and ok
+        nps = nodes / elapsed if elapsed > 0 else 0.0
+        print(f"{position['name']:<12}{position_depth:>6}{nodes:>14}{expected:>14}"
+              f"{elapsed:>10.2f}{nps:>12.0f}  {'OK' if ok else 'FAIL'}")
+        if show_divide:
+            for move, count in sorted(counts.items()):
+                print(f"    {move}: {count}")
+
+    total_nps = total_nodes / total_time if total_time > 0 else 0.0
+    print(f"Total: {total_nodes} nodes in {total_time:.2f}s ({total_nps:.0f} nodes/s)")
+    if total_nps < min_nps:
+        print(f"Speed below required {min_nps:.0f} nodes/s")
+        passed = False
+    return passed
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Perft correctness and speed check for chess_engine.ChessGame")
+    parser.add_argument('--depth', type=int, default=3, help="Search depth (default: 3)")
+    parser.add_argument('--position', action='append', dest='positions',
+                        choices=[position['name'] for position in PERFT_POSITIONS],
+                        help="Only run the named position (repeatable)")
+    parser.add_argument('--fen', help="Run perft on a custom FEN instead of the suite (no expected count)")
+    parser.add_argument('--divide', action='store_true', help="Print the node count below each root move")
+    parser.add_argument('--probe', action='store_true',
+                        help="Time is_valid_move() and legal_moves() on each position instead of perft")
+    parser.add_argument('--min-nps', type=float, default=0.0,
+                        help="Fail if the overall speed is below this many nodes per second")
+    args = parser.parse_args(argv)
+
+    if args.depth < 1:
+        parser.error("--depth must be at least 1")
+
+    if args.probe:
+        run_probe_benchmark()
+        return 0
+
+    if args.fen:
+        game = game_from_fen(args.fen)
+        start = time.perf_counter()
+        counts = divide(game, args.depth)
+        elapsed = time.perf_counter() - start
+        if args.divide:
+            for move, count in sorted(counts.items()):
+                print(f"{move}: {count}")
+        nodes = sum(counts.values())
+        print(f"Nodes: {nodes} in {elapsed:.2f}s ({nodes / elapsed if elapsed > 0 else 0:.0f} nodes/s)")
+        return 0
+
+    return 0 if run_suite(args.depth, args.positions, args.divide, args.min_nps) else 1
+
+if __name__ == '__main__':
+    sys.exit(main())
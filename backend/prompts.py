@@ -0,0 +1,158 @@
+"""Compact, versioned move prompts and single-move provider settings.
+
+A template asks for exactly one move from a list of legal moves, with the
+position as a FEN (chess) or a small text board (Go) and an optional
+evaluation. request_params() adds each provider's answer cap and stop
+sequence, so the reply is a single move token rather than an essay whose
+last line has to be dug out. parse_move() checks the reply against the
+legal moves. TokenMeter records the tokens in and out of every move and
+how many replies were illegal.
+
+Bump a template's version whenever its text changes: the version is part
+of the move cache key, so answers to an old prompt are not reused.
+"""
+import re
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple, TypedDict
+
+import chess
+
+MOVE_TOKENS = 8  # Enough for the longest SAN or UCI move and a stray space
+GTP_COLUMNS = 'ABCDEFGHJKLMNOPQRST'  # GTP skips I
+
+class Template(NamedTuple):
+    version: int  # Part of the move cache key
+    system: str
+    user: str  # str.format() pattern
+
+class Prompt(NamedTuple):
+    """A template rendered for one position."""
+    system: str
+    user: str
+
+CHESS_TEMPLATE = Template(
+    version=2,
+    system="You are a chess engine. Reply with one legal move from the list and nothing else.",
+    user="FEN: {fen}\n{evaluation}Legal moves ({notation}): {moves}\nMove:"
+)
+GO_TEMPLATE = Template(
+    version=2,
+    system="You are a Go engine. Reply with one legal move from the list in GTP notation and nothing else.",
+    user="Board ({size}x{size}, X black, O white, . empty):\n{board}\nYou play {color}.\n{evaluation}"
+         "Legal moves: {moves}\nMove:"
+)
+
+def chess_move_prompt(board: chess.Board, notation: str = 'uci', evaluation: Optional[float] = None) -> Prompt:
+    """Prompt for the side to move; `evaluation` is in pawns from that side's point of view."""
+    if notation == 'uci':
+        moves = [move.uci() for move in board.legal_moves]
+    elif notation == 'san':
+        moves = [board.san(move) for move in board.legal_moves]
+    else:
+        raise ValueError(f"Unknown notation: {notation}")
+    user = CHESS_TEMPLATE.user.format(
+        fen=board.fen(),
+        evaluation='' if evaluation is None else f"Eval: {evaluation:+.2f}\n",
+        notation=notation.upper(),
+        moves=' '.join(moves)
+    )
+    return Prompt(CHESS_TEMPLATE.system, user)
+
+def gtp_coordinate(row: int, col: int) -> str:
+    """GTP name of a point, rows counted from 1 at the top of the board as the tournament prints it."""
+    return f"{GTP_COLUMNS[col]}{row + 1}"
+
+def go_move_prompt(board_state: Sequence[Sequence[int]], moves: Iterable[str], color: str = 'black',
+                   evaluation: Optional[float] = None) -> Prompt:
+    """Prompt for a Go move; `board_state` holds 0 empty, 1 black and 2 white, `moves` GTP coordinates."""
+    size = len(board_state)
+    rows = [f"{row + 1:2d} " + ''.join('.XO'[cell] for cell in cells) for row, cells in enumerate(board_state)]
+    user = GO_TEMPLATE.user.format(
+        size=size,
+        board='   ' + GTP_COLUMNS[:size] + '\n' + '\n'.join(rows),
+        color=color,
+        evaluation='' if evaluation is None else f"Eval: {evaluation:+.1f} points\n",
+        moves=' '.join(moves)
+    )
+    return Prompt(GO_TEMPLATE.system, user)
+
+def request_params(api_type: str, max_tokens: int = MOVE_TOKENS, temperature: Optional[float] = None) -> Dict[str, Any]:
+    """Provider keyword arguments that cut the reply off after one move."""
+    if api_type in ('openai', 'perplexity'):
+        params: Dict[str, Any] = {'max_tokens': max_tokens}
+        if api_type == 'openai':
+            params['stop'] = ['\n']
+    elif api_type == 'anthropic':
+        params = {'max_tokens': max_tokens, 'stop_sequences': ['\n']}
+    elif api_type == 'google':
+        config: Dict[str, Any] = {'max_output_tokens': max_tokens, 'stop_sequences': ['\n']}
+        if temperature is not None:
+            config['temperature'] = temperature
+        return {'generation_config': config}
+    else:
+        raise ValueError(f"Unsupported API type: {api_type}")
+    if temperature is not None:
+        params['temperature'] = temperature
+    return params
+
+def parse_move(reply: str, board: chess.Board) -> Optional[str]:
+    """The legal move in a chess reply as UCI, accepting UCI or SAN; None when there is none."""
+    for token in re.findall(r'[A-Za-z0-9+#=-]+', reply):
+        try:
+            move = chess.Move.from_uci(token.lower())
+            if move in board.legal_moves:
+                return move.uci()
+        except ValueError:
+            pass
+        try:
+            return board.parse_san(token).uci()
+        except ValueError:
+            pass
+    return None
+
+def parse_gtp_move(reply: str, legal_moves: Iterable[str]) -> Optional[str]:
+    """The first legal GTP move (or PASS) in a Go reply, None when there is none."""
+    legal = set(legal_moves)
+    for token in re.findall(r'[A-Za-z]+\d*', reply.upper()):
+        if token in legal or token == 'PASS':
+            return token
+    return None
+
+def usage(api_type: str, response: Any) -> Tuple[int, int]:
+    """Tokens in and out that the provider reports for a response; (0, 0) when it reports none."""
+    if api_type == 'openai':
+        counts = getattr(response, 'usage', None)
+        return (getattr(counts, 'prompt_tokens', 0) or 0, getattr(counts, 'completion_tokens', 0) or 0)
+    if api_type == 'anthropic':
+        counts = getattr(response, 'usage', None)
+        return (getattr(counts, 'input_tokens', 0) or 0, getattr(counts, 'output_tokens', 0) or 0)
+    if api_type == 'google':
+        counts = getattr(response, 'usage_metadata', None)
+        return (getattr(counts, 'prompt_token_count', 0) or 0, getattr(counts, 'candidates_token_count', 0) or 0)
+    counts = response.get('usage', {}) if isinstance(response, dict) else {}  # Perplexity JSON
+    return (counts.get('prompt_tokens', 0), counts.get('completion_tokens', 0))
+
+class MoveTokenStats(TypedDict):
+    moves: int
+    tokens_in: int
+    tokens_out: int
+    illegal: int  # Replies without a legal move
+    tokens_per_move: float
+
+class TokenMeter:
+    def __init__(self):
+        self._totals: Dict[str, List[int]] = {}  # provider -> [moves, tokens in, tokens out, illegal]
+
+    def record(self, provider: str, tokens_in: int, tokens_out: int, legal: bool = True) -> None:
+        totals = self._totals.setdefault(provider, [0, 0, 0, 0])
+        totals[0] += 1
+        totals[1] += tokens_in
+        totals[2] += tokens_out
+        totals[3] += not legal
+
+    def stats(self) -> Dict[str, MoveTokenStats]:
+        return {provider: {'moves': moves, 'tokens_in': tokens_in, 'tokens_out': tokens_out, 'illegal': illegal,
+                           'tokens_per_move': (tokens_in + tokens_out) / moves}
+                for provider, (moves, tokens_in, tokens_out, illegal) in self._totals.items()}
+
+# Token use of every LLM move in this process
+token_meter = TokenMeter()
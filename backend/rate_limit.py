@@ -0,0 +1,189 @@
+"""Rate-limit-aware scheduling of LLM provider calls.
+
+Every (provider, API key) pair gets a RateLimiter with two token buckets,
+one for requests and one for model tokens per minute. Callers wait in a
+priority queue, so moves for live games (INTERACTIVE) go ahead of
+tournament batches (BATCH). When a provider answers 429 the limiter
+pauses the whole queue for the Retry-After time, or an exponential
+backoff without one, and empties the request bucket so the queue does
+not rush back in all at once.
+
+    result = await default_scheduler().run('openai', api_key, lambda: client.chat.completions.create(...),
+                                           tokens=estimate_tokens(prompt, 10), priority=BATCH)
+"""
+import asyncio
+import heapq
+import itertools
+import logging
+import os
+import random
+import time
+from typing import Any, Awaitable, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+INTERACTIVE = 0
+BATCH = 1
+
+class RateLimits(NamedTuple):
+    requests_per_minute: float
+    tokens_per_minute: float
+
+# Conservative defaults, override with e.g. OPENAI_RPM and OPENAI_TPM
+DEFAULT_LIMITS: Dict[str, RateLimits] = {
+    'openai': RateLimits(500, 90000),
+    'anthropic': RateLimits(50, 40000),
+    'google': RateLimits(60, 120000),
+    'perplexity': RateLimits(50, 100000)
+}
+MAX_BACKOFF = 60.0
+
+def estimate_tokens(prompt: str, max_tokens: Optional[int] = None) -> int:
+    """Rough token cost of a request: about four characters per prompt token plus the answer budget."""
+    return len(prompt) // 4 + (max_tokens or 256)
+
+def is_rate_limited(error: BaseException) -> bool:
+    """Whether a provider error is a 429, for the OpenAI, Anthropic, Google and httpx exceptions."""
+    response = getattr(error, 'response', None)
+    status = getattr(error, 'status_code', None) or getattr(response, 'status_code', None) or getattr(error, 'code', None)
+    return status == 429
+
+def retry_after(error: BaseException) -> Optional[float]:
+    """Seconds from the Retry-After header of a rate-limit error, when the provider sent one."""
+    headers = getattr(getattr(error, 'response', None), 'headers', None) or {}
+    try:
+        return float(headers.get('retry-after'))
+    except (TypeError, ValueError):
+        return None
+
+class TokenBucket:
+    def __init__(self, per_minute: float, now: Optional[float] = None):
+        if per_minute <= 0:
+            raise ValueError("per_minute must be positive")
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0  # Refill per second
+        self.level = self.capacity
+        self.updated = time.monotonic() if now is None else now
+
+    def _refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until `amount` is available; requests larger than the bucket wait for a full one."""
+        self._refill(now)
+        missing = min(amount, self.capacity) - self.level
+        return max(0.0, missing / self.rate)
+
+    def take(self, amount: float, now: float) -> None:
+        self._refill(now)
+        self.level -= min(amount, self.capacity)
+
+    def drain(self, now: float) -> None:
+        self._refill(now)
+        self.level = min(self.level, 0.0)
+
+class RateLimiter:
+    def __init__(self, limits: RateLimits):
+        self.limits = limits
+        self.requests = TokenBucket(limits.requests_per_minute)
+        self.tokens = TokenBucket(limits.tokens_per_minute)
+        self.backoff_until = 0.0
+        self.rate_limited = 0  # 429s seen in a row
+        # Waiters as (priority, arrival, wake-up event)
+        self._queue: List[Tuple[int, int, asyncio.Event]] = []
+        self._arrivals = itertools.count()
+
+    def waiting(self) -> int:
+        return len(self._queue)
+
+    async def acquire(self, tokens: int = 0, priority: int = BATCH) -> None:
+        """Wait for this caller's turn and for room in both buckets, then spend them."""
+        entry = (priority, next(self._arrivals), asyncio.Event())
+        heapq.heappush(self._queue, entry)
+        try:
+            while True:
+                if self._queue[0] is entry:
+                    now = time.monotonic()
+                    wait = max(self.backoff_until - now, self.requests.wait_time(1, now),
+                               self.tokens.wait_time(tokens, now))
+                    if wait <= 0:
+                        self.requests.take(1, now)
+                        self.tokens.take(tokens, now)
+                        heapq.heappop(self._queue)
+                        break
+                    # Sleep until there is room, or until woken because the queue changed
+                    try:
+                        await asyncio.wait_for(entry[2].wait(), wait)
+                    except asyncio.TimeoutError:
+                        pass
+                else:
+                    await entry[2].wait()
+                entry[2].clear()
+        except BaseException:
+            if entry in self._queue:
+                self._queue.remove(entry)
+                heapq.heapify(self._queue)
+            self._wake_head()
+            raise
+        self._wake_head()
+
+    def _wake_head(self) -> None:
+        if self._queue:
+            self._queue[0][2].set()
+
+    def report_rate_limited(self, delay: Optional[float] = None) -> float:
+        """Pause the queue after a 429, for `delay` seconds or an exponential backoff; returns the pause."""
+        self.rate_limited += 1
+        if delay is None:
+            delay = min(MAX_BACKOFF, 2 ** (self.rate_limited - 1)) * random.uniform(0.5, 1.0)
+        now = time.monotonic()
+        self.backoff_until = max(self.backoff_until, now + delay)
+        self.requests.drain(now)
+        return delay
+
+    def report_success(self) -> None:
+        self.rate_limited = 0
+
+class Scheduler:
+    def __init__(self, limits: Optional[Dict[str, RateLimits]] = None):
+        self.limits = dict(DEFAULT_LIMITS if limits is None else limits)
+        self._limiters: Dict[Tuple[str, str], RateLimiter] = {}
+
+    def limiter(self, api_type: str, api_key: Optional[str]) -> RateLimiter:
+        """Limiter for one API key of a provider; quotas are per key, so keys do not share one."""
+        if (api_type, api_key or '') not in self._limiters:
+            if api_type not in self.limits:
+                raise ValueError(f"No rate limits for API type: {api_type}")
+            self._limiters[(api_type, api_key or '')] = RateLimiter(self.limits[api_type])
+        return self._limiters[(api_type, api_key or '')]
+
+    async def run(self, api_type: str, api_key: Optional[str], request: Callable[[], Awaitable[Any]],
+                  tokens: int = 0, priority: int = BATCH, max_retries: int = 3) -> Any:
+        """Await `request()` when the limiter allows it, retrying up to `max_retries` times on 429s."""
+        limiter = self.limiter(api_type, api_key)
+        for attempt in range(max_retries + 1):
+            await limiter.acquire(tokens, priority)
+            try:
+                result = await request()
+            except Exception as e:
+                if not is_rate_limited(e) or attempt == max_retries:
+                    raise
+                delay = limiter.report_rate_limited(retry_after(e))
+                logger.warning(f"{api_type} rate limited, backing off {delay:.1f}s")
+                continue
+            limiter.report_success()
+            return result
+
+_default_scheduler: Optional[Scheduler] = None
+
+def default_scheduler() -> Scheduler:
+    """Process-wide scheduler, with limits from <API>_RPM and <API>_TPM environment variables when set."""
+    global _default_scheduler
+    if _default_scheduler is None:
+        limits = {}
+        for api_type, (rpm, tpm) in DEFAULT_LIMITS.items():
+            prefix = api_type.upper()
+            limits[api_type] = RateLimits(float(os.getenv(f'{prefix}_RPM', rpm)), float(os.getenv(f'{prefix}_TPM', tpm)))
+        _default_scheduler = Scheduler(limits)
+    return _default_scheduler
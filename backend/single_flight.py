@@ -0,0 +1,51 @@
+"""Single-flight coalescing of identical concurrent requests.
+
+When several games reach the same position with the same model at the
+same moment, the first caller for a key starts the request and everyone
+else asking for that key meanwhile awaits the same task. The key is
+forgotten once the task finishes, so later callers start afresh (and
+normally hit the move cache instead).
+"""
+import asyncio
+import weakref
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+class SingleFlight:
+    def __init__(self):
+        # Tasks belong to the loop that runs them, so each loop has its own table
+        self._calls: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Hashable, asyncio.Task]]' = \
+            weakref.WeakKeyDictionary()
+        self.started = 0
+        self.coalesced = 0  # Callers that joined a request already in flight
+
+    async def do(self, key: Hashable, request: Callable[[], Awaitable[Any]]) -> Any:
+        """Result of `request()`, shared with every concurrent caller using the same key.
+
+        An exception raised by the request is raised in every caller. A
+        caller that is cancelled stops waiting without cancelling the
+        request the others are waiting on.
+        """
+        calls = self._calls.setdefault(asyncio.get_running_loop(), {})
+        task = calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(request())
+            calls[key] = task
+            task.add_done_callback(lambda done: self._finished(calls, key, done))
+            self.started += 1
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    @staticmethod
+    def _finished(calls: Dict[Hashable, asyncio.Task], key: Hashable, task: asyncio.Task) -> None:
+        if calls.get(key) is task:
+            del calls[key]
+        # Mark the error retrieved in case every caller was cancelled before it arrived
+        if not task.cancelled():
+            task.exception()
+
+    def in_flight(self) -> int:
+        try:
+            return len(self._calls.get(asyncio.get_running_loop(), {}))
+        except RuntimeError:  # No running loop
+            return 0
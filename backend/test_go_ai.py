@@ -3,6 +3,7 @@ from llm_interface import LLMInterface
 from leaderboard import Leaderboard
 import time
 import random
+import numpy as np
 
 def simulate_go_game():
     # Initialize the game and AIs
@@ -26,16 +27,12 @@ def simulate_go_game():
         print(f"\n{player_name}'s turn...")
         
         # Get all valid moves
-        valid_moves = []
-        for i in range(board.size):
-            for j in range(board.size):
-                if board.is_valid_move(i, j):
-                    valid_moves.append((i, j))
+        valid_moves = [(int(x), int(y)) for x, y in np.argwhere(board.legal_moves_mask())]
         
         if not valid_moves:
             print(f"{player_name} passes")
             passes += 1
-            board.current_player = 3 - board.current_player
+            board.pass_move()
             continue
             
         # Make a random valid move
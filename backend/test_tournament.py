@@ -1,3 +1,4 @@
+import time
 import pytest
 from tournament import Tournament, Match
 
@@ -50,3 +51,14 @@ def test_tournament_status_updates():
     assert tournament.rankings[match.player1]['score'] == 2  # Winner gets 2 points
     assert tournament.rankings[match.player2]['wins'] == 0  # Loser has no wins
     assert tournament.rankings[match.player2]['score'] == 0  # Loser gets 0 points
+
+def test_go_moves_come_from_mcts_within_the_budget():
+    from go_board import GoBoard
+    tournament = Tournament('go', ['gpt4', 'claude'], search_time=0.05)
+    game = GoBoard(size=9)
+    start = time.perf_counter()
+    result = tournament.make_ai_move(game, time_limit=0.0)  # Out of time still gives a move
+    assert time.perf_counter() - start < 0.5
+    assert result['valid'] and result['move']['position'] != 'pass'
+    assert sum(cell != 0 for row in game.get_state() for cell in row) == 1
+    tournament.close()
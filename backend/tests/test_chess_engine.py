@@ -0,0 +1,140 @@
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from chess_engine import ChessGame
+
+def sq(name):
+    """Convert algebraic notation (e.g. 'e2') to a row/col dict."""
+    return {'row': 8 - int(name[1]), 'col': ord(name[0]) - ord('a')}
+
+def play(game, *moves):
+    for move in moves:
+        result = game.make_move(sq(move[:2]), sq(move[2:4]))
+        assert result['valid'], move
+
+def test_initial_board_and_status():
+    game = ChessGame('white', 'black')
+    board = game.get_board()
+    assert len(board) == 8 and all(len(row) == 8 for row in board)
+    assert board[0] == ['r', 'n', 'b', 'q', 'k', 'b', 'n', 'r']
+    assert board[6] == ['P'] * 8
+
+    status = game.get_status()
+    assert status['currentPlayer'] == 'white'
+    assert status['castlingRights']['white'] == {'kingside': True, 'queenside': True}
+    assert status['enPassantTarget'] is None
+
+def test_basic_move_validation():
+    game = ChessGame('white', 'black')
+    assert game.is_valid_move(sq('e2'), sq('e4'))
+    assert game.is_valid_move(sq('g1'), sq('f3'))
+    assert not game.is_valid_move(sq('e2'), sq('e5'))
+    assert not game.is_valid_move(sq('f1'), sq('c4'))  # Blocked by own pawn
+    assert not game.is_valid_move(sq('e7'), sq('e5'))  # Not black's turn
+    assert not game.make_move(sq('d1'), sq('d3'))['valid']
+
+def test_pinned_piece_cannot_leave_pin_ray():
+    game = ChessGame('white', 'black')
+    play(game, 'e2e4', 'e7e6', 'd2d4', 'f8b4', 'b1c3', 'g8f6')
+    assert not game.is_valid_move(sq('c3'), sq('d5'))
+    assert game.is_valid_move(sq('c1'), sq('d2'))
+
+def test_moves_must_answer_check():
+    game = ChessGame('white', 'black')
+    play(game, 'e2e4', 'e7e5', 'g1f3', 'd8h4', 'f3e5', 'h4e4')
+    assert game.is_check
+    assert not game.is_valid_move(sq('e5'), sq('g6'))
+    assert game.is_valid_move(sq('f1'), sq('e2'))
+    assert game.is_valid_move(sq('d1'), sq('e2'))
+    assert not game.is_valid_move(sq('e1'), sq('e2'))
+
+def test_castling_and_en_passant():
+    game = ChessGame('white', 'black')
+    play(game, 'e2e4', 'a7a6', 'e4e5', 'd7d5')
+    assert game.get_status()['enPassantTarget'] is not None
+    play(game, 'e5d6')
+    assert game.get_board()[3][3] == '.'  # Captured d5 pawn removed
+
+    play(game, 'a6a5', 'g1f3', 'a5a4', 'f1e2', 'a4a3', 'e1g1')
+    board = game.get_board()
+    assert board[7][6] == 'K' and board[7][5] == 'R'
+    assert game.castling_rights['white'] == {'kingside': False, 'queenside': False}
+
+def test_full_sweep_matches_legal_moves():
+    for fen in ('r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1',
+                'rnbqkbnr/ppp2ppp/8/3pP3/8/8/PPPP1PPP/RNBQKBNR w KQkq d6 0 3',
+                '8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 b - - 0 1'):
+        game = ChessGame('white', 'black')
+        game.set_fen(fen)
+        swept = {(a, b) for a in range(64) for b in range(64)
+                 if game.is_valid_move({'row': a // 8, 'col': a % 8}, {'row': b // 8, 'col': b % 8})}
+        assert swept == {(move.from_square, move.to_square) for move in game.legal_moves()}
+
+def test_legal_moves_from_start():
+    game = ChessGame('white', 'black')
+    moves = {move.uci() for move in game.legal_moves()}
+    assert len(moves) == 20
+    assert {'e2e4', 'g1f3', 'b1a3'} <= moves
+
+def test_piece_at_and_ply_count():
+    game = ChessGame('white', 'black')
+    play(game, 'e2e4', 'e7e5')
+    assert game.ply_count == 2
+    assert game.piece_at(4 * 8 + 4) == 'P' and game.piece_at(6 * 8 + 4) == '.'
+    game.pop()
+    assert game.ply_count == 1 and game.piece_at(3 * 8 + 4) == '.'
+
+def test_legal_moves_include_en_passant_and_promotion():
+    game = ChessGame('white', 'black')
+    play(game, 'h2h4', 'g7g5', 'h4g5', 'f7f5')
+    assert 'g5f6' in {move.uci() for move in game.legal_moves()}
+
+    play(game, 'g5g6', 'a7a6', 'g6h7', 'a6a5')
+    promotions = [move for move in game.legal_moves() if move.promotion]
+    assert sorted(move.uci() for move in promotions) == ['h7g8b', 'h7g8n', 'h7g8q', 'h7g8r']
+
+    assert game.make_move(sq('h7'), sq('g8'), 'N')['valid']
+    assert game.get_board()[0][6] == 'N'
+
+def test_checkmate_detected():
+    game = ChessGame('white', 'black')
+    play(game, 'f2f3', 'e7e5', 'g2g4', 'd8h4')
+    assert game.is_checkmate
+    assert list(game.legal_moves()) == []
+
+def test_push_pop_restores_position():
+    game = ChessGame('white', 'black')
+    play(game, 'e2e4', 'd7d5', 'e4e5', 'f7f5')
+    before = (game.get_board(), game.castling, game.ep_square, game.halfmove_clock,
+              game.fullmove_number, game.current_player)
+
+    for move in list(game.legal_moves()):
+        game.push(move)
+        game.pop()
+        assert (game.get_board(), game.castling, game.ep_square, game.halfmove_clock,
+                game.fullmove_number, game.current_player) == before
+
+    en_passant = next(move for move in game.legal_moves() if move.uci() == 'e5f6')
+    game.push(en_passant)
+    assert game.get_board()[3][5] == '.'
+    assert game.halfmove_clock == 0
+    assert game.pop() == en_passant
+    assert game.get_board()[3][5] == 'p'
+    assert len(game.move_history) == 4
+
+def test_zobrist_key_and_threefold_repetition():
+    game = ChessGame('white', 'black')
+    start_key = game.zobrist_key
+    assert start_key == 0x463B96181691FC9C  # Polyglot key of the start position
+
+    play(game, 'g1f3', 'g8f6', 'f3g1', 'f6g8')
+    assert game.zobrist_key == start_key
+    assert not game.is_draw
+    play(game, 'g1f3', 'g8f6', 'f3g1', 'f6g8')
+    assert game.is_repetition()
+    assert game.is_draw
+    assert game.get_status()['isDraw']
+
+    game.pop()
+    assert not game.is_repetition()
+    assert not game.is_draw
@@ -0,0 +1,56 @@
+import random
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import numpy as np
+import pytest
+from chess_eval import encode_fens, evaluate_batch, evaluate_board, evaluate_squares
+from openings import evaluate_position
+from perft import PERFT_POSITIONS, game_from_fen
+
+def test_incremental_score_matches_from_scratch():
+    rng = random.Random(7)
+    for position in PERFT_POSITIONS:
+        game = game_from_fen(position['fen'])
+        start = game.evaluate()
+        assert start == evaluate_squares(game._squares)
+        for _ in range(40):
+            moves = list(game.legal_moves())
+            if not moves:
+                break
+            game.push(rng.choice(moves))
+            assert game.evaluate() == evaluate_board(game.get_board())
+        while game._undo_stack:
+            game.pop()
+        assert game.evaluate() == start
+
+def test_evaluate_position_wrapper():
+    game = game_from_fen('rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBN1 w Qkq - 0 1')
+    board = game.get_board()
+    assert evaluate_position(board, 'white') == -evaluate_position(board, 'black') < -4.5
+    # A ChessGame is read from its incremental score
+    assert evaluate_position(game, 'black') == evaluate_position(board, 'black')
+    # Symmetric positions are level
+    assert evaluate_board(game_from_fen(PERFT_POSITIONS[0]['fen']).get_board()) == 0
+
+def test_batch_evaluation_matches_single_positions():
+    rng = random.Random(3)
+    fens, boards = [], []
+    game = game_from_fen(PERFT_POSITIONS[1]['fen'])
+    for _ in range(60):
+        moves = list(game.legal_moves())
+        if not moves:
+            break
+        game.push(rng.choice(moves))
+        fens.append(game.get_fen())
+        boards.append(game.get_board())
+    expected = [evaluate_board(board) for board in boards]
+    assert evaluate_batch(fens).tolist() == expected
+    assert evaluate_batch(boards).tolist() == expected
+    assert evaluate_batch(np.array(boards)).tolist() == expected
+    planes = encode_fens(fens)
+    assert planes.shape == (len(fens), 12, 64)
+    assert evaluate_batch(planes).tolist() == expected
+    assert len(evaluate_batch([])) == 0
+    with pytest.raises(ValueError):
+        evaluate_batch(['8/8/8 w - -'])
@@ -0,0 +1,29 @@
+import time
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from chess_search import MATE_BOUND, Searcher, best_move_uci
+from perft import game_from_fen
+
+def test_finds_mate_in_one():
+    game = game_from_fen('6k1/5ppp/8/8/8/8/5PPP/R5K1 w - - 0 1')
+    searcher = Searcher()
+    assert searcher.search(game, time_limit=1.0).uci() == 'a1a8'
+    assert searcher.score >= MATE_BOUND
+
+def test_wins_hanging_queen_and_restores_position():
+    fen = '4k3/8/8/3q4/8/8/8/3RK3 w - - 0 1'
+    game = game_from_fen(fen)
+    assert Searcher().search(game, time_limit=0.5).uci() == 'd1d5'
+    assert game.get_fen() == fen
+    assert not game._undo_stack
+
+def test_respects_time_limit_and_table_cap():
+    game = game_from_fen('r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1')
+    searcher = Searcher(max_entries=1000)
+    start = time.perf_counter()
+    move = searcher.search(game, time_limit=0.3)
+    assert time.perf_counter() - start < 1.0
+    assert move in set(game.legal_moves())
+    assert len(searcher.table) <= 1000
+    assert best_move_uci('7k/5Q2/6K1/8/8/8/8/8 b - - 0 1') is None  # Stalemate
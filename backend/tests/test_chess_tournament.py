@@ -0,0 +1,40 @@
+import asyncio
+import sys
+import time
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import chess
+import chess_tournament
+from chess_tournament import ChessTournament
+
+LINE = ['e2e4', 'e7e5', 'g1f3', 'g8f6']  # Petrov's Defence
+
+def test_tournament_records_each_opening():
+    tournament = ChessTournament()
+
+    async def scripted_move(player, board, time_left):
+        # The line, then no more answers, which ends the game as a draw
+        return LINE[board.ply()] if board.ply() < len(LINE) else None
+    tournament.get_move = scripted_move
+
+    asyncio.run(tournament.run_tournament())
+    [(opening, stats)] = tournament.leaderboard.opening_stats().items()
+    assert opening.startswith('C42')
+    assert stats == {'games': 12, 'white_wins': 0, 'draws': 12, 'black_wins': 0, 'white_score': 0.5}
+
+def test_llm_gets_its_share_of_the_remaining_clock(monkeypatch):
+    tournament = ChessTournament(game_time=60.0)
+    budgets = []
+
+    async def hung_provider(*args, **kwargs):
+        await asyncio.sleep(30)
+    monkeypatch.setattr(chess_tournament, 'scheduled_call', hung_provider)
+    monkeypatch.setattr(chess_tournament, 'move_budget', lambda time_left: budgets.append(time_left) or 0.05)
+
+    board = chess.Board()
+    start = time.monotonic()
+    move = asyncio.run(tournament.get_move('OpenAI', board, 3.0))
+    assert budgets == [3.0] and time.monotonic() - start < 5
+    assert chess.Move.from_uci(move) in board.legal_moves  # The engine moved instead
+    if tournament.engine is not None:
+        tournament.engine.quit()
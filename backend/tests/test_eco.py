@@ -0,0 +1,34 @@
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import chess
+from eco import EcoIndex, OpeningClassifier, opening_stats
+
+def keys_after(moves):
+    board = chess.Board()
+    keys = []
+    for move in moves.split():
+        board.push_uci(move)
+        keys.append(chess.polyglot.zobrist_hash(board))
+    return keys
+
+def test_classifier_keeps_deepest_opening_and_transpositions():
+    classifier = OpeningClassifier()
+    for key in keys_after('e2e4 c7c5 g1f3 d7d6 d2d4 c5d4 f3d4 g8f6 b1c3 a7a6 c1e3 e7e5'):
+        classifier.update(key)
+    assert (classifier.opening.eco, classifier.opening.ply) == ('B90', 10)
+    # 1.Nf3 c5 2.e4 reaches the Sicilian with 2.Nf3 by transposition
+    assert classifier.index.classify(keys_after('g1f3 c7c5 e2e4')).eco == 'B27'
+    assert classifier.index.classify(keys_after('a2a3 a7a6')) is None
+
+def test_tsv_index_and_opening_stats(tmp_path):
+    table = tmp_path / 'a.tsv'
+    table.write_text("eco\tname\tpgn\nC42\tPetrov's Defense\t1. e4 e5 2. Nf3 Nf6\n"
+                     "C43\tPetrov's Defense: Modern Attack\t1. e4 e5 2. Nf3 Nf6 3. d4\n")
+    index = EcoIndex.from_tsv(str(table))
+    assert len(index) == 2 and index.max_ply == 5
+    assert index.classify(keys_after('e2e4 e7e5 g1f3 g8f6 d2d4 f6e4')).eco == 'C43'
+
+    stats = opening_stats([('C42', 'white'), ('C42', 'draw'), ('C42', 'black'), (None, 'white')])
+    assert stats['C42']['games'] == 3 and stats['C42']['white_score'] == 0.5
+    assert stats['Unclassified']['white_wins'] == 1
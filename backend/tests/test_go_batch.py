@@ -0,0 +1,86 @@
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import numpy as np
+import pytest
+from go_batch import GoBatch, PASS
+from go_engine import GoBoard
+
+def test_random_playouts_match_go_board():
+    batch = GoBatch(16, size=7, seed=3)
+    boards = [GoBoard(size=7) for _ in range(16)]
+    while not batch.finished.all() and batch.move_count < 150:
+        mask = batch.legal_moves_mask()
+        for index, board in enumerate(boards):
+            if not batch.finished[index]:
+                assert (mask[index] == board.legal_moves_mask()).all()
+        moves = batch.play_random()
+        for index, board in enumerate(boards):
+            if moves[index] == PASS:
+                board.pass_move()
+            else:
+                assert board.make_move(int(moves[index]) // 7, int(moves[index]) % 7)
+            assert (board.board == batch.boards[index]).all()
+            assert board.captured_white == batch.captured_white[index]
+            assert board.captured_black == batch.captured_black[index]
+
+def test_from_board_play_and_to_board():
+    board = GoBoard(size=9)
+    for x, y in ((2, 2), (6, 6), (2, 3), (6, 5)):
+        board.make_move(x, y)
+    batch = GoBatch.from_board(board, 4)
+    assert (batch.legal_moves_mask() == board.legal_moves_mask()).all()
+
+    batch.play(np.array([3 * 9 + 3, PASS, 3 * 9 + 3, 0]))
+    assert batch.boards[0][3][3] == 1 and batch.boards[1][3][3] == 0
+    assert batch.passes.tolist() == [0, 1, 0, 0]
+    with pytest.raises(ValueError):
+        batch.play(np.array([2 * 9 + 2, PASS, PASS, PASS]))  # Occupied point
+
+    lifted = batch.to_board(0)
+    assert (lifted.board == batch.boards[0]).all()
+    assert lifted.current_player == 2
+    assert lifted.make_move(3, 4)
+
+def test_from_board_keeps_ko_and_passes():
+    board = GoBoard(size=9)
+    for x, y in ((1, 0), (0, 2), (0, 1), (2, 2), (2, 1), (1, 3), (8, 8), (1, 1), (1, 2)):
+        assert board.make_move(x, y)
+    # Black at (1, 2) just took the ko, so white may not retake at (1, 1)
+    assert board.ko_point() == 1 * 9 + 1
+    batch = GoBatch.from_board(board, 2)
+    assert batch.ko_points.tolist() == [10, 10]
+    assert (batch.legal_moves_mask() == board.legal_moves_mask()).all()
+    with pytest.raises(ValueError):
+        batch.play(np.array([10, 10]))
+
+    board.pass_move()
+    batch = GoBatch.from_board(board, 2)
+    assert batch.ko_points.tolist() == [PASS, PASS] and batch.passes.tolist() == [1, 1]
+
+def test_to_board_keeps_ko_and_passes():
+    board = GoBoard(size=9)
+    for x, y in ((1, 0), (0, 2), (0, 1), (2, 2), (2, 1), (1, 3), (8, 8), (1, 1)):
+        assert board.make_move(x, y)
+    batch = GoBatch.from_boards([board, board])
+    batch.play(np.array([1 * 9 + 2, PASS]))  # Black takes the ko on board 0 only
+
+    lifted = batch.to_board(0)
+    assert lifted.ko_point() == 10 and not lifted.is_valid_move(1, 1)
+    assert (lifted.legal_moves_mask() == batch.legal_moves_mask()[0]).all()
+    assert GoBatch.from_board(lifted, 1).ko_points.tolist() == [10]
+    lifted.pass_move()
+    lifted.pass_move()
+    assert lifted.make_move(1, 1)  # The ko is over once both sides have played elsewhere
+
+    passed = batch.to_board(1)
+    assert passed.consecutive_passes == 1 and passed.current_player == 2
+    assert passed.ko_point() == PASS and (passed.board == batch.boards[1]).all()
+
+def test_playout_scores():
+    batch = GoBatch(32, size=9, seed=1)
+    margins = batch.playout()
+    assert margins.shape == (32,)
+    black, white = batch.scores()
+    # Finished random games leave every point a stone or territory
+    assert ((black + white - batch.komi)[batch.finished] == 81).all()
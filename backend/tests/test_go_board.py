@@ -0,0 +1,37 @@
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from go_board import GoBoard
+
+def test_coordinates_and_player_check():
+    board = GoBoard(size=9)
+    assert board.make_move(2, 5)
+    assert board.get_state()[5][2] == 1
+    assert not board.make_move(2, 5)  # Occupied
+    assert not board.make_move(3, 3, player=1)  # White to move
+    assert board.make_move(3, 3, player=2)
+    assert board.current_player == 1
+
+def test_captures_and_legal_moves():
+    board = GoBoard(size=9)
+    # Black surrounds the white stone at column 1, row 1
+    for x, y in ((1, 0), (1, 1), (0, 1), (8, 8), (2, 1), (8, 7), (1, 2)):
+        assert board.make_move(x, y)
+    assert board.get_state()[1][1] == 0
+    assert board.captured_white == 1
+    legal = board.legal_moves()
+    assert (1, 1) not in legal  # Suicide for white
+    assert (4, 4) in legal and (1, 0) not in legal
+
+def test_passes_end_game_and_score():
+    board = GoBoard(size=9)
+    board.make_move(4, 4)
+    board.pass_move()
+    assert not board.is_over
+    board.pass_move()
+    assert board.is_over
+    board.engine.undo()  # The pass count follows the engine's history
+    assert board.consecutive_passes == 1 and not board.is_over
+    board.pass_move()
+    black, white = board.get_score()
+    assert black == 81 and white == 6.5
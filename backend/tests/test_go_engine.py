@@ -0,0 +1,117 @@
+import random
+import sys
+import numpy as np
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from go_engine import GoBoard, KO_RULES, territory_map
+
+def play(board, *moves):
+    """Play (x, y) moves for alternating colors, starting with the side to move."""
+    for x, y in moves:
+        assert board.make_move(x, y), (x, y)
+
+def test_single_stone_capture():
+    board = GoBoard(size=9)
+    # Black surrounds the white stone at (1, 1)
+    play(board, (0, 1), (1, 1), (1, 0), (8, 8), (2, 1), (8, 7), (1, 2))
+    assert board.board[1][1] == 0
+    assert board.captured_white == 1
+
+def test_group_capture_and_liberties_return():
+    board = GoBoard(size=9)
+    # White chain (0, 0)-(0, 1) is captured by black at (1, 0), (1, 1), (0, 2)
+    play(board, (1, 0), (0, 0), (1, 1), (0, 1), (0, 2))
+    assert board.board[0][0] == 0 and board.board[0][1] == 0
+    assert board.captured_white == 2
+    # The captured points are liberties again, so white may play there
+    assert board.is_valid_move(0, 0)
+
+def test_suicide_is_illegal():
+    board = GoBoard(size=9)
+    play(board, (0, 1), (8, 8), (1, 0), (8, 7))
+    # White to play at the corner (0, 0) would have no liberties
+    play(board, (4, 4))
+    assert not board.is_valid_move(0, 0)
+
+def make_ko(board):
+    """Set up a ko on the top edge where black has just captured at (1, 2)."""
+    play(board, (1, 0), (1, 1), (0, 1), (0, 2), (2, 1), (2, 2), (8, 8), (1, 3), (1, 2))
+    assert board.board[1][1] == 0
+
+def test_simple_ko_forbids_immediate_retake():
+    board = GoBoard(size=9)
+    make_ko(board)
+    assert not board.is_valid_move(1, 1)
+    # After a pair of moves elsewhere the ko may be retaken
+    play(board, (8, 0), (7, 7))
+    assert board.is_valid_move(1, 1)
+
+def test_superko_forbids_retake_after_passes():
+    for ko_rule, allowed in (('simple', True), ('positional', False), ('situational', False)):
+        board = GoBoard(size=9, ko_rule=ko_rule)
+        make_ko(board)
+        board.pass_move()
+        board.pass_move()
+        # Retaking would recreate the board from before black's capture
+        assert board.is_valid_move(1, 1) == allowed, ko_rule
+
+def test_legal_moves_mask_matches_is_valid_move():
+    rng = random.Random(7)
+    for ko_rule in KO_RULES:
+        board = GoBoard(size=9, ko_rule=ko_rule)
+        for _ in range(120):
+            mask = board.legal_moves_mask()
+            legal = [(x, y) for x in range(9) for y in range(9) if board.is_valid_move(x, y)]
+            assert [(x, y) for x in range(9) for y in range(9) if mask[x][y]] == legal
+            if not legal:
+                break
+            board.make_move(*rng.choice(legal))
+    # Ko retake is masked out
+    board = GoBoard(size=9)
+    make_ko(board)
+    assert not board.legal_moves_mask()[1][1]
+
+def test_territory_and_area_scoring():
+    board = GoBoard(size=5)
+    # Black wall on column 1, white wall on column 3, neutral column 2
+    board.board[:, 1] = 1
+    board.board[:, 3] = 2
+    board.captured_white = 2
+    assert board.calculate_territory() == (5, 5)
+    assert board.get_score() == (7, 11.5)
+    assert board.get_score(scoring='area', komi=0) == (10, 10)
+
+    stacked = territory_map(np.stack([board.board, np.zeros((5, 5), dtype=int)]))
+    assert (stacked[0][:, 0] == 1).all() and (stacked[0][:, 2] == 0).all()
+    assert not stacked[1].any()  # An empty board has no owner
+
+def test_undo_restores_captures_and_ko():
+    board = GoBoard(size=9, ko_rule='positional')
+    before = (board.board.copy(), board.zobrist_key)
+    make_ko(board)
+    assert board.captured_white == 1 and not board.is_valid_move(1, 1)
+
+    assert board.undo() == (1, 2)
+    assert board.board[1][1] == 2 and board.captured_white == 0
+    assert board.current_player == 1
+    # The white stone is back in atari, so black may capture it again
+    assert board.is_valid_move(1, 2) and not board.is_valid_move(1, 1)
+    play(board, (1, 2))
+    assert board.board[1][1] == 0
+
+    board.pass_move()
+    assert board.undo() is None and board.current_player == 2
+    for _ in range(9):
+        board.undo()
+    assert (board.board == before[0]).all() and board.zobrist_key == before[1]
+
+def test_clone_is_independent():
+    board = GoBoard(size=9)
+    make_ko(board)
+    copy = board.clone()
+    play(copy, (8, 0), (7, 7), (1, 1))
+    assert copy.board[1][2] == 0 and copy.captured_black == 1
+    assert board.board[1][2] == 1 and board.captured_black == 0
+    assert not board.is_valid_move(1, 1)
+    copy.undo()
+    assert copy.board[1][2] == 1
@@ -0,0 +1,46 @@
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import numpy as np
+import pytest
+from go_engine import GoBoard
+from go_mcts import MCTSPlayer
+
+def capture_position():
+    """Black to play; (2, 0) captures six white stones, anything else lets white connect and win."""
+    stones = np.array([
+        [2, 2, 2, 1, 0],
+        [2, 2, 2, 1, 0],
+        [0, 1, 1, 1, 2],
+        [2, 2, 2, 2, 2],
+        [0, 0, 0, 0, 0],
+    ])
+    return GoBoard.from_array(stones, current_player=1)
+
+def test_finds_large_capture():
+    for selection in ('uct', 'puct'):
+        player = MCTSPlayer(time_limit=0.5, selection=selection, komi=0.5, seed=1)
+        assert player.choose_move(capture_position()) == (2, 0), selection
+
+def test_tree_is_reused_after_reply():
+    board = capture_position()
+    player = MCTSPlayer(time_limit=0.3, seed=2)
+    x, y = player.choose_move(board)
+    board.make_move(x, y)
+    reply = next(move for move, child in player._root.children[x * 5 + y].children.items()
+                 if child.visits and move >= 0)
+    board.make_move(*divmod(reply, 5))
+    assert player._find_root(board).visits > 0
+
+def test_search_stops_on_time():
+    board = GoBoard(size=9)
+    player = MCTSPlayer(time_limit=0.2, seed=3)
+    move = player.search(board)
+    assert 0 <= move < 81
+    assert sum(visits for visits, _ in player.root_statistics().values()) > 0
+
+def test_illegal_tree_move_raises():
+    board = capture_position()
+    player = MCTSPlayer(time_limit=0.1, seed=4)
+    with pytest.raises(ValueError):
+        player._play(board, 0)  # Occupied
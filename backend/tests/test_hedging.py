@@ -0,0 +1,51 @@
+import asyncio
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import pytest
+from hedging import LatencyTracker, hedged, move_budget
+
+def test_move_budget_and_latency_percentile():
+    assert move_budget(600) == pytest.approx(20.0)
+    assert move_budget(10) == pytest.approx(10 / 30)
+    assert move_budget(1.5, moves_to_go=1) == pytest.approx(0.5)  # Margin kept back
+    assert move_budget(0.5) == 0.0
+    tracker = LatencyTracker(min_samples=10)
+    assert tracker.hedge_delay() is None
+    for seconds in range(1, 101):
+        tracker.observe(seconds / 100)
+    assert tracker.hedge_delay() == pytest.approx(0.96)
+
+def test_hedge_takes_the_first_answer():
+    delays = [1.0, 0.01]  # The first attempt hangs, the duplicate is quick
+    started = []
+
+    async def request():
+        delay = delays[len(started)]
+        started.append(delay)
+        await asyncio.sleep(delay)
+        return delay
+
+    async def main():
+        tracker = LatencyTracker()
+        result = await asyncio.wait_for(hedged(request, hedge_after=0.02, latency=tracker), 0.5)
+        return result, list(tracker.samples)
+
+    result, samples = asyncio.run(main())
+    assert result == 0.01 and started == [1.0, 0.01]
+    # The loser was cancelled before hedged() returned and its time still counts
+    assert len(samples) == 2 and max(samples) >= 0.02
+
+def test_deadline_bounds_a_hung_request():
+    async def hung():
+        await asyncio.sleep(10)
+
+    async def main():
+        tracker = LatencyTracker()
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(hedged(hung, hedge_after=0.01, latency=tracker), 0.05)
+        return len(asyncio.all_tasks()), sorted(tracker.samples)
+
+    tasks, samples = asyncio.run(main())
+    assert tasks == 1  # Both attempts were cancelled
+    assert len(samples) == 2 and samples[1] >= 0.04
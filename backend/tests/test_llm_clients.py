@@ -0,0 +1,78 @@
+import asyncio
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import pytest
+import llm_clients
+from llm_clients import call_provider, close_clients, get_client
+from prompts import Prompt
+
+def test_clients_are_shared_per_loop_and_closed():
+    async def open_clients():
+        first = get_client('perplexity', 'key')
+        assert get_client('perplexity', 'key') is first
+        assert get_client('perplexity', 'other key') is not first
+        clients = [first, get_client('openai', 'key'), get_client('anthropic', 'key')]
+        await close_clients()
+        return clients
+
+    first_loop = asyncio.run(open_clients())
+    second_loop = asyncio.run(open_clients())
+    assert all(a is not b for a, b in zip(first_loop, second_loop))
+    perplexity, openai_client, anthropic_client = first_loop
+    assert perplexity.is_closed and openai_client.is_closed() and anthropic_client.is_closed()
+    assert not llm_clients._clients
+
+class Recorder:
+    """Async stand-in for a provider client that records the request and returns `response`."""
+    def __init__(self, response):
+        self.response = response
+        self.calls = []
+
+    async def __call__(self, *args, **kwargs):
+        self.calls.append((args, kwargs))
+        return self.response
+
+def use_client(monkeypatch, client):
+    monkeypatch.setattr(llm_clients, 'get_client', lambda api_type, api_key: client)
+
+def test_call_provider_requests(monkeypatch):
+    prompt = Prompt("system text", "user text")
+    sampling = {'max_tokens': 8}
+
+    create = Recorder(SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=" e2e4\n"))],
+                                      usage=SimpleNamespace(prompt_tokens=40, completion_tokens=2)))
+    client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    use_client(monkeypatch, client)
+    assert asyncio.run(call_provider('openai', 'key', 'model-x', sampling, prompt)) == ('e2e4', 40, 2)
+    assert create.calls[0][1] == {'model': 'model-x', 'max_tokens': 8, 'messages': [
+        {"role": "system", "content": "system text"}, {"role": "user", "content": "user text"}]}
+
+    create = Recorder(SimpleNamespace(content=[SimpleNamespace(text="g1f3")],
+                                      usage=SimpleNamespace(input_tokens=30, output_tokens=3)))
+    use_client(monkeypatch, SimpleNamespace(messages=SimpleNamespace(create=create)))
+    assert asyncio.run(call_provider('anthropic', 'key', 'model-x', sampling, prompt)) == ('g1f3', 30, 3)
+    assert create.calls[0][1] == {'model': 'model-x', 'max_tokens': 8, 'system': "system text",
+                                  'messages': [{"role": "user", "content": "user text"}]}
+
+    generate = Recorder(SimpleNamespace(text="d2d4", usage_metadata=SimpleNamespace(
+        prompt_token_count=20, candidates_token_count=1)))
+    models = []
+    monkeypatch.setattr(llm_clients.generativeai, 'GenerativeModel',
+                        lambda model: models.append(model) or SimpleNamespace(generate_content_async=generate))
+    config = {'generation_config': {'max_output_tokens': 8}}
+    assert asyncio.run(call_provider('google', 'key', 'model-x', config, prompt)) == ('d2d4', 20, 1)
+    assert models == ['model-x']
+    assert generate.calls[0] == (("system text\n\nuser text",), config)
+
+    body = {'choices': [{'message': {'content': "c2c4"}}], 'usage': {'prompt_tokens': 25, 'completion_tokens': 2}}
+    post = Recorder(SimpleNamespace(raise_for_status=lambda: None, json=lambda: body))
+    use_client(monkeypatch, SimpleNamespace(post=post))
+    assert asyncio.run(call_provider('perplexity', 'key', 'model-x', sampling, prompt)) == ('c2c4', 25, 2)
+    assert post.calls[0] == (("/chat/completions",), {'json': {
+        'model': 'model-x', 'max_tokens': 8, 'messages': [
+            {"role": "system", "content": "system text"}, {"role": "user", "content": "user text"}]}})
+
+    with pytest.raises(ValueError):
+        asyncio.run(call_provider('unknown', 'key', 'model-x', sampling, prompt))
@@ -0,0 +1,62 @@
+import asyncio
+import sys
+import threading
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from move_cache import MoveCache, cache_key
+
+class DictRedis:
+    """Just the Redis calls MoveCache makes, backed by a dict; notes the threads it is called from."""
+    def __init__(self):
+        self.data = {}
+        self.threads = set()
+
+    def get(self, key):
+        self.threads.add(threading.get_ident())
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self.threads.add(threading.get_ident())
+        self.data[key] = value.encode()
+
+    def delete(self, key):
+        self.threads.add(threading.get_ident())
+        self.data.pop(key, None)
+
+def test_lru_eviction_ttl_and_revalidation():
+    async def main():
+        cache = MoveCache(max_entries=2)
+        keys = [cache_key('openai', 'gpt-4', 1, fen, temperature=0.2) for fen in ('a', 'b', 'c')]
+        assert len(set(keys)) == 3
+        assert keys[0] != cache_key('openai', 'gpt-4', 2, 'a', temperature=0.2)
+        await cache.put(keys[0], 'e2e4')
+        await cache.put(keys[1], 'd2d4')
+        assert await cache.get(keys[0], ['e2e4']) == 'e2e4'  # Now the most recent
+        await cache.put(keys[2], 'c2c4')  # Evicts keys[1]
+        assert await cache.get(keys[1], ['d2d4']) is None
+        # A cached move that is not legal here is dropped
+        assert await cache.get(keys[2], ['e2e4']) is None
+        assert await cache.get(keys[2], ['c2c4']) is None
+        assert cache.stats() == {'hits': 1, 'redis_hits': 0, 'misses': 3, 'invalid': 1, 'entries': 1}
+
+        expired = MoveCache(ttl=0)
+        await expired.put('k', 'e2e4')
+        assert await expired.get('k', ['e2e4']) is None
+
+    asyncio.run(main())
+
+def test_redis_tier_is_shared_and_runs_off_the_loop():
+    redis = DictRedis()
+    first, second = MoveCache(redis_client=redis), MoveCache(redis_client=redis)
+
+    async def main():
+        await first.put('k', 'g1f3')
+        assert await second.get('k', ['g1f3', 'e2e4']) == 'g1f3'
+        await first.put('stale', 'a2a3')
+        assert await second.get('stale', ['e2e4']) is None
+        return threading.get_ident()
+
+    loop_thread = asyncio.run(main())
+    assert second.stats()['redis_hits'] == 1 and second.stats()['entries'] == 1
+    assert 'llm-move:stale' not in redis.data
+    assert redis.threads and loop_thread not in redis.threads
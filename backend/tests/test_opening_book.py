@@ -0,0 +1,53 @@
+import random
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import chess
+import chess.polyglot
+from opening_book import OpeningBook, build_book, decode_move, encode_move
+from perft import game_from_fen
+
+GAMES = """[Result "1-0"]
+
+1. e4 e5 2. Nf3 Nc6 3. Bc4 Nf6 4. O-O Be7 1-0
+
+[Result "1/2-1/2"]
+
+1. e4 c5 2. Nf3 d6 1/2-1/2
+
+[Result "1-0"]
+
+1. d4 d5 2. c4 e6 1-0
+"""
+
+def make_book(tmp_path):
+    pgn = tmp_path / 'games.pgn'
+    pgn.write_text(GAMES)
+    path = tmp_path / 'book.bin'
+    assert build_book([str(pgn)], str(path)) == 15  # e4 is shared
+    return path
+
+def test_book_matches_python_chess_reader(tmp_path):
+    path = make_book(tmp_path)
+    castled = 'r1bqkb1r/pppp1ppp/2n2n2/4p3/2B1P3/5N2/PPPP1PPP/RNBQK2R w KQkq - 4 4'
+    with OpeningBook(str(path)) as book, chess.polyglot.open_reader(str(path)) as reader:
+        for fen in (chess.STARTING_FEN, castled):
+            game = game_from_fen(fen)
+            expected = sorted((entry.move.uci(), entry.weight) for entry in reader.find_all(chess.Board(fen)))
+            assert sorted(book.moves(game)) == expected
+        assert book.moves(game_from_fen(castled)) == [('e1g1', 2)]
+        assert book.entries(12345) == []
+
+def test_weighted_choice_and_move_codes(tmp_path):
+    with OpeningBook(str(make_book(tmp_path))) as book:
+        game = game_from_fen(chess.STARTING_FEN)
+        picks = {book.choose(game, random.Random(seed)) for seed in range(50)}
+        assert picks == {'e2e4', 'd2d4'}
+        game.set_fen('8/8/8/8/8/8/8/K6k w - - 0 1')
+        assert book.choose(game) is None
+    for move in ('e2e4', 'e1h1', 'a7a8q', 'h2h1n'):
+        assert decode_move(encode_move(move)) == move
+    empty = tmp_path / 'empty.bin'
+    empty.write_bytes(b'')
+    with OpeningBook(str(empty)) as book:
+        assert len(book) == 0 and book.entries(0) == []
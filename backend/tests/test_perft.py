@@ -0,0 +1,28 @@
+import pytest
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from perft import PERFT_POSITIONS, perft, divide, game_from_fen, probe_sweep
+
+@pytest.mark.parametrize('position', PERFT_POSITIONS, ids=lambda position: position['name'])
+def test_perft_matches_published_counts(position):
+    game = game_from_fen(position['fen'])
+    for depth in (1, 2):
+        assert perft(game, depth) == position['nodes'][depth - 1]
+    # The position must be fully restored after the search
+    assert game.get_fen() == position['fen']
+
+def test_divide_sums_to_perft():
+    game = game_from_fen(PERFT_POSITIONS[0]['fen'])
+    counts = divide(game, 3)
+    assert len(counts) == 20
+    assert counts['e2e4'] == 600
+    assert sum(counts.values()) == 8902
+
+@pytest.mark.parametrize('position', PERFT_POSITIONS, ids=lambda position: position['name'])
+def test_probe_sweep_finds_the_legal_moves(position):
+    # Promotions share a from/to pair, so compare squares rather than moves
+    game = game_from_fen(position['fen'])
+    legal = {(move.from_square, move.to_square) for move in game.legal_moves()}
+    found = {(f['row'] * 8 + f['col'], t['row'] * 8 + t['col']) for f, t in probe_sweep(game) if game.is_valid_move(f, t)}
+    assert found == legal
@@ -0,0 +1,52 @@
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import chess
+import pytest
+from prompts import (CHESS_TEMPLATE, TokenMeter, chess_move_prompt, go_move_prompt, gtp_coordinate, parse_gtp_move,
+                     parse_move, request_params, usage)
+
+def test_chess_prompt_and_reply_parsing():
+    board = chess.Board("rnbqkbnr/pppp1ppp/8/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R b KQkq - 1 2")
+    prompt = chess_move_prompt(board, evaluation=-0.25)
+    assert prompt.system == CHESS_TEMPLATE.system
+    assert board.fen() in prompt.user and "Eval: -0.25" in prompt.user
+    assert all(move.uci() in prompt.user for move in board.legal_moves)
+    assert "Nc6" in chess_move_prompt(board, notation='san').user
+    with pytest.raises(ValueError):
+        chess_move_prompt(board, notation='lan')
+
+    assert parse_move("b8c6", board) == 'b8c6'
+    assert parse_move("Nc6", board) == 'b8c6'
+    assert parse_move("Move: G8F6.", board) == 'g8f6'
+    assert parse_move("e2e4", board) is None  # Not black's move
+    assert parse_move("I resign", board) is None
+    promotion = chess.Board("8/4P3/8/8/8/8/k7/4K3 w - - 0 1")
+    assert parse_move("e7e8q", promotion) == 'e7e8q'
+
+def test_go_prompt_and_provider_settings():
+    state = [[0] * 9 for _ in range(9)]
+    state[0][8] = 1
+    moves = [gtp_coordinate(row, col) for row in range(9) for col in range(9) if state[row][col] == 0]
+    assert 'J1' not in moves and 'J2' in moves and 'I2' not in moves
+    prompt = go_move_prompt(state, moves, 'white')
+    assert " 1 ........X" in prompt.user and "You play white." in prompt.user
+    assert parse_gtp_move("j2", moves) == 'J2' and parse_gtp_move("J1", moves) is None
+    assert parse_gtp_move("pass", moves) == 'PASS'
+
+    assert request_params('anthropic') == {'max_tokens': 8, 'stop_sequences': ['\n']}
+    assert request_params('openai', temperature=0.2)['stop'] == ['\n']
+    assert request_params('google', max_tokens=4)['generation_config']['max_output_tokens'] == 4
+    with pytest.raises(ValueError):
+        request_params('cohere')
+
+def test_token_meter():
+    response = SimpleNamespace(usage=SimpleNamespace(input_tokens=90, output_tokens=3))
+    meter = TokenMeter()
+    meter.record('anthropic', *usage('anthropic', response))
+    meter.record('anthropic', 110, 5, legal=False)
+    meter.record('perplexity', *usage('perplexity', {'usage': {'prompt_tokens': 80, 'completion_tokens': 2}}))
+    stats = meter.stats()
+    assert stats['anthropic'] == {'moves': 2, 'tokens_in': 200, 'tokens_out': 8, 'illegal': 1, 'tokens_per_move': 104.0}
+    assert stats['perplexity']['tokens_in'] == 80
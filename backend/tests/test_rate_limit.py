@@ -0,0 +1,54 @@
+import asyncio
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import pytest
+from rate_limit import BATCH, INTERACTIVE, RateLimiter, RateLimits, Scheduler, TokenBucket, is_rate_limited
+
+class RateLimitError(Exception):
+    status_code = 429
+
+def test_token_bucket_refills_at_the_per_minute_rate():
+    bucket = TokenBucket(60, now=0.0)  # One per second
+    bucket.take(60, now=0.0)
+    assert bucket.wait_time(1, now=0.0) == pytest.approx(1.0)
+    assert bucket.wait_time(1, now=0.5) == pytest.approx(0.5)
+    assert bucket.wait_time(1000, now=0.0) == pytest.approx(60.0)  # Capped at a full bucket
+    bucket.take(1, now=1.0)
+    assert bucket.wait_time(1, now=1.0) == pytest.approx(1.0)
+
+def test_interactive_callers_go_first_after_backoff():
+    limiter = RateLimiter(RateLimits(6000, 1000000))
+    order = []
+
+    async def caller(name, priority):
+        await limiter.acquire(100, priority)
+        order.append(name)
+
+    async def main():
+        limiter.report_rate_limited(0.05)
+        tasks = [asyncio.ensure_future(caller('batch 1', BATCH)), asyncio.ensure_future(caller('batch 2', BATCH))]
+        await asyncio.sleep(0.01)
+        tasks.append(asyncio.ensure_future(caller('live', INTERACTIVE)))
+        await asyncio.gather(*tasks)
+
+    asyncio.run(main())
+    assert order == ['live', 'batch 1', 'batch 2']
+
+def test_run_retries_after_rate_limit():
+    scheduler = Scheduler({'openai': RateLimits(6000, 1000000)})
+    attempts = []
+
+    async def request():
+        attempts.append(1)
+        if len(attempts) < 3:
+            error = RateLimitError()
+            error.response = type('Response', (), {'headers': {'retry-after': '0.01'}})()
+            raise error
+        return 'e2e4'
+
+    assert asyncio.run(scheduler.run('openai', 'key', request)) == 'e2e4'
+    assert len(attempts) == 3 and scheduler.limiter('openai', 'key').rate_limited == 0
+    assert is_rate_limited(RateLimitError()) and not is_rate_limited(ValueError())
+    with pytest.raises(ValueError):
+        scheduler.limiter('unknown', 'key')
@@ -0,0 +1,48 @@
+import asyncio
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from single_flight import SingleFlight
+
+def test_concurrent_callers_share_one_request():
+    flight = SingleFlight()
+    calls = []
+
+    async def request(move):
+        calls.append(move)
+        await asyncio.sleep(0.01)
+        return move
+
+    async def main():
+        same = await asyncio.gather(*(flight.do('start', lambda: request('e2e4')) for _ in range(5)))
+        other = await flight.do('other', lambda: request('d2d4'))
+        again = await flight.do('start', lambda: request('c2c4'))  # The first request has finished
+        return same, other, again
+
+    same, other, again = asyncio.run(main())
+    assert same == ['e2e4'] * 5 and other == 'd2d4' and again == 'c2c4'
+    assert calls == ['e2e4', 'd2d4', 'c2c4']
+    assert flight.started == 3 and flight.coalesced == 4
+
+def test_errors_reach_every_caller_and_cancellation_does_not_spread():
+    flight = SingleFlight()
+
+    async def failing():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("provider down")
+
+    async def slow():
+        await asyncio.sleep(0.02)
+        return 'g1f3'
+
+    async def main():
+        results = await asyncio.gather(flight.do('k', failing), flight.do('k', failing), return_exceptions=True)
+        first = asyncio.ensure_future(flight.do('s', slow))
+        second = asyncio.ensure_future(flight.do('s', slow))
+        await asyncio.sleep(0)
+        first.cancel()
+        return results, await second, flight.in_flight()
+
+    results, move, in_flight = asyncio.run(main())
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert move == 'g1f3' and in_flight == 0
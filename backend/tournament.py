@@ -1,7 +1,11 @@
 import random
 import time
 from chess_engine import ChessGame
+from chess_search import Searcher
+from eco import OpeningClassifier, OpeningStats, opening_stats
 from go_board import GoBoard
+from go_mcts import MCTSPlayer
+from hedging import move_budget
 
 from typing import List, Dict, Optional, TypedDict, Union
 from dataclasses import dataclass, field
@@ -14,6 +18,7 @@ class MoveResult(TypedDict, total=False):
     checkmate: bool
     resignation: bool
     draw: bool
+    game_over: bool  # Go: both players passed, so the score decides
     message: str
 
 @dataclass
@@ -27,6 +32,7 @@ class Match:
     moves: List[Dict[str, str]] = field(default_factory=list)  # List of move dictionaries
     time_control: int = 600  # Time in seconds per player (default 10 minutes)
     board_size: int = 19  # Board size for Go games (default 19x19)
+    opening: Optional[str] = None  # ECO code and name of the deepest opening reached (chess)
 
     def __post_init__(self):
         """Initialize mutable defaults."""
@@ -39,7 +45,8 @@ class Match:
 
 class Tournament:
     def __init__(self, game_type: str, players: List[str], 
-                 num_games: int = 1, time_control: int = 600):  # Default 10 minutes per player
+                 num_games: int = 1, time_control: int = 600,  # Default 10 minutes per player
+                 search_time: float = 0.1, mcts_workers: int = 0):
         self.game_type = game_type
         self.players = players
         self.num_games = num_games
@@ -51,6 +58,12 @@ class Tournament:
         }
         self.completed = False
         self.current_round = 0
+        # Alpha-beta searcher that picks the chess moves and MCTS player that picks
+        # the Go moves, `search_time` seconds each. With mcts_workers > 1 (opt-in)
+        # MCTS also searches in a process pool, shut down by close().
+        self.searcher = Searcher()
+        self.mcts = MCTSPlayer(time_limit=search_time, workers=mcts_workers)
+        self.search_time = search_time
         
     def create_round_robin_matches(self) -> List[Match]:
         """Generate round-robin tournament pairings."""
@@ -90,6 +103,7 @@ class Tournament:
             return self.get_next_match()
         
         self.completed = True
+        self.close()
         self.show_rankings()
     
     def play_match(self, match: Match) -> None:
@@ -99,6 +113,7 @@ class Tournament:
         print(f"Time Control: {match.time_control} seconds per player")
         print(f"{'='*40}\n")
         
+        classifier = OpeningClassifier()
         if match.game_type == 'chess':
             game = ChessGame(match.player1, match.player2)
         else:
@@ -122,8 +137,8 @@ class Tournament:
             # Record move start time
             move_start = datetime.now()
             
-            # Make move
-            result = self.make_ai_move(game)
+            # Make move, within the share of the remaining clock one move may use
+            result = self.make_ai_move(game, move_budget(time_left[current_player]))
             
             # Update time control
             move_duration = (datetime.now() - move_start).total_seconds()
@@ -150,6 +165,8 @@ class Tournament:
             ):
                 match.moves.append(move_data)
                 moves += 1
+                if match.game_type == 'chess' and classifier.update(game.zobrist_key):
+                    match.opening = str(classifier.opening)
             else:
                 print(f"Invalid move format: {move_data}")
                 continue
@@ -159,7 +176,10 @@ class Tournament:
             is_resignation = bool(result.get('resignation', False))
             is_draw = bool(result.get('draw', False))
             
-            if is_checkmate or is_resignation:
+            if result.get('game_over', False):
+                self.finish_go_match(match, game)
+                return
+            elif is_checkmate or is_resignation:
                 match.winner = current_player
                 match.end_time = datetime.now()
                 self.update_rankings(match, 'win' if current_player == match.player1 else 'loss')
@@ -171,35 +191,38 @@ class Tournament:
             
             time.sleep(0.25)  # Add 0.25 second delay between moves
             
-        # Game drawn by move limit
+        # Move limit reached: Go games are scored as they stand, chess is drawn
+        if match.game_type != 'chess':
+            self.finish_go_match(match, game)
+            return
         match.end_time = datetime.now()
         self.update_rankings(match, 'draw')
+
+    def finish_go_match(self, match: Match, game: GoBoard) -> None:
+        """Decide a Go match by area score; player1 moved first, so played black."""
+        black_score, white_score = game.get_score()
+        print(f"Final score - Black: {black_score}, White: {white_score}")
+        match.end_time = datetime.now()
+        if black_score == white_score:
+            self.update_rankings(match, 'draw')
+            return
+        match.winner = match.player1 if black_score > white_score else match.player2
+        self.update_rankings(match, 'win' if black_score > white_score else 'loss')
     
-    def make_ai_move(self, game) -> MoveResult:
-        """Generate and validate AI move."""
+    def make_ai_move(self, game, time_limit: Optional[float] = None) -> MoveResult:
+        """Generate and validate AI move, searching at most `time_limit` seconds."""
+        search_time = self.search_time if time_limit is None else min(self.search_time, time_limit)
         try:
             if self.game_type == 'chess':
                 # Get the current board state
                 board = game.get_board()
                 
-                # Find pieces that can be moved
-                valid_moves = []
-                for i in range(8):
-                    for j in range(8):
-                        piece = board[i][j]
-                        if piece and ((game.current_player == 'white' and piece.isupper()) or 
-                                    (game.current_player == 'black' and piece.islower())):
-                            from_pos = {'row': i, 'col': j}
-                            # Try all possible destinations
-                            for x in range(8):
-                                for y in range(8):
-                                    to_pos = {'row': x, 'col': y}
-                                    if game.is_valid_move(from_pos, to_pos):
-                                        valid_moves.append((from_pos, to_pos, piece))
+                # Search for the best move within the per-move budget
+                move = self.searcher.search(game, search_time)
                 
-                if valid_moves:
-                    # Choose a random valid move
-                    from_pos, to_pos, piece = random.choice(valid_moves)
+                if move is not None:
+                    from_pos, to_pos = move.from_pos, move.to_pos
+                    piece = board[from_pos['row']][from_pos['col']]
                     piece_name = {
                         'P': 'Pawn', 'N': 'Knight', 'B': 'Bishop',
                         'R': 'Rook', 'Q': 'Queen', 'K': 'King'
@@ -208,7 +231,7 @@ class Tournament:
                     move_desc = f"{piece_name} from {chr(from_pos['col']+97)}{8-from_pos['row']} to {chr(to_pos['col']+97)}{8-to_pos['row']}"
                     print(f"Moving {move_desc}")
                     
-                    result = game.make_move(from_pos, to_pos)
+                    result = game.make_move(from_pos, to_pos, move.promotion)
                     if isinstance(result, dict) and result.get('valid'):
                         return {
                             'valid': True,
@@ -216,34 +239,54 @@ class Tournament:
                                 'from': f"{chr(from_pos['col']+97)}{8-from_pos['row']}",
                                 'to': f"{chr(to_pos['col']+97)}{8-to_pos['row']}",
                                 'piece': piece_name
-                            }
+                            },
+                            'checkmate': game.is_checkmate,
+                            'draw': game.is_draw
                         }
                     
                 print("No valid moves found!")
                 return {'valid': False, 'message': 'No valid moves available'}
             else:
-                # Random go move
-                x = random.randint(0, game.size - 1)
-                y = random.randint(0, game.size - 1)
-                move_desc = f"{chr(x+65)}{y+1}"
-                print(f"Playing at {move_desc}")
-                
-                result = game.make_move(x, y)
-                if result:
+                # MCTS move within the same budget, passing when it finds nothing better
+                point = self.mcts.choose_move(game.engine, search_time)
+                if point is None:
+                    game.pass_move()
+                    print("Passing")
                     return {
                         'valid': True,
-                        'move': {
-                            'x': str(x),
-                            'y': str(y),
-                            'position': move_desc
-                        }
+                        'move': {'position': 'pass'},
+                        'game_over': game.is_over
                     }
-                return {'valid': False, 'message': 'Invalid move'}
-                
+
+                y, x = point  # Engine (row, column)
+                move_desc = f"{chr(x+65)}{y+1}"
+                print(f"Playing at {move_desc}")
+
+                game.make_move(x, y)
+                return {
+                    'valid': True,
+                    'move': {
+                        'x': str(x),
+                        'y': str(y),
+                        'position': move_desc
+                    }
+                }
+
         except Exception as e:
             print(f"Error making move: {str(e)}")
             return {'valid': False, 'message': str(e)}
     
+    def close(self) -> None:
+        """Shut down the MCTS worker pool, if mcts_workers started one."""
+        self.mcts.close()
+
+    def get_opening_stats(self) -> Dict[str, OpeningStats]:
+        """Results per opening over the finished chess matches; player1 plays white."""
+        return opening_stats(
+            (match.opening, 'white' if match.winner == match.player1 else
+             'black' if match.winner == match.player2 else 'draw')
+            for match in self.matches if match.game_type == 'chess' and match.end_time is not None)
+
     def get_next_match(self) -> Optional[Match]:
         """Get the next unplayed match."""
         for match in self.matches: